@@ -13,6 +13,8 @@ This is the top-level namespace of the py_trees package.
 # Imports
 ##############################################################################
 
+import sys
+
 from . import behaviour  # noqa
 from . import behaviours  # noqa
 from . import blackboard  # noqa
@@ -24,14 +26,22 @@ from . import demos  # noqa
 from . import display  # noqa
 from . import logging  # noqa
 from . import meta  # noqa
+from . import metrics  # noqa
+from . import persistence  # noqa
 from . import programs  # noqa
+from . import recording  # noqa
+from . import shared_memory  # noqa
 from . import syntax_highlighting  # noqa
 from . import tests  # noqa
 from . import timers  # noqa
+from . import tracing  # noqa
 from . import trees  # noqa
 from . import utilities  # noqa
 from . import visitors  # noqa
 
+if sys.version_info >= (3, 5):
+    from . import asynchronous  # noqa
+
 # really core conveniences (only the core ones please)
 from .behaviour import Behaviour
 from .blackboard import Blackboard
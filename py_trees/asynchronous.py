@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+##############################################################################
+# Documentation
+##############################################################################
+
+"""
+Run behaviour trees on an :mod:`asyncio` event loop. Ticks are still
+synchronous, but :class:`~py_trees.asynchronous.AsyncBehaviour` leaves hand
+their work off to coroutines that run on the loop in between ticks, so that
+many I/O bound leaves can share a single thread.
+
+.. code-block:: python
+
+   class Fetch(py_trees.asynchronous.AsyncBehaviour):
+       async def run(self):
+           reply = await self.client.get("/status")
+           return py_trees.common.Status.SUCCESS if reply.ok else py_trees.common.Status.FAILURE
+
+   tree = py_trees.asynchronous.AsyncBehaviourTree(root)
+   asyncio.get_event_loop().run_until_complete(
+       tree.tick_tock(period_ms=20, number_of_iterations=100)
+   )
+
+.. note:: Requires python 3.5 or later.
+"""
+
+##############################################################################
+# Imports
+##############################################################################
+
+import asyncio
+
+from . import behaviour
+from . import common
+from . import trees
+
+##############################################################################
+# Behaviours
+##############################################################################
+
+
+class AsyncBehaviour(behaviour.Behaviour):
+    """
+    A behaviour whose work is done by a coroutine. On entry, the coroutine
+    returned by :meth:`run` is scheduled as a task on the event loop and the
+    behaviour is :data:`~py_trees.common.Status.RUNNING` until the task is done.
+    The task's result is then mapped onto the behaviour's status:
+
+    * a :class:`~py_trees.common.Status` is used as is (:data:`~py_trees.common.Status.RUNNING` restarts the coroutine)
+    * :obj:`None` or :obj:`True` is :data:`~py_trees.common.Status.SUCCESS`
+    * :obj:`False` or an exception is :data:`~py_trees.common.Status.FAILURE`
+
+    If the behaviour is interrupted (:meth:`~py_trees.behaviour.Behaviour.stop`
+    with :data:`~py_trees.common.Status.INVALID`) the task is cancelled.
+
+    Subclasses overriding :meth:`initialise` or :meth:`terminate` should call
+    the parent's method.
+
+    Args:
+        name (:obj:`str`): the behaviour name
+
+    Attributes:
+        task (:class:`asyncio.Task`): the task running the coroutine, or None if not running
+    """
+    def __init__(self, name=common.Name.AUTO_GENERATED, *args, **kwargs):
+        super(AsyncBehaviour, self).__init__(name, *args, **kwargs)
+        self.task = None
+
+    async def run(self):
+        """
+        .. note:: User Customisable Callback
+
+        The coroutine to run each time the behaviour is entered.
+
+        Returns:
+            :class:`~py_trees.common.Status`, :obj:`bool` or :obj:`None`: the result (see above)
+        """
+        return common.Status.SUCCESS
+
+    def initialise(self):
+        """
+        Discard any task left over from a previous run.
+        """
+        self.task = None
+
+    def update(self):
+        """
+        Schedule the coroutine on the first tick, then poll the task.
+
+        Returns:
+            :class:`~py_trees.common.Status`: :data:`~py_trees.common.Status.RUNNING` until the task is done
+        """
+        if self.task is None:
+            self.task = asyncio.ensure_future(self.run())
+            self.feedback_message = "started"
+            return common.Status.RUNNING
+        if not self.task.done():
+            self.feedback_message = "running"
+            return common.Status.RUNNING
+        task = self.task
+        self.task = None
+        if task.cancelled():
+            self.feedback_message = "cancelled"
+            return common.Status.FAILURE
+        exception = task.exception()
+        if exception is not None:
+            self.feedback_message = "failed [{}]".format(repr(exception))
+            self.logger.debug("%s.update()[%s]", self.__class__.__name__, self.feedback_message)
+            return common.Status.FAILURE
+        result = task.result()
+        self.feedback_message = "done"
+        if isinstance(result, common.Status):
+            return result
+        return common.Status.FAILURE if result is False else common.Status.SUCCESS
+
+    def terminate(self, new_status):
+        """
+        Cancel the task if the behaviour was interrupted.
+
+        Args:
+            new_status (:class:`~py_trees.common.Status`): the behaviour is transitioning to this new status
+        """
+        if new_status == common.Status.INVALID and self.task is not None:
+            self.logger.debug("%s.terminate()[cancelling]", self.__class__.__name__)
+            self.task.cancel()
+            self.feedback_message = "cancelled"
+        self.task = None
+
+##############################################################################
+# Trees
+##############################################################################
+
+
+class AsyncBehaviourTree(trees.BehaviourTree):
+    """
+    A :class:`~py_trees.trees.BehaviourTree` that tick-tocks on an :mod:`asyncio`
+    event loop. Each tick is synchronous, the loop runs the coroutines of any
+    :class:`~py_trees.asynchronous.AsyncBehaviour` leaves while the tree waits for
+    its next deadline.
+
+    Args:
+        root (:class:`~py_trees.behaviour.Behaviour`): root node of the tree
+        engine (:class:`~py_trees.trees.FlatTickEngine`): alternative tick engine, if None tick with the behaviour generators
+
+    .. note:: Call :meth:`~py_trees.trees.BehaviourTree.tick` from within a
+       coroutine running on the loop so that tasks are scheduled on it.
+    """
+    async def tick_tock(self,
+                        period_ms,
+                        number_of_iterations=trees.CONTINUOUS_TICK_TOCK,
+                        pre_tick_handler=None,
+                        post_tick_handler=None,
+                        overrun_policy=common.OverrunPolicy.SKIP):
+        """
+        Tick continuously on absolute deadlines (the event loop's clock), awaiting
+        between ticks so that other coroutines can run. Statistics for the
+        tick-tock are collected in :attr:`~py_trees.trees.BehaviourTree.tick_tock_statistics`.
+
+        Args:
+            period_ms (:obj:`float`): period between ticks (milliseconds)
+            number_of_iterations (:obj:`int`): number of iterations to tick-tock
+            pre_tick_handler (:obj:`func`): function to execute before ticking
+            post_tick_handler (:obj:`func`): function to execute after ticking
+            overrun_policy (:class:`~py_trees.common.OverrunPolicy`): how to handle ticks that overrun their deadline
+        """
+        loop = asyncio.get_event_loop()
+        period = period_ms / 1000.0
+        statistics = trees.TickTockStatistics(period)
+        self.tick_tock_statistics = statistics
+        deadline = loop.time()
+        tick_tocks = 0
+        try:
+            while not self.interrupt_tick_tocking and (tick_tocks < number_of_iterations or number_of_iterations == trees.CONTINUOUS_TICK_TOCK):
+                start = loop.time()
+                self.tick(pre_tick_handler, post_tick_handler)
+                finish = loop.time()
+                statistics.record(jitter=start - deadline, duration=finish - start)
+                tick_tocks += 1
+                deadline = statistics.next_deadline(deadline, finish, overrun_policy)
+                # always yield to the loop, even if catching up
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
+        finally:
+            self.interrupt_tick_tocking = False
@@ -17,6 +17,7 @@ from this class.
 ##############################################################################
 
 import re
+import threading
 import uuid
 
 from . import logging
@@ -24,6 +25,41 @@ from . import common
 
 from .common import Status
 
+try:
+    basestring  # python2
+except NameError:
+    basestring = str  # python3
+
+##############################################################################
+# Ticking
+##############################################################################
+
+
+class _Ticking(threading.local):
+    """
+    The behaviour most recently started or resumed ticking, kept per thread
+    so that trees ticking on different threads do not clobber each other.
+    While a tree tracks changes for incremental visitors, ``stopped`` is
+    called with each active behaviour that is stopped.
+    """
+    behaviour = None
+    stopped = None
+
+
+_ticking = _Ticking()
+
+
+def ticking():
+    """
+    The behaviour that most recently started, or resumed after its children,
+    ticking on the calling thread. Used to attribute blackboard writes in
+    activity logs (see :class:`~py_trees.blackboard.ActivityLog`).
+
+    Returns:
+        :class:`~py_trees.behaviour.Behaviour`: the ticking behaviour, None outside of a tick
+    """
+    return _ticking.behaviour
+
 ##############################################################################
 # Behaviour BluePrint
 ##############################################################################
@@ -58,6 +94,11 @@ class Behaviour(object):
        * :ref:`The Action Behaviour Demo <py-trees-demo-action-behaviour-program>`
 
     """
+    # core attributes live in slots, subclasses still get an instance dictionary
+    # unless they too define __slots__ (see :class:`~py_trees.behaviour.SlottedBehaviour`)
+    __slots__ = ('id', 'name', 'status', 'iterator', 'parent', 'children', 'logger',
+                 'feedback_message', 'blackbox_level', '_tree', '__weakref__')
+
     def __init__(self, name=common.Name.AUTO_GENERATED, *args, **kwargs):
         if not name or name == common.Name.AUTO_GENERATED:
             name = self.__class__.__name__
@@ -258,13 +299,14 @@ class Behaviour(object):
 
         .. warning:: Override this method only in exceptional circumstances, prefer overriding :meth:`~py_trees.behaviour.Behaviour.update` instead.
         """
-        self.logger.debug("%s.tick()" % (self.__class__.__name__))
+        self.logger.debug("%s.tick()", self.__class__.__name__)
+        _ticking.behaviour = self
         if self.status != Status.RUNNING:
             self.initialise()
         # don't set self.status yet, terminate() may need to check what the current state is first
         new_status = self.update()
         if new_status not in list(Status):
-            self.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]" % (new_status, self.name))
+            self.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]", new_status, self.name)
             new_status = Status.INVALID
         if new_status != Status.RUNNING:
             self.stop(new_status)
@@ -306,7 +348,135 @@ class Behaviour(object):
 
         .. warning:: Override this method only in exceptional circumstances, prefer overriding :meth:`~py_trees.behaviour.Behaviour.terminate` instead.
         """
-        self.logger.debug("%s.stop(%s)" % (self.__class__.__name__, "%s->%s" % (self.status, new_status) if self.status != new_status else "%s" % new_status))
+        self.logger.debug("%s.stop(%s->%s)", self.__class__.__name__, self.status, new_status)
         self.terminate(new_status)
+        if _ticking.stopped is not None and self.status != Status.INVALID:
+            _ticking.stopped(self)
         self.status = new_status
         self.iterator = self.tick()
+
+
+##############################################################################
+# Slotted Behaviour
+##############################################################################
+
+# slot descriptors of the base class, used as storage for the lazy attributes
+_ID = Behaviour.id
+_ITERATOR = Behaviour.iterator
+_CHILDREN = Behaviour.children
+_LOGGER = Behaviour.logger
+
+_NO_CHILDREN = ()
+
+
+class SlottedBehaviour(Behaviour):
+    """
+    A compact, opt-in variant of :class:`~py_trees.behaviour.Behaviour` for
+    trees with very large numbers of leaves. Instances have no
+    instance dictionary and the id, logger and
+    iterator are only created when first accessed. Slotted behaviours are leaves,
+    :attr:`children` is a shared, empty tuple.
+
+    Subclasses must declare :obj:`__slots__` themselves (listing any
+    additional attributes they need) or python will quietly give them an
+    instance dictionary again.
+
+    .. code-block:: python
+
+       class IsBatteryLow(py_trees.behaviour.SlottedBehaviour):
+           __slots__ = ('threshold',)
+
+           def __init__(self, name="Battery Low?", threshold=0.2):
+               super(IsBatteryLow, self).__init__(name)
+               self.threshold = threshold
+
+           def update(self):
+               ...
+
+    Args:
+        name (:obj:`str`, optional): the behaviour name, defaults to auto-generating from the class name
+        *args: variable length argument list.
+        **kwargs: arbitrary keyword arguments.
+
+    Raises:
+        TypeError: if the provided name is not a string
+    """
+    __slots__ = ()
+
+    def __init__(self, name=common.Name.AUTO_GENERATED, *args, **kwargs):
+        if not name or name == common.Name.AUTO_GENERATED:
+            name = self.__class__.__name__
+        if not isinstance(name, basestring):
+            raise TypeError("a behaviour name should be a string, but you passed in {}".format(type(name)))
+        self.name = name
+        self.status = Status.INVALID
+        self.parent = None
+        self.feedback_message = ""
+        self.blackbox_level = common.BlackBoxLevel.NOT_A_BLACKBOX
+
+    @property
+    def id(self):
+        """
+        :class:`uuid.UUID`: unique identifier, generated on first access
+        """
+        try:
+            return _ID.__get__(self)
+        except AttributeError:
+            unique_id = uuid.uuid4()
+            _ID.__set__(self, unique_id)
+            return unique_id
+
+    @id.setter
+    def id(self, unique_id):
+        _ID.__set__(self, unique_id)
+
+    @property
+    def logger(self):
+        """
+        :class:`~py_trees.logging.Logger`: the behaviour's logger, created on first access
+        """
+        try:
+            return _LOGGER.__get__(self)
+        except AttributeError:
+            logger = logging.Logger(self.name)
+            _LOGGER.__set__(self, logger)
+            return logger
+
+    @logger.setter
+    def logger(self, logger):
+        _LOGGER.__set__(self, logger)
+
+    @property
+    def children(self):
+        """
+        ([:class:`~py_trees.behaviour.Behaviour`]): always empty, unless explicitly assigned
+        """
+        try:
+            return _CHILDREN.__get__(self)
+        except AttributeError:
+            return _NO_CHILDREN
+
+    @children.setter
+    def children(self, children):
+        _CHILDREN.__set__(self, children)
+
+    @property
+    def iterator(self):
+        """
+        Generator for :meth:`~py_trees.behaviour.Behaviour.tick`, created on first access.
+        Resetting it (as :meth:`~py_trees.behaviour.Behaviour.stop` does) discards it until
+        it is next needed.
+        """
+        try:
+            return _ITERATOR.__get__(self)
+        except AttributeError:
+            iterator = self.tick()
+            _ITERATOR.__set__(self, iterator)
+            return iterator
+
+    @iterator.setter
+    def iterator(self, unused_iterator):
+        try:
+            _ITERATOR.__delete__(self)
+        except AttributeError:
+            pass
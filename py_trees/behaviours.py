@@ -15,6 +15,20 @@ A library of fundamental behaviours for use.
 # Imports
 ##############################################################################
 
+import multiprocessing
+import threading
+import timeit
+
+try:
+    import concurrent.futures
+except ImportError:
+    concurrent = None  # python2 without the futures backport
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # python2
+
 from .common import Status
 from .behaviour import Behaviour
 from . import composites
@@ -26,25 +40,25 @@ from . import meta
 
 
 def success(self):
-    self.logger.debug("%s.update()" % self.__class__.__name__)
+    self.logger.debug("%s.update()", self.__class__.__name__)
     self.feedback_message = "success"
     return Status.SUCCESS
 
 
 def failure(self):
-    self.logger.debug("%s.update()" % self.__class__.__name__)
+    self.logger.debug("%s.update()", self.__class__.__name__)
     self.feedback_message = "failure"
     return Status.FAILURE
 
 
 def running(self):
-    self.logger.debug("%s.update()" % self.__class__.__name__)
+    self.logger.debug("%s.update()", self.__class__.__name__)
     self.feedback_message = "running"
     return Status.RUNNING
 
 
 def dummy(self):
-    self.logger.debug("%s.update()" % self.__class__.__name__)
+    self.logger.debug("%s.update()", self.__class__.__name__)
     self.feedback_message = "crash test dummy"
     return Status.RUNNING
 
@@ -133,7 +147,7 @@ class SuccessEveryN(Behaviour):
 
     def update(self):
         self.count += 1
-        self.logger.debug("%s.update()][%s]" % (self.__class__.__name__, self.count))
+        self.logger.debug("%s.update()][%s]", self.__class__.__name__, self.count)
         if self.count % self.every_n == 0:
             self.feedback_message = "now"
             return Status.SUCCESS
@@ -172,7 +186,7 @@ class Count(Behaviour):
         self.reset = reset
 
     def terminate(self, new_status):
-        self.logger.debug("%s.terminate(%s->%s)" % (self.__class__.__name__, self.status, new_status))
+        self.logger.debug("%s.terminate(%s->%s)", self.__class__.__name__, self.status, new_status)
         # reset only if udpate got us into an invalid state
         if new_status == Status.INVALID and self.reset:
             self.count = 0
@@ -183,19 +197,19 @@ class Count(Behaviour):
         self.number_updated += 1
         self.count += 1
         if self.count <= self.fail_until:
-            self.logger.debug("%s.update()[%s: failure]" % (self.__class__.__name__, self.count))
+            self.logger.debug("%s.update()[%s: failure]", self.__class__.__name__, self.count)
             self.feedback_message = "failing"
             return Status.FAILURE
         elif self.count <= self.running_until:
-            self.logger.debug("%s.update()[%s: running]" % (self.__class__.__name__, self.count))
+            self.logger.debug("%s.update()[%s: running]", self.__class__.__name__, self.count)
             self.feedback_message = "running"
             return Status.RUNNING
         elif self.count <= self.success_until:
-            self.logger.debug("%s.update()[%s: success]" % (self.__class__.__name__, self.count))
+            self.logger.debug("%s.update()[%s: success]", self.__class__.__name__, self.count)
             self.feedback_message = "success"
             return Status.SUCCESS
         else:
-            self.logger.debug("%s.update()[%s: failure]" % (self.__class__.__name__, self.count))
+            self.logger.debug("%s.update()[%s: failure]", self.__class__.__name__, self.count)
             self.feedback_message = "failing forever more"
             return Status.FAILURE
 
@@ -214,6 +228,211 @@ class Count(Behaviour):
         return s
 
 
+##############################################################################
+# Jobs
+##############################################################################
+
+_default_job_pool = None
+_job_lock = threading.Lock()
+_manager = None
+
+
+def default_job_pool():
+    """
+    The thread pool shared by :class:`~py_trees.behaviours.Job` behaviours that
+    are not managed by a :class:`~py_trees.trees.BehaviourTree` with its own
+    job pool (see :meth:`~py_trees.trees.BehaviourTree.setup_job_pool`).
+
+    Returns:
+        :class:`concurrent.futures.ThreadPoolExecutor`: the shared pool
+
+    Raises:
+        ImportError: if :mod:`concurrent.futures` is not available (python2 needs the futures backport)
+    """
+    global _default_job_pool
+    if concurrent is None:
+        raise ImportError("jobs require concurrent.futures (python2: pip install futures)")
+    with _job_lock:
+        if _default_job_pool is None:
+            _default_job_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        return _default_job_pool
+
+
+def _progress_queue(executor):
+    """
+    A queue that jobs can report progress on from wherever the executor runs them.
+    """
+    global _manager
+    if concurrent is not None and isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        with _job_lock:
+            if _manager is None:
+                _manager = multiprocessing.Manager()
+            return _manager.Queue()
+    return queue.Queue()
+
+
+class JobProgress(object):
+    """
+    Passed to the callable of a :class:`~py_trees.behaviours.Job` (as the
+    ``progress`` keyword argument) when it reports progress. Call it with
+    anything printable, e.g. a percentage or a short message. It is safe
+    to use from other threads and processes.
+
+    Args:
+        queue (:obj:`object`): queue to relay progress reports on
+    """
+    def __init__(self, queue):
+        self.queue = queue
+
+    def __call__(self, progress):
+        self.queue.put(progress)
+
+
+class Job(Behaviour):
+    """
+    Runs a callable in the background on a pool, replacing the hand-rolled
+    process and pipe of the :ref:`py-trees-demo-action-behaviour-program`.
+    The callable is submitted on :meth:`initialise`, the behaviour is
+    :data:`~py_trees.common.Status.RUNNING` until it completes and the outcome
+    is mapped onto the behaviour's status:
+
+    * a returned :class:`~py_trees.common.Status` is used as is (:data:`~py_trees.common.Status.RUNNING` submits the callable again)
+    * a returned :obj:`False` is :data:`~py_trees.common.Status.FAILURE`
+    * any other return value is :data:`~py_trees.common.Status.SUCCESS`
+    * a raised exception is :data:`~py_trees.common.Status.FAILURE`
+
+    The callable runs on (in order of preference) the executor passed in, the
+    job pool of the tree the behaviour belongs to (see
+    :meth:`~py_trees.trees.BehaviourTree.setup_job_pool`) or a small, shared
+    thread pool (:func:`~py_trees.behaviours.default_job_pool`).
+
+    If the behaviour is interrupted (:data:`~py_trees.common.Status.INVALID`), the job is
+    cancelled. A job that has already started cannot be interrupted, it is
+    abandoned and its outcome ignored.
+
+    Args:
+        name (:obj:`str`): name of the behaviour
+        function (:obj:`func`): the callable (for process pools, it and its arguments must be picklable)
+        args (:obj:`tuple`): positional arguments for the callable
+        kwargs (:obj:`dict`): keyword arguments for the callable
+        executor (:class:`concurrent.futures.Executor`): run the callable on this executor
+        report_progress (:obj:`bool`): pass a :class:`~py_trees.behaviours.JobProgress` as the ``progress`` keyword argument
+        *behaviour_args: variable length argument list, for the behaviour
+        **behaviour_kwargs: arbitrary keyword arguments, for the behaviour
+
+    Attributes:
+        future (:class:`concurrent.futures.Future`): the job while it is active, otherwise None
+        progress (:obj:`object`): the latest progress reported by the job
+        result (:obj:`object`): the value returned by the last completed job
+        exception (:obj:`Exception`): the exception raised by the last failed job
+    """
+    def __init__(self, name="Job", function=None, args=(), kwargs=None, executor=None, report_progress=False,
+                 *behaviour_args, **behaviour_kwargs):
+        super(Job, self).__init__(name, *behaviour_args, **behaviour_kwargs)
+        if function is None:
+            raise TypeError("a job requires a callable")
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.executor = executor
+        self.report_progress = report_progress
+        self.future = None
+        self.progress = None
+        self.result = None
+        self.exception = None
+        self._progress_queue = None
+        self._start_time = None
+
+    def _job_pool(self):
+        if self.executor is not None:
+            return self.executor
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        tree = getattr(root, '_tree', None)
+        if tree is not None and tree.job_pool is not None:
+            return tree.job_pool
+        return default_job_pool()
+
+    def initialise(self):
+        """
+        Submit the job.
+        """
+        self.logger.debug("%s.initialise()", self.__class__.__name__)
+        self._submit()
+
+    def _submit(self):
+        pool = self._job_pool()
+        kwargs = dict(self.kwargs)
+        if self.report_progress:
+            self._progress_queue = _progress_queue(pool)
+            kwargs['progress'] = JobProgress(self._progress_queue)
+        self.progress = None
+        self.result = None
+        self.exception = None
+        self._start_time = timeit.default_timer()
+        self.future = pool.submit(self.function, *self.args, **kwargs)
+
+    def update(self):
+        """
+        Check on the job.
+
+        Returns:
+            :class:`~py_trees.common.Status`: :data:`~py_trees.common.Status.RUNNING` until the job completes
+        """
+        self.logger.debug("%s.update()", self.__class__.__name__)
+        self._drain_progress()
+        if not self.future.done():
+            if self.future.running():
+                self.feedback_message = "running [%.1fs]" % (timeit.default_timer() - self._start_time)
+                if self.progress is not None:
+                    self.feedback_message += "[%s]" % (self.progress,)
+            else:
+                self.feedback_message = "queued"
+            return Status.RUNNING
+        future = self.future
+        self.future = None
+        try:
+            self.result = future.result()
+        except Exception as e:
+            self.exception = e
+            self.feedback_message = "failed [%s]" % repr(e)
+            return Status.FAILURE
+        if self.result is Status.RUNNING:
+            # not done yet, go again
+            self._submit()
+            self.feedback_message = "resubmitted"
+            return Status.RUNNING
+        if isinstance(self.result, Status):
+            self.feedback_message = "finished [%s]" % self.result
+            return self.result
+        self.feedback_message = "finished"
+        return Status.FAILURE if self.result is False else Status.SUCCESS
+
+    def terminate(self, new_status):
+        """
+        Cancel (or abandon) the job if interrupted.
+
+        Args:
+            new_status (:class:`~py_trees.common.Status`): the behaviour is transitioning to this new status
+        """
+        self.logger.debug("%s.terminate(%s->%s)", self.__class__.__name__, self.status, new_status)
+        if new_status == Status.INVALID and self.future is not None:
+            cancelled = self.future.cancel()
+            self.feedback_message = "cancelled" if cancelled else "abandoned"
+        self.future = None
+        self._progress_queue = None
+
+    def _drain_progress(self):
+        if self._progress_queue is None:
+            return
+        try:
+            while True:
+                self.progress = self._progress_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+
 ##############################################################################
 # Composite Behaviours
 ##############################################################################
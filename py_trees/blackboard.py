@@ -24,11 +24,17 @@ For this package, we've decided to keep blackboards extremely simple to fit
 with the same 'rapid development for small scale systems' principles
 that this library is designed for.
 
-* No sharing between tree instances
-* No locking for reading/writing
-* Global scope, i.e. any behaviour can access any variable
+* No sharing between processes
+* No locking for reading/writing, unless requested (see :meth:`Blackboard.create() <py_trees.blackboard.Blackboard.create>`)
+* Global scope by default, i.e. any behaviour can access any variable
+* Optional scopes for trees and subtrees, which fall back to their enclosing scope
 * No external communications (e.g. to a database)
 
+Behaviours find their blackboard with :func:`~py_trees.blackboard.for_behaviour`,
+i.e. a scope set on their subtree (``blackboard_scope``), else their tree's
+blackboard, else the global blackboard. The blackboard behaviours below
+resolve it whenever they use it, so they follow moves between scopes and trees.
+
 .. include:: weblinks.rst
 """
 
@@ -36,8 +42,26 @@ that this library is designed for.
 # Imports
 ##############################################################################
 
+import array
+import collections
+import heapq
+import itertools
+import json
 import operator
-
+import struct
+import sys
+import threading
+import time
+import timeit
+import uuid
+import weakref
+
+try:
+    import reprlib
+except ImportError:
+    import repr as reprlib  # python2
+
+from . import behaviour
 from . import behaviours
 from . import common
 from . import console
@@ -46,6 +70,805 @@ from . import console
 # Classes
 ##############################################################################
 
+_monotonic = getattr(time, 'monotonic', timeit.default_timer)
+
+
+# sentinel for missing values, distinct from None (a legitimate value)
+_MISSING = object()
+
+# values of these types cannot change without a write to the blackboard
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, frozenset)
+try:
+    _IMMUTABLE_TYPES += (long, unicode)  # noqa: F821 (python2)
+except NameError:
+    pass
+
+Change = collections.namedtuple('Change', ['key', 'operation', 'value', 'version'])
+"""
+A change to a blackboard variable, as delivered to subscribers.
+
+Attributes:
+    key (:obj:`str`): name of the variable
+    operation (:class:`~py_trees.common.BlackboardOperation`): what happened to it
+    value (:obj:`any`): the new value (None if unset)
+    version (:obj:`int`): the variable's version after the change
+"""
+
+
+class Subscription(object):
+    """
+    Handle for a subscription to blackboard changes, returned by
+    :meth:`Blackboard.subscribe() <py_trees.blackboard.Blackboard.subscribe>`.
+
+    Args:
+        callback (:obj:`func`): called with a list of :class:`~py_trees.blackboard.Change`
+        keys ({:obj:`str`}): variables of interest, None for all
+    """
+    __slots__ = ('callback', 'keys')
+
+    def __init__(self, callback, keys=None):
+        self.callback = callback
+        self.keys = None if keys is None else frozenset(keys)
+
+    def notify(self, changes):
+        if self.keys is not None:
+            changes = [change for change in changes if change.key in self.keys]
+            if not changes:
+                return
+        self.callback(changes)
+
+
+# containers that rendering abbreviates, rather than formatting every element
+_CONTAINER_TYPES = (list, tuple, dict, set, frozenset, collections.deque)
+_abbreviated = reprlib.Repr()
+
+
+class _Collector(object):
+    """A minimal stream, collecting what is written in a list."""
+    __slots__ = ('write',)
+
+    def __init__(self, chunks):
+        self.write = chunks.append
+
+
+# write sequence numbers, shared by all blackboards so versions are always comparable
+_sequence = itertools.count(1)
+
+Activity = collections.namedtuple('Activity', ['key', 'operation', 'behaviour', 'tick', 'timestamp'])
+"""
+An entry in an :class:`~py_trees.blackboard.ActivityLog`.
+
+Attributes:
+    key (:obj:`str`): name of the variable
+    operation (:class:`~py_trees.common.BlackboardOperation`): what happened to it
+    behaviour (:class:`uuid.UUID`): id of the behaviour being ticked at the time, None if outside a tick
+    tick (:obj:`int`): the tree's tick count at the time
+    timestamp (:obj:`float`): wall clock time, in seconds since the epoch
+"""
+
+_OPERATIONS = tuple(common.BlackboardOperation)
+_OPERATION_CODES = dict((operation, code) for code, operation in enumerate(_OPERATIONS))
+_NO_BEHAVIOUR = b"\x00" * 16
+
+
+class ActivityLog(object):
+    """
+    A record of the most recent writes to a blackboard, for post-mortems.
+    Enable one with :meth:`Blackboard.enable_activity_log() <py_trees.blackboard.Blackboard.enable_activity_log>`.
+
+    The log is a ring buffer, preallocated to its size, so recording a
+    write allocates nothing and the oldest entries are overwritten once it
+    is full. Writes are attributed to the behaviour that most recently
+    started ticking on the writing thread (:func:`~py_trees.behaviour.ticking`)
+    and stamped with the tree's tick count (kept up to date by
+    :class:`~py_trees.trees.BehaviourTree`). Writes deferred by a frozen
+    blackboard are recorded when they are applied, but attributed to their
+    writer.
+
+    Args:
+        size (:obj:`int`): number of entries to keep
+
+    Attributes:
+        size (:obj:`int`): number of entries kept
+        tick (:obj:`int`): tick count to stamp entries with
+        recorded (:obj:`int`): number of entries ever recorded
+
+    Raises:
+        ValueError: if the size is not positive
+    """
+    __slots__ = ('size', 'tick', 'recorded', '_keys', '_operations', '_behaviours',
+                 '_ticks', '_timestamps', '_counter')
+
+    _HEADER = struct.Struct("<8sQ")  # magic, number of entries
+    _ENTRY = struct.Struct("<BqdH16s")  # operation, tick, timestamp, key length, behaviour id
+    _MAGIC = b"PYTRACT\x01"
+
+    def __init__(self, size=1024):
+        if size < 1:
+            raise ValueError("activity logs need room for at least one entry [%s]" % size)
+        self.size = size
+        self.tick = 0
+        self.recorded = 0
+        self._keys = [None] * size
+        self._operations = array.array('B', [0]) * size
+        self._behaviours = [None] * size
+        self._ticks = array.array('l', [0]) * size
+        self._timestamps = array.array('d', [0.0]) * size
+        self._counter = itertools.count()
+
+    def record(self, key, operation):
+        """
+        Record a write (called by the blackboard).
+
+        Args:
+            key (:obj:`str`): name of the variable
+            operation (:class:`~py_trees.common.BlackboardOperation`): what happened to it
+        """
+        # claiming the slot is atomic, so concurrent writers get distinct slots
+        count = next(self._counter)
+        index = count % self.size
+        writer = behaviour._ticking.behaviour
+        self._keys[index] = key
+        self._operations[index] = _OPERATION_CODES[operation]
+        self._behaviours[index] = None if writer is None else writer.id
+        self._ticks[index] = self.tick
+        self._timestamps[index] = time.time()
+        self.recorded = count + 1
+
+    def entries(self):
+        """
+        Returns:
+            [:class:`~py_trees.blackboard.Activity`]: the entries, oldest first
+        """
+        recorded = self.recorded
+        first = max(0, recorded - self.size)
+        entries = []
+        for count in range(first, recorded):
+            index = count % self.size
+            entries.append(Activity(
+                self._keys[index],
+                _OPERATIONS[self._operations[index]],
+                self._behaviours[index],
+                self._ticks[index],
+                self._timestamps[index]
+            ))
+        return entries
+
+    def clear(self):
+        """
+        Drop all entries.
+        """
+        self._counter = itertools.count()
+        self.recorded = 0
+        for index in range(self.size):
+            self._keys[index] = None
+            self._behaviours[index] = None
+
+    def dump(self, path, binary=False):
+        """
+        Write the entries to a file, oldest first. The default is JSON lines,
+        one object per entry with the fields of :class:`~py_trees.blackboard.Activity`
+        (operations by name, behaviour ids as strings). The binary format
+        is more compact and is read back with :meth:`load`.
+
+        Args:
+            path (:obj:`str`): the file to write
+            binary (:obj:`bool`): whether to write the binary format
+        """
+        entries = self.entries()
+        if binary:
+            with open(path, "wb") as f:
+                f.write(self._HEADER.pack(self._MAGIC, len(entries)))
+                for entry in entries:
+                    key = entry.key.encode("utf-8")
+                    f.write(self._ENTRY.pack(
+                        _OPERATION_CODES[entry.operation],
+                        entry.tick,
+                        entry.timestamp,
+                        len(key),
+                        _NO_BEHAVIOUR if entry.behaviour is None else entry.behaviour.bytes
+                    ))
+                    f.write(key)
+            return
+        with open(path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps({
+                    "key": entry.key,
+                    "operation": entry.operation.value,
+                    "behaviour": None if entry.behaviour is None else str(entry.behaviour),
+                    "tick": entry.tick,
+                    "timestamp": entry.timestamp
+                }) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read the entries of a binary dump.
+
+        Args:
+            path (:obj:`str`): the file written by :meth:`dump`
+
+        Returns:
+            [:class:`~py_trees.blackboard.Activity`]: the entries, oldest first
+
+        Raises:
+            ValueError: if the file is not a binary activity log
+        """
+        with open(path, "rb") as f:
+            contents = f.read()
+        if len(contents) < cls._HEADER.size:
+            raise ValueError("not an activity log [%s]" % path)
+        magic, number = cls._HEADER.unpack_from(contents, 0)
+        if magic != cls._MAGIC:
+            raise ValueError("not an activity log [%s]" % path)
+        offset = cls._HEADER.size
+        entries = []
+        for unused_i in range(number):
+            code, tick, timestamp, length, behaviour_id = cls._ENTRY.unpack_from(contents, offset)
+            offset += cls._ENTRY.size
+            key = contents[offset:offset + length].decode("utf-8")
+            offset += length
+            entries.append(Activity(
+                key,
+                _OPERATIONS[code],
+                None if behaviour_id == _NO_BEHAVIOUR else uuid.UUID(bytes=behaviour_id),
+                tick,
+                timestamp
+            ))
+        return entries
+
+    def __len__(self):
+        return min(self.recorded, self.size)
+
+
+class _ReadWriteLock(object):
+    """
+    A lock that admits many readers or one writer. Waiting writers keep
+    new readers out so that they are not starved. Not reentrant.
+    """
+    __slots__ = ('_condition', '_readers', '_writer', '_writers_waiting')
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class _Expiry(object):
+    """
+    Deadlines of the variables written with a time to live, shared by a
+    hierarchy of stores. The heap holds (deadline, count, store, key)
+    entries, entries are left behind when a variable is rewritten or
+    removed and are discarded when popped if they no longer match the
+    store's ``deadlines``.
+    """
+    __slots__ = ('heap', 'lock', 'count')
+
+    def __init__(self):
+        self.heap = []
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def push(self, deadline, store, key):
+        with self.lock:
+            self.count += 1
+            heapq.heappush(self.heap, (deadline, self.count, store, key))
+
+    def expire(self):
+        """Evict the variables that are past their deadline."""
+        heap = self.heap
+        now = _monotonic()
+        try:
+            if heap[0][0] > now:
+                return
+        except IndexError:
+            return
+        due = []
+        with self.lock:
+            while heap and heap[0][0] <= now:
+                deadline, unused_count, store, key = heapq.heappop(heap)
+                if store.deadlines.get(key) == deadline:
+                    due.append((store, key, deadline))
+        for store, key, deadline in due:
+            store.apply(key, store._expire, (key, deadline))
+
+
+def _apply_as(writer, function, args, batch):
+    # apply a deferred operation as if its writer were still ticking
+    current = behaviour._ticking
+    ticking = current.behaviour
+    current.behaviour = writer
+    try:
+        function(*(args + (batch,)))
+    finally:
+        current.behaviour = ticking
+
+
+class _Store(object):
+    """
+    The data behind a blackboard, i.e. the variables and their versions.
+    Every write takes the next number of the global write sequence and
+    stamps the written variable's version with it, so versions increase
+    monotonically.
+
+    Stores form a hierarchy of scopes. A store's own variables are in
+    ``local``, ``data`` and ``versions`` hold every variable visible in the
+    scope, i.e. its ancestors' variables overlaid by its own. They are kept
+    up to date as variables are written so that lookups in any scope are
+    single dictionary lookups. For a root store ``local`` is ``data``.
+
+    A store (and its descendants) may be frozen, in which case writes (and
+    the changes they inherit from scopes that are not frozen) are deferred
+    to a list of operations that is applied when it is thawed.
+    Operations are (function, args) pairs, the functions taking a trailing
+    ``batch`` argument that collects the changes to notify per store (or
+    None to notify immediately). The lock, shared by the hierarchy,
+    serialises commits.
+
+    Locking stores also guard each variable with one of a number of
+    reader-writer locks (stripes, selected by the key's hash). Commits,
+    freezing and thawing take all of the stripes.
+
+    Variables written with a time to live have their deadline in
+    ``deadlines`` and on the hierarchy's expiry heap. Readers evict any
+    variables that are due before reading, so that expired variables are
+    never seen, at the cost of a clock read while deadlines are pending.
+
+    Writes are recorded in the ``activity`` log, if there is one.
+    """
+    __slots__ = ('name', 'parent', 'children', 'local', 'data', 'versions', 'sequence',
+                 'subscriptions', 'condition', 'waiters', 'lock', 'frozen', 'stripes', 'mask',
+                 'deadlines', 'expiry', 'activity', '__weakref__')
+
+    def __init__(self, name="", parent=None, stripes=0):
+        self.name = name
+        self.parent = parent
+        self.children = []  # weak references, scopes go with their trees
+        if parent is None:
+            self.local = {}
+            self.data = self.local
+            self.versions = {}
+            self.sequence = 0
+            self.lock = threading.RLock()
+            self.frozen = None
+            self.expiry = _Expiry()
+            self.activity = None
+            if stripes:
+                # round up to a power of two for masking
+                size = 1
+                while size < stripes:
+                    size *= 2
+                self.stripes = tuple(_ReadWriteLock() for unused_i in range(size))
+                self.mask = size - 1
+            else:
+                self.stripes = None
+                self.mask = 0
+        else:
+            parent.children.append(weakref.ref(self))
+            self.local = {}
+            self.data = dict(parent.data)
+            self.versions = dict(parent.versions)
+            self.sequence = parent.sequence
+            self.lock = parent.lock
+            self.frozen = parent.frozen
+            self.stripes = parent.stripes
+            self.mask = parent.mask
+            self.expiry = parent.expiry
+            self.activity = parent.activity
+        self.deadlines = {}
+        self.subscriptions = []
+        self.condition = threading.Condition()
+        self.waiters = 0
+
+    ############################################
+    # Writes
+    ############################################
+
+    def stripe(self, key):
+        """The reader-writer lock for the key, None if not locking."""
+        if self.stripes is None:
+            return None
+        return self.stripes[hash(key) & self.mask]
+
+    def apply(self, key, function, args):
+        """
+        Apply a write operation to the key, deferring it if frozen and
+        holding the key's stripe if locking.
+        """
+        if self.stripes is None:
+            batch = collections.OrderedDict()
+            # under the lock, so that a concurrent freeze can't slip in between
+            with self.lock:
+                if self.frozen is not None:
+                    self.frozen.append(self._attributed(function, args))
+                    return
+                function(*(args + (batch,)))
+            self.notify_batch(batch)
+            return
+        lock = self.stripes[hash(key) & self.mask]
+        while True:
+            batch = collections.OrderedDict()
+            lock.acquire_write()
+            try:
+                # freezing holds all of the stripes, so this is stable
+                applied = self.frozen is None
+                if applied:
+                    function(*(args + (batch,)))
+            finally:
+                lock.release_write()
+            # never defer under a stripe, commits take the stripes under the lock
+            if applied or self.defer(function, args):
+                break
+        self.notify_batch(batch)
+
+    def write(self, key, value):
+        if self.stripes is not None:
+            self.apply(key, self._write, (key, value))
+            return
+        batch = None
+        lock = self.lock
+        lock.acquire()
+        try:
+            if self.frozen is not None:
+                self.frozen.append(self._attributed(self._write, (key, value)))
+                return
+            # inlined _write, this is the hot path
+            if self.deadlines:
+                self.deadlines.pop(key, None)
+            if self.activity is not None:
+                self.activity.record(key, common.BlackboardOperation.SET)
+            sequence = next(_sequence)
+            self.local[key] = value
+            self.data[key] = value
+            self.versions[key] = sequence
+            self.sequence = sequence
+            if self.children:
+                batch = collections.OrderedDict()
+                self._inherit(key, value, sequence, batch)
+        finally:
+            lock.release()
+        if self.subscriptions or self.waiters:
+            self.notify([Change(key, common.BlackboardOperation.SET, value, sequence)])
+        if batch:
+            self.notify_batch(batch)
+
+    def write_expiring(self, key, value, ttl):
+        """Write a variable that expires after ttl seconds."""
+        self.apply(key, self._write_expiring, (key, value, _monotonic() + ttl))
+
+    def touch(self, key):
+        """Record an in-place write to the variable's value."""
+        self.apply(key, self._touch, (key,))
+
+    def set_attribute(self, key, target, attribute, value):
+        """Set an attribute of (an attribute of) the variable's value."""
+        self.apply(key, self._set_attribute, (key, target, attribute, value))
+
+    def delete(self, key):
+        if key not in self.local:
+            return False
+        self.apply(key, self._delete, (key,))
+        return True
+
+    def compare_and_set(self, key, expected, value):
+        """
+        Write the value if the variable's current value equals the expected
+        value, or the variable is missing and the expected value is _MISSING.
+        If frozen, the comparison is against the frozen view and the write is
+        deferred, to be compared again when it is applied.
+        """
+        if self.expiry.heap:
+            self.expiry.expire()
+        batch = collections.OrderedDict()
+        lock = self.stripe(key)
+        if lock is None:
+            self.lock.acquire()
+        else:
+            lock.acquire_write()
+        try:
+            swapped = self._matches(key, expected)
+            if swapped:
+                if self.frozen is not None:
+                    # freezing needs the lock or all stripes, one of which is held here
+                    self.frozen.append(self._attributed(self._compare_and_write, (key, expected, value)))
+                else:
+                    self._write(key, value, batch)
+        finally:
+            if lock is None:
+                self.lock.release()
+            else:
+                lock.release_write()
+        self.notify_batch(batch)
+        return swapped
+
+    def setdefault(self, key, default):
+        """
+        Get the variable, writing the default if it is missing (deferred if frozen).
+        """
+        while True:
+            value = self.read(key, _MISSING)
+            if value is not _MISSING or self.compare_and_set(key, _MISSING, default):
+                return default if value is _MISSING else value
+
+    def read(self, key, default, local=False):
+        if self.expiry.heap:
+            self.expiry.expire()
+        data = self.local if local else self.data
+        lock = self.stripe(key)
+        if lock is None:
+            return data.get(key, default)
+        lock.acquire_read()
+        try:
+            return data.get(key, default)
+        finally:
+            lock.release_read()
+
+    def clear(self):
+        for key in list(self.local):
+            self.delete(key)
+
+    def _write(self, key, value, batch):
+        if self.deadlines:
+            self.deadlines.pop(key, None)
+        if self.activity is not None:
+            self.activity.record(key, common.BlackboardOperation.SET)
+        self.local[key] = value
+        self._changed(key, value, next(_sequence), batch)
+
+    def _matches(self, key, expected):
+        current = self.data.get(key, _MISSING)
+        if expected is _MISSING:
+            return current is _MISSING
+        return current is not _MISSING and current == expected
+
+    def _compare_and_write(self, key, expected, value, batch):
+        # a compare and set deferred while frozen, the view may have moved on since
+        if self._matches(key, expected):
+            self._write(key, value, batch)
+
+    def _write_expiring(self, key, value, deadline, batch):
+        self._write(key, value, batch)
+        self.deadlines[key] = deadline
+        self.expiry.push(deadline, self, key)
+
+    def _touch(self, key, batch):
+        if key not in self.data:
+            return
+        if self.activity is not None:
+            self.activity.record(key, common.BlackboardOperation.SET)
+        store = self
+        while key not in store.local:
+            store = store.parent
+        store._changed(key, store.data[key], next(_sequence), batch)
+
+    def _set_attribute(self, key, target, attribute, value, batch):
+        setattr(target, attribute, value)
+        self._touch(key, batch)
+
+    def _delete(self, key, batch):
+        if key not in self.local:
+            return
+        del self.local[key]
+        if self.deadlines:
+            self.deadlines.pop(key, None)
+        if self.activity is not None:
+            self.activity.record(key, common.BlackboardOperation.UNSET)
+        # uncovers the variable in the parent scope (if any)
+        value = _MISSING if self.parent is None else self.parent.data.get(key, _MISSING)
+        self._changed(key, value, next(_sequence), batch)
+
+    def _expire(self, key, deadline, batch):
+        # rewritten or removed since it was found to be due?
+        if self.deadlines.get(key) != deadline:
+            return
+        del self.deadlines[key]
+        del self.local[key]
+        if self.activity is not None:
+            self.activity.record(key, common.BlackboardOperation.EXPIRE)
+        value = _MISSING if self.parent is None else self.parent.data.get(key, _MISSING)
+        self._changed(key, value, next(_sequence), batch, common.BlackboardOperation.EXPIRE)
+
+    def _changed(self, key, value, sequence, batch, removal=common.BlackboardOperation.UNSET):
+        if value is _MISSING:
+            self.data.pop(key, None)
+            change = Change(key, removal, None, sequence)
+        else:
+            self.data[key] = value
+            change = Change(key, common.BlackboardOperation.SET, value, sequence)
+        self.versions[key] = sequence
+        self.sequence = sequence
+        if self.subscriptions or self.waiters:
+            if batch is None:
+                self.notify([change])
+            else:
+                batch.setdefault(self, []).append(change)
+        if self.children:
+            self._inherit(key, value, sequence, batch, removal)
+
+    def _inherit(self, key, value, sequence, batch, removal=common.BlackboardOperation.UNSET):
+        for reference in list(self.children):
+            child = reference()
+            if child is None:
+                self.children.remove(reference)
+            elif key not in child.local:
+                if child.frozen is not None:
+                    # keep the frozen view stable, catch up on thaw (freezing and
+                    # thawing need the lock or all stripes, one of which is held here)
+                    child.frozen.append((child._inherited, (key, value, removal)))
+                else:
+                    child._changed(key, value, sequence, batch, removal)
+
+    def _inherited(self, key, value, removal, batch):
+        # a change to the parent scope, deferred while this scope was frozen
+        if key not in self.local:
+            self._changed(key, value, next(_sequence), batch, removal)
+
+    ############################################
+    # Commits
+    ############################################
+
+    def descendants(self):
+        """Generate this store and the stores of all enclosed scopes."""
+        yield self
+        for reference in list(self.children):
+            child = reference()
+            if child is not None:
+                for store in child.descendants():
+                    yield store
+
+    def defer(self, function, args):
+        """
+        Defer an operation if the store is frozen.
+
+        Returns:
+            :obj:`bool`: whether the operation was deferred
+        """
+        with self.lock:
+            if self.frozen is None:
+                return False
+            self.frozen.append(self._attributed(function, args))
+            return True
+
+    def _attributed(self, function, args):
+        """Bind a deferred operation to its writer, for the activity log."""
+        if self.activity is None:
+            return (function, args)
+        return (_apply_as, (behaviour._ticking.behaviour, function, args))
+
+    def commit(self, operations):
+        """
+        Apply operations atomically, or defer them all if the store is frozen.
+        Changes are notified in one batch per store.
+        """
+        batch = collections.OrderedDict()
+        with self.lock:
+            if self.frozen is not None:
+                self.frozen.extend(self._attributed(function, args) for function, args in operations)
+                return
+            self.acquire_stripes()
+            try:
+                for function, args in operations:
+                    function(*(args + (batch,)))
+            finally:
+                self.release_stripes()
+        self.notify_batch(batch)
+
+    def freeze(self):
+        with self.lock:
+            if self.frozen is not None:
+                return
+            operations = []
+            self.acquire_stripes()
+            try:
+                for store in self.descendants():
+                    store.frozen = operations
+            finally:
+                self.release_stripes()
+
+    def thaw(self):
+        """Apply the deferred operations and resume immediate writes."""
+        batch = collections.OrderedDict()
+        with self.lock:
+            operations = self.frozen
+            if operations is None:
+                return
+            self.acquire_stripes()
+            try:
+                for store in self.descendants():
+                    store.frozen = None
+                for function, args in operations:
+                    function(*(args + (batch,)))
+            finally:
+                self.release_stripes()
+        self.notify_batch(batch)
+
+    def acquire_stripes(self):
+        # always in the same order, to avoid deadlocks
+        if self.stripes is not None:
+            for stripe in self.stripes:
+                stripe.acquire_write()
+
+    def release_stripes(self):
+        if self.stripes is not None:
+            for stripe in self.stripes:
+                stripe.release_write()
+
+    ############################################
+    # Notifications
+    ############################################
+
+    def notify(self, changes):
+        if self.waiters:
+            with self.condition:
+                self.condition.notify_all()
+        # copy, callbacks may unsubscribe
+        for subscription in list(self.subscriptions):
+            subscription.notify(changes)
+
+    @staticmethod
+    def notify_batch(batch):
+        for store, changes in batch.items():
+            store.notify(changes)
+
+    def wait(self, key, version, timeout):
+        versions = self.versions
+        with self.condition:
+            self.waiters += 1
+            try:
+                if timeout is None:
+                    while versions.get(key, 0) <= version:
+                        self.condition.wait()
+                else:
+                    deadline = _monotonic() + timeout
+                    while versions.get(key, 0) <= version:
+                        remaining = deadline - _monotonic()
+                        if remaining <= 0.0:
+                            return None
+                        self.condition.wait(remaining)
+            finally:
+                self.waiters -= 1
+        return versions[key]
+
+
+class _ClearMethod(object):
+    """
+    Erase the blackboard contents. Typically this is used only when you
+    have repeated runs of different tree instances, as often happens in testing.
+    Called on the class, it clears the global blackboard, called on an
+    instance, it clears the variables of that blackboard's scope.
+    Subscriptions are retained.
+    """
+    def __get__(self, instance, owner):
+        if instance is None:
+            return owner._Blackboard__shared_store.clear
+        return instance._store.clear
+
 
 class Blackboard(object):
     """
@@ -53,6 +876,12 @@ class Blackboard(object):
 
     .. _Borg: http://code.activestate.com/recipes/66531-singleton-we-dont-need-no-stinkin-singleton-the-bo/
 
+    The store itself is a plain dictionary shared by all instances, unless
+    the blackboard was created as a separate scope with :meth:`create`. Besides the
+    attribute style and string based access shown below, hot paths should use
+    an :class:`~py_trees.blackboard.Accessor` obtained once (e.g. at construction)
+    via :meth:`accessor`, it avoids the attribute machinery and exceptions altogether.
+
     Examples:
         You can instantiate the blackboard from anywhere in your program. Even
         disconnected calls will get access to the same data store. For example:
@@ -78,6 +907,24 @@ class Blackboard(object):
             result = blackboard.set("foo", "bar")
             foo = blackboard.get("foo")
 
+        For repeated access, pre-resolve the key:
+
+        .. code-block:: python
+
+            foo = Blackboard().accessor("foo")
+            foo.set("bar")
+            value = foo.get()
+
+        Trees that share a process can keep to themselves with blackboards
+        of their own, and subtrees can be given a local scope that falls back
+        to the tree's variables:
+
+        .. code-block:: python
+
+            blackboard = Blackboard.create("robot_1")
+            tree = py_trees.trees.BehaviourTree(root, blackboard=blackboard)
+            navigation.blackboard_scope = Blackboard.create("navigation", parent=blackboard)
+
         The blackboard can also be converted and printed (with highlighting)
         as a string. This is useful for logging and debugging.
 
@@ -88,58 +935,160 @@ class Blackboard(object):
 
     .. warning::
 
-       Be careful of key collisions. This implementation leaves this management up to the user.
+       Be careful of key collisions. This implementation leaves this management up to the user,
+       though scopes (see :meth:`create`) help.
 
     .. seealso:: The :ref:`py-trees-demo-blackboard-program` program demos use of the blackboard along with a couple of the blackboard behaviours.
     """
     # Dunder style to avoid collisions
-    __shared_state = {}
+    __shared_store = _Store()
+    __slots__ = ('_store', '_data')
 
-    @staticmethod
-    def clear():
-        """
-        Erase the blackboard contents. Typically this is used only when you
-        have repeated runs of different tree instances, as often happens in testing.
-        """
-        Blackboard.__shared_state.clear()
+    clear = _ClearMethod()
 
     def __init__(self):
-        self.__dict__ = self.__shared_state
+        self._bind(Blackboard.__shared_store)
+
+    @classmethod
+    def create(cls, name, parent=None, stripes=0):
+        """
+        Create a blackboard with a scope of its own, i.e. variables that
+        are not shared with the global blackboard. Variables of the parent
+        scope (if any) are visible until shadowed by a variable of the same
+        name in this scope. Writes are always to this scope.
 
-    def set(self, name, value, overwrite=True):
+        Blackboards that are fed by other threads should be created with
+        locking stripes. Each variable is then guarded by one of that
+        many reader-writer locks (selected by hashing its name), so readers
+        only ever wait for writers of variables sharing their stripe.
+        Scopes inherit the locking of their parent.
+
+        Args:
+            name (:obj:`str`): name of the scope
+            parent (:class:`~py_trees.blackboard.Blackboard`): the enclosing scope, or None for an isolated blackboard
+            stripes (:obj:`int`): number of reader-writer locks (rounded up to a power of two), 0 for no locking
+
+        Returns:
+            :class:`~py_trees.blackboard.Blackboard`: the new blackboard
+        """
+        if parent is not None and parent._store.name:
+            name = parent._store.name + "/" + name
+        blackboard = cls.__new__(cls)
+        blackboard._bind(_Store(name, None if parent is None else parent._store, stripes))
+        return blackboard
+
+    def _bind(self, store):
+        object.__setattr__(self, '_store', store)
+        object.__setattr__(self, '_data', store.data)
+
+    ############################################
+    # Attribute Style Access
+    ############################################
+
+    def __getattr__(self, name):
+        # only called if regular attribute lookup failed
+        value = self._store.read(name, _MISSING)
+        if value is _MISSING:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        return value
+
+    def __setattr__(self, name, value):
+        self._store.write(name, value)
+
+    def __delattr__(self, name):
+        if not self._store.delete(name):
+            raise AttributeError(name)
+
+    ############################################
+    # String Style Access
+    ############################################
+
+    def set(self, name, value, overwrite=True, ttl=None):
         """
         For when you only have strings to identify and access the blackboard variables, this
         provides a convenient setter.
 
+        Variables with a time to live are removed once it has passed, until then
+        they behave as any other. Removal happens as soon as the blackboard is read
+        after the deadline, or when the tree ticks (see :meth:`expire`), and is
+        notified to subscribers as an :data:`~py_trees.common.BlackboardOperation.EXPIRE`.
+
         Args:
             name (:obj:`str`): name of the variable to set
             value (:obj:`any`): any variable type
             overwrite(:obj:`bool`): whether to abort if the value is already present
+            ttl (:obj:`float`): seconds until the variable expires, None to keep it indefinitely
 
         Returns:
             :obj:`bool`: always True unless overwrite was set to False and a variable already exists
         """
-        if not overwrite:
-            try:
-                getattr(self, name)
-                return False
-            except AttributeError:
-                pass
-        setattr(self, name, value)
+        if not overwrite and self.exists(name):
+            return False
+        if ttl is None:
+            self._store.write(name, value)
+        else:
+            self._store.write_expiring(name, value, ttl)
         return True
 
-    def get(self, name):
+    def get(self, name, default=None, local=False):
         """
         For when you only have strings to identify and access the blackboard variables,
         this provides a convenient accessor.
 
         Args:
-            name (:obj:`str`): name of the variable to set
+            name (:obj:`str`): name of the variable to get
+            default (:obj:`any`): value to return if the variable does not exist
+            local (:obj:`bool`): only look in this blackboard's scope, not in the scopes enclosing it
         """
-        try:
-            return getattr(self, name)
-        except AttributeError:
-            return None
+        return self._store.read(name, default, local)
+
+    def compare_and_set(self, name, expected, value):
+        """
+        Atomically set the variable if it currently has the expected value.
+        On blackboards with locking stripes (see :meth:`create`) this is
+        atomic with respect to all other writes, otherwise only with respect
+        to other writes through the blackboard.
+
+        While the blackboard is frozen (see :meth:`freeze`), the variable is
+        compared as seen in the frozen view and the write is deferred like
+        any other. It is compared again when it is applied, and dropped if
+        it no longer holds by then (e.g. after other deferred writes).
+
+        Args:
+            name (:obj:`str`): name of the variable
+            expected (:obj:`any`): the value it must have (compared with ==)
+            value (:obj:`any`): the new value
+
+        Returns:
+            :obj:`bool`: whether the variable was set
+        """
+        return self._store.compare_and_set(name, expected, value)
+
+    def setdefault(self, name, default):
+        """
+        Atomically get the variable, setting it to the default if it does not
+        exist yet (c.f. :meth:`compare_and_set`).
+
+        Args:
+            name (:obj:`str`): name of the variable
+            default (:obj:`any`): value to set if the variable does not exist
+
+        Returns:
+            :obj:`any`: the value of the variable
+        """
+        return self._store.setdefault(name, default)
+
+    def exists(self, name):
+        """
+        Check if a variable exists on the blackboard.
+
+        Args:
+            name (:obj:`str`): name of the variable
+
+        Returns:
+            :obj:`bool`: whether the variable exists
+        """
+        return self._store.read(name, _MISSING) is not _MISSING
 
     def unset(self, name):
         """
@@ -149,41 +1098,570 @@ class Blackboard(object):
         Args:
             name (:obj:`str`): name of the variable to unset
         """
+        self._store.delete(name)
+
+    def keys(self):
+        """
+        Returns:
+            [:obj:`str`]: names of the variables visible on the blackboard, including those of enclosing scopes
+        """
+        self.expire()
+        return list(self._data.keys())
+
+    def accessor(self, name):
+        """
+        Pre-resolve a variable for fast, repeated access.
+
+        Args:
+            name (:obj:`str`): name of the variable, may address attributes of the stored value, e.g. 'pose.position.x'
+
+        Returns:
+            :class:`~py_trees.blackboard.Accessor`: the accessor
+        """
+        return Accessor(self, name)
+
+    ############################################
+    # Versions & Notifications
+    ############################################
+
+    def version(self, name):
+        """
+        Every write (or removal) stamps the variable with the blackboard's
+        global write sequence number, so an unchanged version means an
+        unchanged variable.
+
+        .. note:: Modifying a variable's value in place (e.g. ``blackboard.pose.x = 3``)
+           bypasses the blackboard, call :meth:`touch` afterwards to record the write.
+
+        Args:
+            name (:obj:`str`): name of the variable
+
+        Returns:
+            :obj:`int`: version of the variable, 0 if it has never been written
+        """
+        if self._store.expiry.heap:
+            self._store.expiry.expire()
+        return self._store.versions.get(name, 0)
+
+    def expire(self):
+        """
+        Remove the variables whose time to live has passed (see :meth:`set`).
+        This is cheap if none are due, trees call it before every tick so that
+        subscribers hear of expiries even if nobody reads the variables.
+        """
+        if self._store.expiry.heap:
+            self._store.expiry.expire()
+
+    def enable_activity_log(self, size=1024):
+        """
+        Start recording writes to this blackboard, and to the blackboards of
+        scopes it encloses, in an :class:`~py_trees.blackboard.ActivityLog`.
+        Replaces any log already enabled. While disabled, the cost to writes
+        is negligible.
+
+        Args:
+            size (:obj:`int`): number of entries to keep
+
+        Returns:
+            :class:`~py_trees.blackboard.ActivityLog`: the log
+        """
+        activity = ActivityLog(size)
+        with self._store.lock:
+            for store in self._store.descendants():
+                store.activity = activity
+        return activity
+
+    def disable_activity_log(self):
+        """
+        Stop recording writes, see :meth:`enable_activity_log`.
+        """
+        with self._store.lock:
+            for store in self._store.descendants():
+                store.activity = None
+
+    def activity_log(self):
+        """
+        Returns:
+            :class:`~py_trees.blackboard.ActivityLog`: the log recording writes to this blackboard, None if disabled
+        """
+        return self._store.activity
+
+    def sequence(self):
+        """
+        Returns:
+            :obj:`int`: sequence number of the latest write visible on this blackboard
+        """
+        return self._store.sequence
+
+    def touch(self, name):
+        """
+        Record a write to a variable that was modified in place, bumping its
+        version and notifying subscribers.
+
+        Args:
+            name (:obj:`str`): name of the variable
+        """
+        self._store.touch(name)
+
+    def subscribe(self, callback, keys=None):
+        """
+        Register a callback for changes to the blackboard. It is called
+        synchronously by the writer with a list of
+        :class:`~py_trees.blackboard.Change` events.
+
+        Args:
+            callback (:obj:`func`): function accepting a list of :class:`~py_trees.blackboard.Change`
+            keys ([:obj:`str`]): names of the variables of interest, None for all
+
+        Returns:
+            :class:`~py_trees.blackboard.Subscription`: handle for :meth:`unsubscribe`
+        """
+        subscription = Subscription(callback, keys)
+        self._store.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Args:
+            subscription (:class:`~py_trees.blackboard.Subscription`): handle returned by :meth:`subscribe`
+        """
         try:
-            delattr(self, name)
-        except AttributeError:
+            self._store.subscriptions.remove(subscription)
+        except ValueError:
             pass
 
+    ############################################
+    # Transactions & Snapshots
+    ############################################
+
+    def transaction(self):
+        """
+        Start a transaction, i.e. a batch of writes to be committed
+        atomically, typically used as a context manager:
+
+        .. code-block:: python
+
+            with blackboard.transaction() as transaction:
+                transaction.set("x", 3.0)
+                transaction.set("y", 4.0)
+
+        Returns:
+            :class:`~py_trees.blackboard.Transaction`: the transaction
+        """
+        return Transaction(self)
+
+    def freeze(self):
+        """
+        Freeze the blackboard (and the scopes it encloses). Reads continue
+        to see the variables as they were when frozen, writes (from any
+        thread and committed transactions) are deferred until :meth:`thaw`.
+        This is used by trees to give behaviours a consistent view for the
+        duration of a tick (see :attr:`BehaviourTree.snapshot_blackboard <py_trees.trees.BehaviourTree.snapshot_blackboard>`).
+        """
+        self._store.freeze()
+
+    def thaw(self):
+        """
+        Commit the writes deferred since :meth:`freeze` in one atomic batch
+        and resume immediate writes. Subscribers are notified once per
+        scope with all of the changes.
+        """
+        self._store.thaw()
+
+    def frozen(self):
+        """
+        Returns:
+            :obj:`bool`: whether the blackboard is frozen
+        """
+        return self._store.frozen is not None
+
+    ############################################
+    # Waits
+    ############################################
+
+    def wait(self, name, version=None, timeout=None):
+        """
+        Block until the variable is written (by another thread).
+
+        Args:
+            name (:obj:`str`): name of the variable
+            version (:obj:`int`): wait for a version newer than this, None for the current version
+            timeout (:obj:`float`): seconds to wait, None to wait indefinitely
+
+        Returns:
+            :obj:`int`: the new version of the variable, or None if the wait timed out
+        """
+        if version is None:
+            version = self.version(name)
+        return self._store.wait(name, version, timeout)
+
+    def render(self, stream=None, keys=None, prefix=None, since=None,
+               max_value_length=None, max_value_lines=None, max_keys=None):
+        """
+        Write the blackboard contents to a stream, sorted by name, one
+        variable per line (values spanning several lines are indented below
+        their name). Only the selected variables are sorted and formatted, so
+        narrowing the selection keeps rendering cheap on large blackboards.
+
+        .. code-block:: python
+
+           # after ticking, what changed in the last tick?
+           blackboard.render(sys.stdout, since=tree.sequence_at(tree.count - 1))
+
+        Args:
+            stream (:obj:`file`): where to write, sys.stdout if None
+            keys ([:obj:`str`]): only render these variables
+            prefix (:obj:`str`): only render variables with names starting with this
+            since (:obj:`int`): only render variables written or removed after this sequence
+                number (see :meth:`sequence`), removed variables are rendered as '<unset>'
+            max_value_length (:obj:`int`): truncate values to this many characters (containers
+                are abbreviated with :mod:`reprlib` rather than formatted in full)
+            max_value_lines (:obj:`int`): truncate values spanning more lines
+            max_keys (:obj:`int`): render at most this many variables, the first by name
+        """
+        self.expire()
+        write = (sys.stdout if stream is None else stream).write
+        data = self._data
+        versions = self._store.versions
+        # removed variables only linger in the versions
+        names = data if since is None else versions
+        if keys is None:
+            selected = list(names)
+        else:
+            selected = [key for key in keys if key in names]
+        if prefix is not None:
+            selected = [key for key in selected if key.startswith(prefix)]
+        if since is not None:
+            selected = [key for key in selected if versions.get(key, 0) > since]
+        total = len(selected)
+        if max_keys is not None and total > max_keys:
+            selected = heapq.nsmallest(max_keys, selected)
+        else:
+            selected.sort()
+        header = type(self).__name__
+        if self._store.name:
+            header += " [" + self._store.name + "]"
+        write(console.green + header + "\n" + console.reset)
+        max_length = max([len(key) for key in selected] or [0])
+        for key in selected:
+            value = data.get(key, _MISSING)
+            if value is _MISSING:
+                text = "<unset>"
+            elif value is None:
+                text = "-"
+            elif max_value_length is not None and isinstance(value, _CONTAINER_TYPES):
+                text = _abbreviated.repr(value)
+            else:
+                text = '{0}'.format(value)
+            if max_value_length is not None and len(text) > max_value_length:
+                text = text[:max_value_length] + "..."
+            lines = text.split('\n')
+            name = console.cyan + "  " + '{0: <{1}}'.format(key, max_length + 1) + console.reset
+            if len(lines) > 1:
+                if max_value_lines is not None and len(lines) > max_value_lines:
+                    lines = lines[:max_value_lines] + ["..."]
+                write(name + ":\n")
+                for line in lines:
+                    write(console.yellow + "    " + line + "\n" + console.reset)
+            else:
+                write(name + ": " + console.yellow + text + "\n" + console.reset)
+        if total > len(selected):
+            write("  ... %s more\n" % (total - len(selected)))
+        write(console.reset)
+
     def __str__(self):
         """
-        Express the blackboard contents as a string. Useful for debugging.
+        Express the blackboard contents as a string. Useful for debugging,
+        prefer :meth:`render` for large blackboards.
 
         Returns:
             :obj:`str`: blackboard contents
         """
-        s = console.green + type(self).__name__ + "\n" + console.reset
-        max_length = 0
-        for k in self.__dict__.keys():
-            max_length = len(k) if len(k) > max_length else max_length
-        keys = sorted(self.__dict__)
-        for key in keys:
-            value = self.__dict__[key]
-            if value is None:
-                value_string = "-"
-                s += console.cyan + "  " + '{0: <{1}}'.format(key, max_length + 1) + console.reset + ": " + console.yellow + "{0}\n".format(value_string) + console.reset
+        chunks = []
+        self.render(_Collector(chunks))
+        return "".join(chunks)
+
+
+class Accessor(object):
+    """
+    A pre-resolved handle on a blackboard variable, obtained via
+    :meth:`Blackboard.accessor() <py_trees.blackboard.Blackboard.accessor>`.
+    The variable name is parsed once and reads and writes go straight to the
+    blackboard's dictionary, without attribute lookups or exceptions for
+    missing variables.
+
+    The name may address attributes of the stored value with dots, e.g.
+    'foobar.foo' reads the 'foo' attribute of the value stored as 'foobar'.
+
+    Args:
+        blackboard (:class:`~py_trees.blackboard.Blackboard`): the blackboard
+        name (:obj:`str`): name of the variable
+
+    Attributes:
+        name (:obj:`str`): name of the variable
+        key (:obj:`str`): name of the blackboard entry (the part before the first dot)
+        attributes ((:obj:`str`)): attributes of the entry's value to follow
+    """
+    __slots__ = ('name', 'key', 'attributes', '_store', '_data', '_versions', '_lock', '_deadlines')
+
+    def __init__(self, blackboard, name):
+        self.name = name
+        parts = name.split('.')
+        self.key = parts[0]
+        self.attributes = tuple(parts[1:])
+        self._store = blackboard._store
+        self._data = blackboard._data
+        self._versions = blackboard._store.versions
+        self._lock = blackboard._store.stripe(self.key)
+        self._deadlines = blackboard._store.expiry.heap  # the list is only ever modified in place
+
+    def get(self, default=None):
+        """
+        Args:
+            default (:obj:`any`): value to return if the variable does not exist
+
+        Returns:
+            :obj:`any`: the value of the variable or the default if it does not exist
+        """
+        if self._deadlines:
+            self._store.expiry.expire()
+        if self._lock is not None:
+            self._lock.acquire_read()
+            try:
+                return self._get(default)
+            finally:
+                self._lock.release_read()
+        return self._get(default)
+
+    def _get(self, default):
+        value = self._data.get(self.key, _MISSING)
+        if value is _MISSING:
+            return default
+        for attribute in self.attributes:
+            value = getattr(value, attribute, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
+
+    def exists(self):
+        """
+        Returns:
+            :obj:`bool`: whether the variable exists
+        """
+        return self.get(_MISSING) is not _MISSING
+
+    def version(self):
+        """
+        Returns:
+            :obj:`int`: version of the blackboard entry, see :meth:`Blackboard.version() <py_trees.blackboard.Blackboard.version>`
+        """
+        if self._deadlines:
+            self._store.expiry.expire()
+        return self._versions.get(self.key, 0)
+
+    def set(self, value, ttl=None):
+        """
+        Set the variable. For names addressing an attribute, the attribute
+        is set on the stored value (which must exist) and the entry's version bumped.
+
+        Args:
+            value (:obj:`any`): the new value
+            ttl (:obj:`float`): seconds until the entry expires, see :meth:`Blackboard.set() <py_trees.blackboard.Blackboard.set>`
+
+        Raises:
+            AttributeError: if the name addresses an attribute of a value that does not exist
+            ValueError: if a ttl is given for a name addressing an attribute
+        """
+        if not self.attributes:
+            if ttl is None:
+                self._store.write(self.key, value)
             else:
-                lines = ('{0}'.format(value)).split('\n')
-                if len(lines) > 1:
-                    s += console.cyan + "  " + '{0: <{1}}'.format(key, max_length + 1) + console.reset + ":\n"
-                    for line in lines:
-                        s += console.yellow + "    {0}\n".format(line) + console.reset
-                else:
-                    s += console.cyan + "  " + '{0: <{1}}'.format(key, max_length + 1) + console.reset + ": " + console.yellow + '{0}\n'.format(value) + console.reset
-        s += console.reset
-        return s
+                self._store.write_expiring(self.key, value, ttl)
+            return
+        if ttl is not None:
+            raise ValueError("a time to live is only available for blackboard entries [%s]" % self.name)
+        parent = self._data.get(self.key, _MISSING)
+        for attribute in self.attributes[:-1]:
+            parent = getattr(parent, attribute, _MISSING)
+            if parent is _MISSING:
+                break
+        if parent is _MISSING:
+            raise AttributeError("blackboard variable '%s' does not exist" % self.name.rsplit('.', 1)[0])
+        self._store.set_attribute(self.key, parent, self.attributes[-1], value)
+
+    def compare_and_set(self, expected, value):
+        """
+        Atomically set the variable if it currently has the expected value,
+        see :meth:`Blackboard.compare_and_set() <py_trees.blackboard.Blackboard.compare_and_set>`
+        (only for names without attributes).
+
+        Args:
+            expected (:obj:`any`): the value it must have (compared with ==)
+            value (:obj:`any`): the new value
+
+        Returns:
+            :obj:`bool`: whether the variable was set
+
+        Raises:
+            ValueError: if the name addresses an attribute of a value
+        """
+        if self.attributes:
+            raise ValueError("compare and set is only available for blackboard entries [%s]" % self.name)
+        return self._store.compare_and_set(self.key, expected, value)
+
+    def unset(self):
+        """
+        Remove the blackboard entry (only for names without attributes).
+        """
+        if not self.attributes:
+            self._store.delete(self.key)
+
+
+class Transaction(object):
+    """
+    A batch of writes to a blackboard that is committed atomically, i.e.
+    without other commits or tick snapshots interleaving, and notified to
+    subscribers as a single batch. Obtain one with
+    :meth:`Blackboard.transaction() <py_trees.blackboard.Blackboard.transaction>`.
+    Used as a context manager, it commits on exit, unless an exception was
+    raised in which case the writes are discarded.
+
+    Reads through the transaction see its own, uncommitted writes.
+
+    Args:
+        blackboard (:class:`~py_trees.blackboard.Blackboard`): the blackboard to write to
+    """
+    __slots__ = ('_store', '_writes', '_ttls')
+
+    def __init__(self, blackboard):
+        self._store = blackboard._store
+        self._writes = collections.OrderedDict()
+        self._ttls = {}
+
+    def set(self, name, value, ttl=None):
+        """
+        Args:
+            name (:obj:`str`): name of the variable to set
+            value (:obj:`any`): any variable type
+            ttl (:obj:`float`): seconds until the variable expires, counted from the commit
+        """
+        self._writes[name] = value
+        if ttl is None:
+            self._ttls.pop(name, None)
+        else:
+            self._ttls[name] = ttl
+
+    def unset(self, name):
+        """
+        Args:
+            name (:obj:`str`): name of the variable to unset
+        """
+        self._writes[name] = _MISSING
+        self._ttls.pop(name, None)
+
+    def get(self, name, default=None):
+        """
+        Args:
+            name (:obj:`str`): name of the variable to get
+            default (:obj:`any`): value to return if the variable does not exist
+
+        Returns:
+            :obj:`any`: the value written in this transaction, else the blackboard's value, else the default
+        """
+        value = self._writes.get(name, _MISSING)
+        if value is _MISSING:
+            if name in self._writes:
+                return default
+            return self._store.read(name, default)
+        return value
+
+    def commit(self):
+        """
+        Commit the writes (deferred to the end of the tick if the blackboard is frozen).
+        """
+        store = self._store
+        now = _monotonic()
+        operations = []
+        for name, value in self._writes.items():
+            if value is _MISSING:
+                operations.append((store._delete, (name,)))
+            elif name in self._ttls:
+                operations.append((store._write_expiring, (name, value, now + self._ttls[name])))
+            else:
+                operations.append((store._write, (name, value)))
+        self.discard()
+        store.commit(operations)
 
+    def discard(self):
+        """
+        Throw away the writes.
+        """
+        self._writes.clear()
+        self._ttls.clear()
 
-class ClearBlackboardVariable(behaviours.Success):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, unused_value, unused_traceback):
+        if exception_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+
+def for_behaviour(behaviour):
+    """
+    Find the blackboard that a behaviour should use. That is the
+    ``blackboard_scope`` of the closest of the behaviour and its ancestors
+    to have one, else the blackboard of the tree it belongs to, else the
+    global blackboard.
+
+    Args:
+        behaviour (:class:`~py_trees.behaviour.Behaviour`): the behaviour
+
+    Returns:
+        :class:`~py_trees.blackboard.Blackboard`: the behaviour's blackboard
+    """
+    node = behaviour
+    while True:
+        scope = getattr(node, 'blackboard_scope', None)
+        if scope is not None:
+            return scope
+        if node.parent is None:
+            break
+        node = node.parent
+    tree = getattr(node, '_tree', None)
+    if tree is not None and tree.blackboard is not None:
+        return tree.blackboard
+    return Blackboard()
+
+##############################################################################
+# Behaviours
+##############################################################################
+
+
+class _BlackboardBinding(object):
+    """
+    The ``blackboard`` of the blackboard behaviours. Unless one was assigned,
+    it is resolved with :func:`~py_trees.blackboard.for_behaviour` on access,
+    so it is there from construction on and follows the behaviour when it (or
+    an ancestor) is moved to another scope or tree.
+    """
+    _assigned_blackboard = None
+
+    @property
+    def blackboard(self):
+        if self._assigned_blackboard is not None:
+            return self._assigned_blackboard
+        return for_behaviour(self)
+
+    @blackboard.setter
+    def blackboard(self, blackboard):
+        self._assigned_blackboard = blackboard
+
+
+class ClearBlackboardVariable(_BlackboardBinding, behaviours.Success):
     """
     Clear the specified value from the blackboard.
 
@@ -202,11 +1680,10 @@ class ClearBlackboardVariable(behaviours.Success):
         """
         Delete the variable from the blackboard.
         """
-        self.blackboard = Blackboard()
         self.blackboard.unset(self.variable_name)
 
 
-class SetBlackboardVariable(behaviours.Success):
+class SetBlackboardVariable(_BlackboardBinding, behaviours.Success):
     """
     Set the specified variable on the blackboard.
     Usually we set variables from inside other behaviours, but can
@@ -217,29 +1694,93 @@ class SetBlackboardVariable(behaviours.Success):
         name (:obj:`str`): name of the behaviour
         variable_name (:obj:`str`): name of the variable to set
         variable_value (:obj:`any`): value of the variable to set
+        ttl (:obj:`float`): seconds until the variable expires, None to keep it indefinitely
 
     .. todo:: overwrite option, leading to possible failure/success logic.
     """
     def __init__(self,
                  name="Set Blackboard Variable",
                  variable_name="dummy",
-                 variable_value=None
+                 variable_value=None,
+                 ttl=None
                  ):
         """
         :param name: name of the behaviour
         :param variable_name: name of the variable to set
         :param value_name: value of the variable to set
+        :param ttl: seconds until the variable expires
         """
         super(SetBlackboardVariable, self).__init__(name)
         self.variable_name = variable_name
         self.variable_value = variable_value
+        self.ttl = ttl
 
     def initialise(self):
-        self.blackboard = Blackboard()
-        self.blackboard.set(self.variable_name, self.variable_value, overwrite=True)
+        self.blackboard.set(self.variable_name, self.variable_value, overwrite=True, ttl=self.ttl)
 
 
-class CheckBlackboardVariable(behaviours.Behaviour):
+class _VariableComparison(_BlackboardBinding):
+    """
+    Comparison of a blackboard variable against an expected value, shared by
+    :class:`~py_trees.blackboard.CheckBlackboardVariable` and
+    :class:`~py_trees.blackboard.WaitForBlackboardVariable`. A comparison's
+    result is remembered with the variable's version and reused until either
+    changes, or the expected value or comparison operator are reassigned.
+    """
+    @property
+    def expected_value(self):
+        return self._expected_value
+
+    @expected_value.setter
+    def expected_value(self, value):
+        self._expected_value = value
+        self.compared_version = None
+
+    @property
+    def comparison_operator(self):
+        return self._comparison_operator
+
+    @comparison_operator.setter
+    def comparison_operator(self, value):
+        self._comparison_operator = value
+        self.compared_version = None
+
+    def setup(self, timeout):
+        """
+        Bind to the blackboard of the tree (or scope), see :func:`~py_trees.blackboard.for_behaviour`.
+        """
+        self._bind()
+        return True
+
+    def _bind(self):
+        """
+        (Re)create the variable's accessor if the blackboard moved to another store.
+        """
+        blackboard = self.blackboard
+        if blackboard._store is not self._bound_store:
+            self.variable = blackboard.accessor(self.variable_name)
+            self._bound_store = blackboard._store
+            self.compared_version = None
+
+    def _remember_comparison(self, version, value, result):
+        # only safe if neither value can change without a version bump or reassignment
+        if (not self.variable.attributes and
+                (value is _MISSING or type(value) in _IMMUTABLE_TYPES) and
+                type(self._expected_value) in _IMMUTABLE_TYPES):
+            self.compared_version = version
+            self.compared_result = result
+        else:
+            self.compared_version = None
+
+    def _apply_clearing_policy(self, result):
+        if result == common.Status.SUCCESS and self.clearing_policy == common.ClearingPolicy.ON_SUCCESS:
+            self.matching_result = None
+        elif result != common.Status.RUNNING:  # will fall in here if clearing ON_INITIALISE, or NEVER
+            self.matching_result = result
+        return result
+
+
+class CheckBlackboardVariable(_VariableComparison, behaviours.Behaviour):
     """
     Check the blackboard to see if it has a specific variable
     and optionally whether that variable has an expected value.
@@ -262,6 +1803,12 @@ class CheckBlackboardVariable(behaviours.Behaviour):
         that result thereafter. For example, to flag once a system has reached a
         subgoal. Use the :data:`~py_trees.common.ClearingPolicy.NEVER` flag to do this.
 
+    .. note::
+        The comparison is skipped while the variable's
+        :meth:`version <py_trees.blackboard.Blackboard.version>` is unchanged,
+        provided its value and the expected value are of immutable builtin
+        types (otherwise either may have been modified in place).
+
     .. include:: weblinks.rst
     """
     def __init__(self,
@@ -273,20 +1820,24 @@ class CheckBlackboardVariable(behaviours.Behaviour):
                  debug_feedback_message=False
                  ):
         super(CheckBlackboardVariable, self).__init__(name)
-        self.blackboard = Blackboard()
         self.variable_name = variable_name
+        self.variable = None
+        self._bound_store = None
         self.expected_value = expected_value
         self.comparison_operator = comparison_operator
         self.matching_result = None
         self.clearing_policy = clearing_policy
         self.debug_feedback_message = debug_feedback_message
+        self.compared_version = None
+        self.compared_result = None
 
     def initialise(self):
         """
         Clears the internally stored message ready for a new run
         if ``old_data_is_valid`` wasn't set.
         """
-        self.logger.debug("%s.initialise()" % self.__class__.__name__)
+        self.logger.debug("%s.initialise()", self.__class__.__name__)
+        self._bind()
         if self.clearing_policy == common.ClearingPolicy.ON_INITIALISE:
             self.matching_result = None
 
@@ -297,26 +1848,27 @@ class CheckBlackboardVariable(behaviours.Behaviour):
         Returns:
              :class:`~py_trees.common.Status`: :data:`~py_trees.common.Status.FAILURE` if not matched, :data:`~py_trees.common.Status.SUCCESS` otherwise.
         """
-        self.logger.debug("%s.update()" % self.__class__.__name__)
+        self.logger.debug("%s.update()", self.__class__.__name__)
         if self.matching_result is not None:
             return self.matching_result
 
-        result = None
-        check_attr = operator.attrgetter(self.variable_name)
+        # unchanged since the last comparison?
+        version = self.variable.version()
+        if version == self.compared_version:
+            return self._apply_clearing_policy(self.compared_result)
 
-        try:
-            value = check_attr(self.blackboard)
-            # if existence check required only
-            if self.expected_value is None:
-                self.feedback_message = "'%s' exists on the blackboard (as required)" % self.variable_name
-                result = common.Status.SUCCESS
-        except AttributeError:
+        result = None
+        value = self.variable.get(_MISSING)
+        if value is _MISSING:
             self.feedback_message = 'blackboard variable {0} did not exist'.format(self.variable_name)
             result = common.Status.FAILURE
+        elif self.expected_value is None:
+            # if existence check required only
+            self.feedback_message = "'%s' exists on the blackboard (as required)" % self.variable_name
+            result = common.Status.SUCCESS
 
         if result is None:
             # expected value matching
-            # value = getattr(self.blackboard, self.variable_name)
             success = self.comparison_operator(value, self.expected_value)
 
             if success:
@@ -332,23 +1884,20 @@ class CheckBlackboardVariable(behaviours.Behaviour):
                     self.feedback_message = "'%s' comparison failed" % (self.variable_name)
                 result = common.Status.FAILURE
 
-        if result == common.Status.SUCCESS and self.clearing_policy == common.ClearingPolicy.ON_SUCCESS:
-            self.matching_result = None
-        else:
-            self.matching_result = result
-        return result
+        self._remember_comparison(version, value, result)
+        return self._apply_clearing_policy(result)
 
     def terminate(self, new_status):
         """
         Always discard the matching result if it was invalidated by a parent or
         higher priority interrupt.
         """
-        self.logger.debug("%s.terminate(%s)" % (self.__class__.__name__, "%s->%s" % (self.status, new_status) if self.status != new_status else "%s" % new_status))
+        self.logger.debug("%s.terminate(%s->%s)", self.__class__.__name__, self.status, new_status)
         if new_status == common.Status.INVALID:
             self.matching_result = None
 
 
-class WaitForBlackboardVariable(behaviours.Behaviour):
+class WaitForBlackboardVariable(_VariableComparison, behaviours.Behaviour):
     """
     Check the blackboard to see if it has a specific variable
     and optionally whether that variable has a specific value.
@@ -380,22 +1929,25 @@ class WaitForBlackboardVariable(behaviours.Behaviour):
                  clearing_policy=common.ClearingPolicy.ON_INITIALISE
                  ):
         super(WaitForBlackboardVariable, self).__init__(name)
-        self.blackboard = Blackboard()
         self.variable_name = variable_name
+        self.variable = None
+        self._bound_store = None
         self.expected_value = expected_value
         self.comparison_operator = comparison_operator
         self.clearing_policy = clearing_policy
         self.matching_result = None
+        self.compared_version = None
+        self.compared_result = None
 
     def initialise(self):
         """
         Clears the internally stored message ready for a new run
         if ``old_data_is_valid`` wasn't set.
         """
-        self.logger.debug("%s.initialise()" % self.__class__.__name__)
+        self.logger.debug("%s.initialise()", self.__class__.__name__)
+        self._bind()
         if self.clearing_policy == common.ClearingPolicy.ON_INITIALISE:
             self.matching_result = None
-        self.check_attr = operator.attrgetter(self.variable_name)
 
     def update(self):
         """
@@ -404,41 +1956,42 @@ class WaitForBlackboardVariable(behaviours.Behaviour):
         Returns:
              :class:`~py_trees.common.Status`: :data:`~py_trees.common.Status.FAILURE` if not matched, :data:`~py_trees.common.Status.SUCCESS` otherwise.
         """
-        self.logger.debug("%s.update()" % self.__class__.__name__)
+        self.logger.debug("%s.update()", self.__class__.__name__)
         if self.matching_result is not None:
             return self.matching_result
 
+        # unchanged since the last comparison?
+        version = self.variable.version()
+        if version == self.compared_version:
+            return self._apply_clearing_policy(self.compared_result)
+
         # existence failure check
-        try:
-            value = self.check_attr(self.blackboard)
-            # if existence check required only
-            if self.expected_value is None:
-                self.feedback_message = "'%s' exists on the blackboard (as required)" % self.variable_name
-                result = common.Status.SUCCESS
-            # expected value matching
-            else:
-                success = self.comparison_operator(value, self.expected_value)
-                if success:
-                    self.feedback_message = "'%s' comparison succeeded [v: %s][e: %s]" % (self.variable_name, value, self.expected_value)
-                    result = common.Status.SUCCESS
-                else:
-                    self.feedback_message = "'%s' comparison failed [v: %s][e: %s]" % (self.variable_name, value, self.expected_value)
-                    result = common.Status.RUNNING
-        except AttributeError:
+        value = self.variable.get(_MISSING)
+        if value is _MISSING:
             self.feedback_message = 'blackboard variable {0} did not exist'.format(self.variable_name)
             result = common.Status.RUNNING
+        # if existence check required only
+        elif self.expected_value is None:
+            self.feedback_message = "'%s' exists on the blackboard (as required)" % self.variable_name
+            result = common.Status.SUCCESS
+        # expected value matching
+        else:
+            success = self.comparison_operator(value, self.expected_value)
+            if success:
+                self.feedback_message = "'%s' comparison succeeded [v: %s][e: %s]" % (self.variable_name, value, self.expected_value)
+                result = common.Status.SUCCESS
+            else:
+                self.feedback_message = "'%s' comparison failed [v: %s][e: %s]" % (self.variable_name, value, self.expected_value)
+                result = common.Status.RUNNING
 
-        if result == common.Status.SUCCESS and self.clearing_policy == common.ClearingPolicy.ON_SUCCESS:
-            self.matching_result = None
-        elif result != common.Status.RUNNING:  # will fall in here if clearing ON_INITIALISE, or NEVER
-            self.matching_result = result
-        return result
+        self._remember_comparison(version, value, result)
+        return self._apply_clearing_policy(result)
 
     def terminate(self, new_status):
         """
         Always discard the matching result if it was invalidated by a parent or
         higher priority interrupt.
         """
-        self.logger.debug("%s.terminate(%s)" % (self.__class__.__name__, "%s->%s" % (self.status, new_status) if self.status != new_status else "%s" % new_status))
+        self.logger.debug("%s.terminate(%s->%s)", self.__class__.__name__, self.status, new_status)
         if new_status == common.Status.INVALID:
             self.matching_result = None
@@ -44,6 +44,32 @@ class ParallelPolicy(enum.Enum):
     """:py:data:`~py_trees.common.Status.SUCCESS` so long as at least one child has :py:data:`~py_trees.common.Status.SUCCESS` and the remainder are :py:data:`~py_trees.common.Status.RUNNING`"""
 
 
+class OverrunPolicy(enum.Enum):
+    """
+    Policy rules for :py:meth:`~py_trees.trees.BehaviourTree.tick_tock` when a tick overruns its deadline.
+    """
+
+    SKIP = "SKIP"
+    """Drop the missed deadlines and wait for the next one, ticks stay in phase with the original schedule."""
+    CATCH_UP = "CATCH_UP"
+    """Tick back to back, without sleeping, until the missed deadlines have been caught up."""
+    DEGRADE = "DEGRADE"
+    """Tick again immediately and continue the schedule from there, i.e. the period is stretched by the overrun."""
+
+
+class BlackboardOperation(enum.Enum):
+    """
+    Kinds of change to a blackboard variable, reported to subscribers
+    of the :class:`~py_trees.blackboard.Blackboard`.
+    """
+    SET = "SET"
+    """The variable was written."""
+    UNSET = "UNSET"
+    """The variable was removed."""
+    EXPIRE = "EXPIRE"
+    """The variable's time to live ran out and it was removed."""
+
+
 class Name(enum.Enum):
     """
     Naming conventions.
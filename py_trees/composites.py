@@ -29,6 +29,7 @@ Perform the checks or actions you need to do in the non-composite behaviours.
 * :class:`~py_trees.composites.Selector`: select a path through the tree, interruptible by higher priorities
 * :class:`~py_trees.composites.Chooser`: like a selector, but commits to a path once started until it finishes
 * :class:`~py_trees.composites.Parallel`: manage children concurrently
+* :class:`~py_trees.composites.ConcurrentParallel`: a parallel that runs its children's updates on an executor
 """
 
 ##############################################################################
@@ -37,6 +38,11 @@ Perform the checks or actions you need to do in the non-composite behaviours.
 
 import itertools
 
+try:
+    import concurrent.futures
+except ImportError:
+    concurrent = None  # python2 without the futures backport
+
 from . import behaviour
 from . import common
 from .common import Status
@@ -82,13 +88,13 @@ class Composite(behaviour.Behaviour):
         Return:
             :obj:`bool`: suceess or failure of the operation
         """
-        self.logger.debug("%s.setup()" % (self.__class__.__name__))
+        self.logger.debug("%s.setup()", self.__class__.__name__)
         result = True
         for child in self.children:
             new_result = child.setup(timeout)
             if new_result is None:
                 # replace with py_trees exception!
-                self.logger.error("%s.setup()['%s'.setup() returned None (must be True||False)]" % (self.__class__.__name__, child.name))
+                self.logger.error("%s.setup()['%s'.setup() returned None (must be True||False)]", self.__class__.__name__, child.name)
             result = result and new_result
             if not result:
                 break
@@ -107,13 +113,15 @@ class Composite(behaviour.Behaviour):
         Args:
             new_status (:class:`~py_trees.common.Status`): behaviour will transition to this new status
         """
-        self.logger.debug("%s.stop()[%s]" % (self.__class__.__name__, "%s->%s" % (self.status, new_status) if self.status != new_status else "%s" % new_status))
+        self.logger.debug("%s.stop()[%s->%s]", self.__class__.__name__, self.status, new_status)
         if new_status == Status.INVALID:
             for child in self.children:
                 child.stop(new_status)
         # This part just replicates the Behaviour.stop function. We replicate it here so that
         # the Behaviour logging doesn't duplicate the composite logging here, just a bit cleaner this way.
         self.terminate(new_status)
+        if behaviour._ticking.stopped is not None and self.status != Status.INVALID:
+            behaviour._ticking.stopped(self)
         self.status = new_status
         self.iterator = self.tick()
 
@@ -150,6 +158,7 @@ class Composite(behaviour.Behaviour):
             raise TypeError("children must be behaviours, but you passed in {}".format(type(child)))
         self.children.append(child)
         child.parent = self
+        self._notify_tree(added=[child])
         return child.id
 
     def add_children(self, children):
@@ -179,6 +188,7 @@ class Composite(behaviour.Behaviour):
         child_index = self.children.index(child)
         self.children.remove(child)
         child.parent = None
+        self._notify_tree(removed=[child])
         return child_index
 
     def remove_all_children(self):
@@ -189,9 +199,11 @@ class Composite(behaviour.Behaviour):
             if child.status == Status.RUNNING:
                 child.stop(Status.INVALID)
             child.parent = None
+        removed = list(self.children)
         # makes sure to delete it for this class and all references to it
         #   http://stackoverflow.com/questions/850795/clearing-python-lists
         del self.children[:]
+        self._notify_tree(removed=removed)
 
     def replace_child(self, child, replacement):
         """
@@ -204,10 +216,11 @@ class Composite(behaviour.Behaviour):
         if child.status == Status.RUNNING:
             child.stop(Status.INVALID)
         child_index = self.children.index(child)
-        self.logger.debug("%s.replace_child()[%s->%s]" % (self.__class__.__name__, child.name, replacement.name))
+        self.logger.debug("%s.replace_child()[%s->%s]", self.__class__.__name__, child.name, replacement.name)
         self.children[child_index] = replacement
         child.parent = None
         replacement.parent = self
+        self._notify_tree(added=[replacement], removed=[child])
 
     def remove_child_by_id(self, child_id):
         """
@@ -219,12 +232,19 @@ class Composite(behaviour.Behaviour):
         Raises:
             IndexError: if the child was not found
         """
-        child = next((c for c in self.children if c.id == child_id), None)
+        tree = self._find_tree()
+        if tree is not None:
+            child = tree.find(child_id)
+            if child is not None and child.parent is not self:
+                child = None
+        else:
+            child = next((c for c in self.children if c.id == child_id), None)
         if child is not None:
             if child.status == Status.RUNNING:
                 child.stop(Status.INVALID)
             self.children.remove(child)
             child.parent = None
+            self._notify_tree(removed=[child])
         else:
             raise IndexError('child was not found with the specified id [%s]' % child_id)
 
@@ -240,6 +260,7 @@ class Composite(behaviour.Behaviour):
         """
         self.children.insert(0, child)
         child.parent = self
+        self._notify_tree(added=[child])
         return child.id
 
     def insert_child(self, child, index):
@@ -256,8 +277,35 @@ class Composite(behaviour.Behaviour):
         """
         self.children.insert(index, child)
         child.parent = self
+        self._notify_tree(added=[child])
         return child.id
 
+    def _find_tree(self):
+        """
+        Retrieve the :class:`~py_trees.trees.BehaviourTree` that this composite
+        belongs to (if any) by walking up to the root.
+
+        Returns:
+            :class:`~py_trees.trees.BehaviourTree`: the tree or None if not managed by a tree
+        """
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return getattr(node, '_tree', None)
+
+    def _notify_tree(self, added=(), removed=()):
+        """
+        Let the managing tree (if any) update its indices after the children
+        of this composite were modified.
+
+        Args:
+            added ([:class:`~py_trees.behaviour.Behaviour`]): subtrees that were added
+            removed ([:class:`~py_trees.behaviour.Behaviour`]): subtrees that were removed
+        """
+        tree = self._find_tree()
+        if tree is not None:
+            tree._subtree_modified(self, added, removed)
+
 ##############################################################################
 # Selector
 ##############################################################################
@@ -305,7 +353,8 @@ class Selector(Composite):
         Yields:
             :class:`~py_trees.behaviour.Behaviour`: a reference to itself or one of its children
         """
-        self.logger.debug("%s.tick()" % self.__class__.__name__)
+        self.logger.debug("%s.tick()", self.__class__.__name__)
+        behaviour._ticking.behaviour = self
         # Required behaviour for *all* behaviours and composites is
         # for tick() to check if it isn't running and initialise
         if self.status != Status.RUNNING:
@@ -320,6 +369,7 @@ class Selector(Composite):
             for node in child.tick():
                 yield node
                 if node is child:
+                    behaviour._ticking.behaviour = self
                     if node.status == Status.RUNNING or node.status == Status.SUCCESS:
                         self.current_child = child
                         self.status = node.status
@@ -413,7 +463,8 @@ class Chooser(Selector):
         Yields:
             :class:`~py_trees.behaviour.Behaviour`: a reference to itself or one of its children
         """
-        self.logger.debug("%s.tick()" % self.__class__.__name__)
+        self.logger.debug("%s.tick()", self.__class__.__name__)
+        behaviour._ticking.behaviour = self
         # Required behaviour for *all* behaviours and composites is
         # for tick() to check if it isn't running and initialise
         if self.status != Status.RUNNING:
@@ -442,6 +493,7 @@ class Chooser(Selector):
                 if child.status == Status.RUNNING or child.status == Status.SUCCESS:
                     self.current_child = child
                     break
+        behaviour._ticking.behaviour = self
         new_status = self.current_child.status if self.current_child is not None else Status.FAILURE
         self.stop(new_status)
         yield self
@@ -488,9 +540,10 @@ class Sequence(Composite):
         Yields:
             :class:`~py_trees.behaviour.Behaviour`: a reference to itself or one of its children
         """
-        self.logger.debug("%s.tick()" % self.__class__.__name__)
+        self.logger.debug("%s.tick()", self.__class__.__name__)
+        behaviour._ticking.behaviour = self
         if self.status != Status.RUNNING:
-            self.logger.debug("%s.tick() [!RUNNING->resetting child index]" % self.__class__.__name__)
+            self.logger.debug("%s.tick() [!RUNNING->resetting child index]", self.__class__.__name__)
             # sequence specific handling
             self.current_index = 0
             for child in self.children:
@@ -511,6 +564,7 @@ class Sequence(Composite):
             self.current_index += 1
         # At this point, all children are happy with their SUCCESS, so we should be happy too
         self.current_index -= 1  # went off the end of the list if we got to here
+        behaviour._ticking.behaviour = self
         self.stop(Status.SUCCESS)
         yield self
 
@@ -580,14 +634,25 @@ class Parallel(Composite):
         Yields:
             :class:`~py_trees.behaviour.Behaviour`: a reference to itself or one of its children
         """
+        behaviour._ticking.behaviour = self
         if self.status != Status.RUNNING:
             # subclass (user) handling
             self.initialise()
-        self.logger.debug("%s.tick()" % self.__class__.__name__)
+        self.logger.debug("%s.tick()", self.__class__.__name__)
         # process them all first
         for child in self.children:
             for node in child.tick():
                 yield node
+        behaviour._ticking.behaviour = self
+        self._apply_policy()
+        yield self
+
+    def _apply_policy(self):
+        """
+        Decide upon a new status for the parallel from the current status of its
+        children and handle the consequences (i.e. stopping any children
+        that are still running if the parallel has finished).
+        """
         # new_status = Status.SUCCESS if self.policy == common.ParallelPolicy.SUCCESS_ON_ALL else Status.RUNNING
         new_status = Status.RUNNING
         if any([c.status == Status.FAILURE for c in self.children]):
@@ -609,7 +674,6 @@ class Parallel(Composite):
                     child.stop(Status.INVALID)
             self.stop(new_status)
         self.status = new_status
-        yield self
 
     @property
     def current_child(self):
@@ -632,3 +696,161 @@ class Parallel(Composite):
                     return child
         else:
             return self.children[-1]
+
+
+class ConcurrentParallel(Parallel):
+    """
+    A :class:`~py_trees.composites.Parallel` that runs the
+    :meth:`~py_trees.behaviour.Behaviour.update` methods of its leaf children
+    on a :mod:`concurrent.futures` executor, so that children blocking in their
+    update (file reads, cpu bound checks, ...) no longer take the sum of
+    their times. Children are initialised, stopped and have their status set
+    on the ticking thread as usual, only the updates are dispatched. Composite
+    children and behaviours with a custom tick are ticked on the ticking
+    thread.
+
+    Each tick submits the updates, ticks the remaining children, then joins
+    the updates before the :class:`~py_trees.common.ParallelPolicy` is applied.
+    An update that does not complete within the timeout leaves its child
+    :data:`~py_trees.common.Status.RUNNING` and is joined again on the next tick
+    (rather than submitted afresh). Exceptions raised by an update are re-raised
+    on the ticking thread.
+
+    When the parallel is stopped, pending updates are cancelled. Updates that have
+    already started cannot be interrupted and their results are discarded, so the
+    child's :meth:`~py_trees.behaviour.Behaviour.terminate` may run while its update
+    is still completing on the executor.
+
+    Args:
+        name (:obj:`str`): the composite behaviour name
+        policy (:class:`~py_trees.common.ParallelPolicy`): policy to use for deciding success or otherwise
+        children ([:class:`~py_trees.behaviour.Behaviour`]): list of children to add
+        executor (:class:`concurrent.futures.Executor`): thread based executor to run updates on, defaults to a thread pool with a worker per child
+        timeout (:obj:`float`): seconds to wait for updates each tick, None to wait until all are done
+        *args: variable length argument list
+        **kwargs: arbitrary keyword arguments
+
+    Raises:
+        ImportError: if :mod:`concurrent.futures` is not available (python2 needs the futures backport)
+        TypeError: if the executor is a :class:`concurrent.futures.ProcessPoolExecutor`
+
+    .. note:: Updates run on the children themselves, so they need an executor
+       whose workers share the process (e.g. a thread pool). Behaviours (with
+       their tick generators, parents, ...) cannot be sent to a process pool,
+       use :class:`~py_trees.behaviours.Job` behaviours to offload work there.
+    """
+    def __init__(self, name="ConcurrentParallel", policy=common.ParallelPolicy.SUCCESS_ON_ALL, children=None, executor=None, timeout=None, *args, **kwargs):
+        if concurrent is None:
+            raise ImportError("ConcurrentParallel requires concurrent.futures (python2: pip install futures)")
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            raise TypeError("ConcurrentParallel runs updates on the children themselves, it needs a thread based executor [{}]".format(type(executor)))
+        super(ConcurrentParallel, self).__init__(name, policy, children, *args, **kwargs)
+        self.executor = executor
+        self.timeout = timeout
+        self.pending = {}  # child id: future
+        self._owns_executor = executor is None
+
+    def tick(self):
+        """
+        Dispatch, tick and join the children.
+
+        Yields:
+            :class:`~py_trees.behaviour.Behaviour`: a reference to itself or one of its children
+        """
+        ticking = behaviour._ticking
+        ticking.behaviour = self
+        if self.status != Status.RUNNING:
+            # subclass (user) handling
+            self.initialise()
+        self.logger.debug("%s.tick()", self.__class__.__name__)
+        dispatched = []
+        for child in self.children:
+            if not self._dispatchable(child):
+                continue
+            if child.id not in self.pending:
+                if child.status != Status.RUNNING:
+                    ticking.behaviour = child
+                    child.initialise()
+                self.pending[child.id] = self._executor().submit(_update, child)
+            dispatched.append(child)
+        # tick everything else while the updates run
+        for child in self.children:
+            if child.id not in self.pending:
+                for node in child.tick():
+                    yield node
+        if dispatched:
+            concurrent.futures.wait([self.pending[child.id] for child in dispatched], timeout=self.timeout)
+        for child in dispatched:
+            future = self.pending[child.id]
+            if future.done():
+                del self.pending[child.id]
+                ticking.behaviour = child
+                self._complete(child, future.result())
+            else:
+                child.feedback_message = "waiting for update"
+                child.status = Status.RUNNING
+            yield child
+        ticking.behaviour = self
+        self._apply_policy()
+        yield self
+
+    def stop(self, new_status=Status.INVALID):
+        """
+        Cancel (or abandon) any pending updates before stopping.
+
+        Args:
+            new_status (:class:`~py_trees.common.Status`): behaviour will transition to this new status
+        """
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+        super(ConcurrentParallel, self).stop(new_status)
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the executor if it was created by this parallel.
+
+        Args:
+            wait (:obj:`bool`): wait for updates that are still executing
+        """
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
+
+    def _executor(self):
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(self.children)))
+        return self.executor
+
+    def _dispatchable(self, child):
+        """
+        Only leaves that tick with the standard behaviour tick can have their updates dispatched.
+        """
+        return (not child.children and
+                getattr(type(child).tick, '__func__', type(child).tick) is _BEHAVIOUR_TICK and
+                'tick' not in getattr(child, '__dict__', ()))
+
+    def _complete(self, child, new_status):
+        """
+        Finish a child's tick with the status returned by its update, exactly
+        as :meth:`~py_trees.behaviour.Behaviour.tick` would.
+        """
+        if new_status not in _STATUSES:
+            child.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]", new_status, child.name)
+            new_status = Status.INVALID
+        if new_status != Status.RUNNING:
+            child.stop(new_status)
+        child.status = new_status
+
+
+_BEHAVIOUR_TICK = getattr(behaviour.Behaviour.tick, '__func__', behaviour.Behaviour.tick)
+_STATUSES = tuple(Status)
+
+
+def _update(child):
+    # runs on an executor thread, attribute the child's writes to it
+    behaviour._ticking.behaviour = child
+    try:
+        return child.update()
+    finally:
+        behaviour._ticking.behaviour = None
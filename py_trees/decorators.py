@@ -122,7 +122,7 @@ class Decorator(behaviour.Behaviour):
         Return:
             :obj:`bool`: suceess or failure of the operation
         """
-        self.logger.debug("%s.setup()" % (self.__class__.__name__))
+        self.logger.debug("%s.setup()", self.__class__.__name__)
         result = self.decorated.setup(timeout)
         if type(result) != bool:
             message = "invalid return type from child's setup method (should be bool) [child:'{}'][type:'{}']".format(
@@ -138,7 +138,8 @@ class Decorator(behaviour.Behaviour):
         Yields:
             :class:`~py_trees.behaviour.Behaviour`: a reference to itself or one of its children
         """
-        self.logger.debug("%s.tick()" % self.__class__.__name__)
+        self.logger.debug("%s.tick()", self.__class__.__name__)
+        behaviour._ticking.behaviour = self
         # initialise just like other behaviours/composites
         if self.status != common.Status.RUNNING:
             self.initialise()
@@ -147,9 +148,10 @@ class Decorator(behaviour.Behaviour):
         for node in self.decorated.tick():
             yield node
         # resume normal proceedings for a Behaviour's tick
+        behaviour._ticking.behaviour = self
         new_status = self.update()
         if new_status not in list(common.Status):
-            self.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]" % (new_status, self.name))
+            self.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]", new_status, self.name)
             new_status = common.Status.INVALID
         if new_status != common.Status.RUNNING:
             self.stop(new_status)
@@ -163,7 +165,7 @@ class Decorator(behaviour.Behaviour):
         Args:
             new_status (:class:`~py_trees.common.Status`): the behaviour is transitioning to this new status
         """
-        self.logger.debug("%s.stop(%s)" % (self.__class__.__name__, new_status))
+        self.logger.debug("%s.stop(%s)", self.__class__.__name__, new_status)
         self.terminate(new_status)
         # priority interrupt handling
         if new_status == common.Status.INVALID:
@@ -171,6 +173,8 @@ class Decorator(behaviour.Behaviour):
         # if the decorator returns SUCCESS/FAILURE and should stop the child
         if self.decorated.status == common.Status.RUNNING:
             self.decorated.stop(common.Status.INVALID)
+        if behaviour._ticking.stopped is not None and self.status != common.Status.INVALID:
+            behaviour._ticking.stopped(self)
         self.status = new_status
 
     def tip(self):
@@ -230,7 +234,7 @@ class Timeout(Decorator):
         current_time = time.time()
         if current_time > self.finish_time:
             self.feedback_message = "timed out"
-            self.logger.debug("{}.update() {}".format(self.__class__.__name__, self.feedback_message))
+            self.logger.debug("%s.update() %s", self.__class__.__name__, self.feedback_message)
             # invalidate the decorated (i.e. cancel it), could also put this logic in a terminate() method
             self.decorated.stop(common.Status.INVALID)
             return common.Status.FAILURE
@@ -265,7 +269,7 @@ class OneShot(Decorator):
         Bounce if the child has already successfully completed.
         """
         if self.final_status:
-            self.logger.debug("{}.update()[bouncing]".format(self.__class__.__name__))
+            self.logger.debug("%s.update()[bouncing]", self.__class__.__name__)
             return self.final_status
         return self.decorated.status
         
@@ -290,11 +294,11 @@ class OneShot(Decorator):
         flag it so future ticks will block entry to the child.
         """
         if not self.final_status and new_status == common.Status.SUCCESS:
-            self.logger.debug("{}.terminate({})[oneshot completed]".format(self.__class__.__name__, new_status))
+            self.logger.debug("%s.terminate(%s)[oneshot completed]", self.__class__.__name__, new_status)
             self.feedback_message = "oneshot completed"
             self.final_status = common.Status.SUCCESS
         else:
-            self.logger.debug("{}.terminate({})".format(self.__class__.__name__, new_status))
+            self.logger.debug("%s.terminate(%s)", self.__class__.__name__, new_status)
 
 class Inverter(Decorator):
     """
@@ -472,7 +476,7 @@ class Condition(Decorator):
         Returns:
             :class:`~py_trees.common.Status`: the behaviour's new status :class:`~py_trees.common.Status`
         """
-        self.logger.debug("%s.update()" % self.__class__.__name__)
+        self.logger.debug("%s.update()", self.__class__.__name__)
         self.feedback_message = "'{0}' has status {1}, waiting for {2}".format(self.decorated.name, self.decorated.status, self.succeed_status)
         if self.decorated.status == self.succeed_status:
             return common.Status.SUCCESS
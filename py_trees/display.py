@@ -97,6 +97,8 @@ def _generate_ascii_tree(tree, indent=0, snapshot_information=None):
     nodes = {} if snapshot_information is None else snapshot_information.nodes
     previously_running_nodes = [] if snapshot_information is None else snapshot_information.previously_running_nodes
     running_nodes = [] if snapshot_information is None else snapshot_information.running_nodes
+    # historical snapshots carry the feedback messages of their tick
+    feedback_messages = getattr(snapshot_information, "feedback_messages", None)
     if indent == 0:
         if tree.id in nodes:
             yield "%s [%s]" % (tree.name.replace('\n', ' '), ascii_check_mark(nodes[tree.id]))
@@ -107,7 +109,8 @@ def _generate_ascii_tree(tree, indent=0, snapshot_information=None):
     for child in tree.children:
         bullet = ascii_bullet(child)
         if child.id in nodes:
-            message = "" if not child.feedback_message else " -- " + child.feedback_message
+            feedback_message = child.feedback_message if feedback_messages is None else feedback_messages[child.id]
+            message = "" if not feedback_message else " -- " + feedback_message
             yield "    " * indent + bullet + child.name.replace('\n', ' ') + " [%s]" % ascii_check_mark(nodes[child.id]) + message
         elif child.id in previously_running_nodes and child.id not in running_nodes:
             yield "    " * indent + bullet + child.name.replace('\n', ' ') + " [" + console.yellow + "-" + console.reset + "]"
@@ -123,6 +126,9 @@ def ascii_tree(tree, indent=0, snapshot_information=None):
     Build an ascii tree representation as a string for redirecting
     to elsewhere other than stdout. This can be the entire tree, or
     a recorded snapshot of the tree (i.e. just the part that was traversed).
+    Snapshots of earlier ticks are available from a
+    :class:`~py_trees.visitors.SnapshotVisitor` that keeps a history
+    (see :meth:`~py_trees.visitors.SnapshotVisitor.snapshot`).
 
     Args:
         tree (:class:`~py_trees.behaviour.Behaviour`): the root of the tree, or subtree you want to show
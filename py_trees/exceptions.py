@@ -52,3 +52,11 @@ class SetupFailedException(Exception):
      proceeded to try and tick.
     """
     pass
+
+
+class TimeoutException(Exception):
+    """
+    For when waiting on something (e.g. a write to a shared blackboard
+    variable to finish) took longer than permitted.
+    """
+    pass
@@ -19,6 +19,11 @@ Bless my noggin with a tickle from your noodly appendages!
 # Imports
 ##############################################################################
 
+# absolute_import: this module's name shadows the python logging module
+from __future__ import absolute_import
+
+import logging as python_logging
+
 from enum import IntEnum
 
 from . import console
@@ -62,34 +67,100 @@ class Level(IntEnum):
 # module variable
 level = Level.INFO
 
+# plain integer thresholds, cheaper to compare against than enum members
+_INFO = int(Level.INFO)
+_WARN = int(Level.WARN)
+_ERROR = int(Level.ERROR)
+
+# set by bridge_to_python_logging(), None when logging to the console
+_python_logger = None
+
 ##############################################################################
-# Logger Class
+# Python Logging Bridge
 ##############################################################################
 
 
-class Logger(object):
+def bridge_to_python_logging(name="py_trees"):
     """
-    :cvar override: whether or not the default python logger has been overridden.
-    :vartype override: bool
+    Send all py_trees log messages to a python :mod:`logging` logger instead of
+    the console so that they are processed by its handlers, formatters and filters.
+    Messages must still pass the py_trees :data:`level` before they reach the
+    python logger.
+
+    Args:
+        name (:obj:`str`): name of the python logger
+
+    Returns:
+        :class:`logging.Logger`: the python logger, e.g. to attach handlers to
     """
+    global _python_logger
+    _python_logger = python_logging.getLogger(name)
+    return _python_logger
 
-    def __init__(self, name=None):
-        self.prefix = '{:<20}'.format(name.replace("\n", " ")) + " : " if name else ""
 
-    def debug(self, msg):
-        global level
-        if level < Level.INFO:
-            console.logdebug(self.prefix + msg)
+def unbridge_from_python_logging():
+    """
+    Revert to logging on the console.
+    """
+    global _python_logger
+    _python_logger = None
+
+##############################################################################
+# Logger Class
+##############################################################################
 
-    def info(self, msg):
-        global level
-        if level < Level.WARN:
-            console.loginfo(self.prefix + msg)
 
-    def warning(self, msg):
-        global level
-        if level < Level.ERROR:
-            console.logwarn(self.prefix + msg)
+class Logger(object):
+    """
+    A very lightweight logger, one per behaviour. Messages are formatted
+    lazily (old-style, with :obj:`%` and the remaining arguments), and only if
+    the module :data:`level` permits them, so that a disabled debug call costs
+    little more than the call itself:
 
-    def error(self, msg):
-        console.logerror(self.prefix + msg)
+    .. code-block:: python
+
+       self.logger.debug("%s.update()[%s]", self.__class__.__name__, self.feedback_message)
+
+    Args:
+        name (:obj:`str`): name to prefix messages with (usually the behaviour's name)
+    """
+    __slots__ = ('name', '_prefix')
+
+    def __init__(self, name=None):
+        self.name = name
+        self._prefix = None
+
+    @property
+    def prefix(self):
+        """
+        :obj:`str`: padded name prefixed to each message, formatted on first use
+        """
+        if self._prefix is None:
+            self._prefix = '{:<20}'.format(self.name.replace("\n", " ")) + " : " if self.name else ""
+        return self._prefix
+
+    def debug(self, msg, *args):
+        if level < _INFO:
+            self._log(python_logging.DEBUG, console.logdebug, msg, args)
+
+    def info(self, msg, *args):
+        if level < _WARN:
+            self._log(python_logging.INFO, console.loginfo, msg, args)
+
+    def warning(self, msg, *args):
+        if level < _ERROR:
+            self._log(python_logging.WARNING, console.logwarn, msg, args)
+
+    def error(self, msg, *args):
+        self._log(python_logging.ERROR, console.logerror, msg, args)
+
+    def _log(self, python_level, console_log, msg, args):
+        if _python_logger is not None:
+            # leave the formatting to the python logger (and its filters), it
+            # only formats (and so only needs the prefix escaped) given args
+            if args:
+                _python_logger.log(python_level, self.prefix.replace("%", "%%") + msg, *args)
+            else:
+                _python_logger.log(python_level, self.prefix + msg)
+        else:
+            console_log(self.prefix + (msg % args if args else msg))
@@ -193,7 +193,7 @@ def create_imposter(cls):
 
             :return py_trees.Behaviour: a reference to itself
             """
-            self.logger.debug("%s.tick()" % (self.__class__.__name__))
+            self.logger.debug("%s.tick()", self.__class__.__name__)
 
             # this only initialises the imposter
             if self.status != common.Status.RUNNING:
@@ -206,7 +206,7 @@ def create_imposter(cls):
                     yield behaviour
             new_status = self.update()
             if new_status not in list(common.Status):
-                self.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]" % (new_status, self.name))
+                self.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]", new_status, self.name)
                 new_status = common.Status.INVALID
             self.status = new_status
             yield self
@@ -225,7 +225,7 @@ def create_imposter(cls):
             in the usual sequence of a tick, since that would double up on stop
             calls to the underlying original.
             """
-            self.logger.debug("%s.terminate()[%s]" % (self.__class__.__name__, new_status))
+            self.logger.debug("%s.terminate()[%s]", self.__class__.__name__, new_status)
             self.original.stop(new_status)
             self.status = self.original.status
 
@@ -359,7 +359,7 @@ def oneshot(cls):
     def _oneshot_terminate(func):
         @functools.wraps(func)
         def wrapped(self, new_status):
-            self.logger.debug("OneShot.wrapped_terminate()[{}]".format(new_status))
+            self.logger.debug("OneShot.wrapped_terminate()[%s]", new_status)
             # handle only the interrupt/reset case
             if new_status == common.Status.INVALID:
                 if self.final_status:
@@ -733,7 +733,7 @@ def condition(cls, status):
     def _update(func):
         @functools.wraps(func)
         def wrapped(self):
-            self.logger.debug("%s.update()" % self.__class__.__name__)
+            self.logger.debug("%s.update()", self.__class__.__name__)
             self.feedback_message = "'{0}' has status {1}, waiting for {2}".format(self.original.name, self.original.status, self.succeed_status)
             if self.original.status == self.succeed_status:
                 if self.original.status == common.Status.RUNNING:
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+##############################################################################
+# Documentation
+##############################################################################
+
+"""
+Metrics for dashboards. A :class:`~py_trees.metrics.MetricsCollector`
+counts how often each behaviour in a tree finishes a tick with each status
+and keeps a histogram of the tree's tick durations (and optionally, of
+each behaviour's :meth:`~py_trees.behaviour.Behaviour.update`). The metrics
+are exposed in the `Prometheus text format`_, either over a small built-in
+HTTP endpoint or dumped to a file (e.g. for the node exporter's textfile
+collector).
+
+.. code-block:: python
+
+   metrics = py_trees.metrics.MetricsCollector(tree)
+   metrics.serve(port=9100)  # http://localhost:9100/metrics
+   tree.tick_tock(100)
+
+Counters and buckets are preallocated arrays that the ticking thread
+increments in place, without locks. Readers format whatever the arrays
+hold at the time, so a scrape during a tick may see that tick half counted.
+
+.. _Prometheus text format: https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+##############################################################################
+# Imports
+##############################################################################
+
+import array
+import bisect
+import os
+import threading
+import timeit
+
+try:
+    import http.server as http_server
+except ImportError:
+    import BaseHTTPServer as http_server  # python2
+
+from . import common
+from . import visitors
+
+##############################################################################
+# Histograms
+##############################################################################
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+"""Upper bounds (seconds) of the default latency buckets."""
+
+_STATUSES = tuple(common.Status)
+_STATUS_CODES = dict((status, code) for code, status in enumerate(_STATUSES))
+
+
+class Histogram(object):
+    """
+    A histogram with fixed buckets, observed without allocating.
+
+    Args:
+        buckets ([:obj:`float`]): upper bounds of the buckets, ascending (an unbounded bucket is added)
+
+    Attributes:
+        buckets ([:obj:`float`]): upper bounds of the buckets
+        counts (:obj:`array.array`): observations in each bucket (not cumulative), the last is unbounded
+        sum (:obj:`float`): sum of the observations
+    """
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = list(buckets)
+        self.counts = array.array('l', [0]) * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        """
+        Args:
+            value (:obj:`float`): the observation
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def count(self):
+        """
+        Returns:
+            :obj:`int`: the number of observations
+        """
+        return sum(self.counts)
+
+##############################################################################
+# Collector
+##############################################################################
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsCollector(visitors.VisitorBase):
+    """
+    Collect metrics from a tree. The collector attaches itself to the tree
+    (as a visitor and pre and post tick handlers) and detaches when closed.
+
+    Behaviours are labelled by their path from the root (e.g. 'Root/Work/Move'),
+    which unlike ids is stable from run to run. Behaviours with the same path
+    are told apart by a suffix ('Root/Work/Move[2]').
+
+    Timing behaviours wraps their :meth:`~py_trees.behaviour.Behaviour.update`
+    methods (as instance attributes, like the :class:`~py_trees.visitors.ProfilingVisitor`)
+    from their second tick on, which costs a little more per tick.
+
+    Args:
+        tree (:class:`~py_trees.trees.BehaviourTree`): the tree to collect metrics from
+        name (:obj:`str`): label for the tree, defaults to the root's name
+        buckets ([:obj:`float`]): upper bounds (seconds) of the latency buckets
+        time_behaviours (:obj:`bool`): also keep a histogram of each behaviour's update durations
+
+    Attributes:
+        name (:obj:`str`): label for the tree
+        ticks (:obj:`int`): number of ticks collected
+        tick_durations (:class:`~py_trees.metrics.Histogram`): durations of the tree's ticks
+    """
+    def __init__(self, tree, name=None, buckets=DEFAULT_BUCKETS, time_behaviours=False):
+        super(MetricsCollector, self).__init__(full=False)
+        self.tree = tree
+        self.name = tree.root.name if name is None else name
+        self.buckets = list(buckets)
+        self.time_behaviours = time_behaviours
+        self.ticks = 0
+        self.tick_durations = Histogram(self.buckets)
+        self._start = 0.0
+        self._statuses = {}  # id: array of counts by status code
+        self._durations = {}  # id: histogram of update durations
+        self._labels = {}  # id: label
+        self._taken = set()  # labels
+        self._order = []  # ids, in the order they were first seen
+        self._wrapped = {}  # id: (behaviour, update wrapper)
+        self._server = None
+        tree.visitors.append(self)
+        tree.add_pre_tick_handler(self._pre_tick)
+        tree.add_post_tick_handler(self._post_tick)
+
+    def run(self, behaviour):
+        """
+        Count the status the behaviour finished its tick with.
+
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): behaviour that is ticking
+        """
+        try:
+            self._statuses[behaviour.id][_STATUS_CODES[behaviour.status]] += 1
+        except KeyError:
+            self._register(behaviour)
+            self._statuses[behaviour.id][_STATUS_CODES[behaviour.status]] += 1
+
+    def close(self):
+        """
+        Stop serving, detach from the tree and restore any timed behaviours.
+        """
+        self.stop_serving()
+        if self not in self.tree.visitors:
+            return
+        self.tree.visitors.remove(self)
+        self.tree.pre_tick_handlers.remove(self._pre_tick)
+        self.tree.post_tick_handlers.remove(self._post_tick)
+        for (behaviour, wrapper) in self._wrapped.values():
+            visitors._unwrap(behaviour, 'update', wrapper)
+        self._wrapped = {}
+
+    def _pre_tick(self, tree):
+        self._start = timeit.default_timer()
+
+    def _post_tick(self, tree):
+        self.tick_durations.observe(timeit.default_timer() - self._start)
+        self.ticks += 1
+
+    def _register(self, behaviour):
+        """
+        Allocate the counters (and histogram) of a behaviour seen for the first time.
+        """
+        names = []
+        node = behaviour
+        while node is not None:
+            names.append(node.name.replace("\n", " "))
+            node = node.parent
+        path = "/".join(reversed(names))
+        label = path
+        suffix = 2
+        while label in self._taken:
+            label = "%s[%s]" % (path, suffix)
+            suffix += 1
+        self._taken.add(label)
+        self._labels[behaviour.id] = label
+        self._statuses[behaviour.id] = array.array('l', [0]) * len(_STATUSES)
+        if self.time_behaviours:
+            histogram = Histogram(self.buckets)
+            self._durations[behaviour.id] = histogram
+            wrapper = visitors._wrap(behaviour, 'update', self._timed, histogram)
+            if wrapper is not None:
+                self._wrapped[behaviour.id] = (behaviour, wrapper)
+        # last, readers (e.g. scrapes) only look up behaviours in the order
+        self._order.append(behaviour.id)
+
+    def _timed(self, update, histogram):
+        clock = timeit.default_timer
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return update(*args, **kwargs)
+            finally:
+                histogram.observe(clock() - start)
+        return timed
+
+    def statuses(self, behaviour):
+        """
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): the behaviour
+
+        Returns:
+            :obj:`dict`: how often it finished a tick with each :class:`~py_trees.common.Status`
+        """
+        counts = self._statuses.get(behaviour.id)
+        return dict((status, 0 if counts is None else counts[code]) for code, status in enumerate(_STATUSES))
+
+    ############################################
+    # Exposition
+    ############################################
+
+    def exposition(self):
+        """
+        Format the metrics in the Prometheus text format.
+
+        Returns:
+            :obj:`str`: the metrics
+        """
+        tree = 'tree="%s"' % _escape(self.name)
+        lines = []
+        lines.append("# HELP py_trees_ticks_total Ticks of the tree.")
+        lines.append("# TYPE py_trees_ticks_total counter")
+        lines.append("py_trees_ticks_total{%s} %s" % (tree, self.ticks))
+        lines.append("# HELP py_trees_tick_duration_seconds Durations of the tree's ticks.")
+        lines.append("# TYPE py_trees_tick_duration_seconds histogram")
+        self._histogram_lines(lines, "py_trees_tick_duration_seconds", tree, self.tick_durations)
+        lines.append("# HELP py_trees_behaviour_ticks_total Ticks of each behaviour, by the status it finished with.")
+        lines.append("# TYPE py_trees_behaviour_ticks_total counter")
+        order = list(self._order)
+        for unique_id in order:
+            counts = self._statuses[unique_id]
+            labels = '%s,behaviour="%s"' % (tree, _escape(self._labels[unique_id]))
+            for code, status in enumerate(_STATUSES):
+                lines.append('py_trees_behaviour_ticks_total{%s,status="%s"} %s' % (labels, status.value, counts[code]))
+        if self.time_behaviours:
+            lines.append("# HELP py_trees_behaviour_update_duration_seconds Durations of each behaviour's updates.")
+            lines.append("# TYPE py_trees_behaviour_update_duration_seconds histogram")
+            for unique_id in order:
+                labels = '%s,behaviour="%s"' % (tree, _escape(self._labels[unique_id]))
+                self._histogram_lines(lines, "py_trees_behaviour_update_duration_seconds", labels,
+                                      self._durations[unique_id])
+        return "\n".join(lines) + "\n"
+
+    def _histogram_lines(self, lines, metric, labels, histogram):
+        cumulative = 0
+        counts = histogram.counts
+        for index, bound in enumerate(histogram.buckets):
+            cumulative += counts[index]
+            lines.append('%s_bucket{%s,le="%r"} %s' % (metric, labels, bound, cumulative))
+        cumulative += counts[-1]
+        lines.append('%s_bucket{%s,le="+Inf"} %s' % (metric, labels, cumulative))
+        lines.append("%s_sum{%s} %r" % (metric, labels, histogram.sum))
+        lines.append("%s_count{%s} %s" % (metric, labels, cumulative))
+
+    def dump(self, path):
+        """
+        Write the metrics to a file, atomically (via a temporary file alongside it).
+
+        Args:
+            path (:obj:`str`): the file to write
+        """
+        temporary = "%s.%s.tmp" % (path, os.getpid())
+        with open(temporary, "w") as f:
+            f.write(self.exposition())
+        os.rename(temporary, path)
+
+    def serve(self, port=9100, address="127.0.0.1"):
+        """
+        Serve the metrics over HTTP (on any path) from a background thread.
+
+        Args:
+            port (:obj:`int`): the port, 0 to pick a free one
+            address (:obj:`str`): the address to listen on
+
+        Returns:
+            :obj:`int`: the port being served on
+
+        Raises:
+            RuntimeError: if already serving
+        """
+        if self._server is not None:
+            raise RuntimeError("metrics are already being served [port %s]" % self._server.server_address[1])
+        collector = self
+
+        class Handler(http_server.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                body = collector.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *unused_args):
+                pass
+
+        self._server = http_server.HTTPServer((address, port), Handler)
+        thread = threading.Thread(target=self._server.serve_forever, name="py_trees.metrics.MetricsCollector")
+        thread.daemon = True
+        thread.start()
+        return self._server.server_address[1]
+
+    def stop_serving(self):
+        """
+        Stop the HTTP endpoint, if serving.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+##############################################################################
+# Documentation
+##############################################################################
+
+"""
+Keep blackboard variables across restarts. A
+:class:`~py_trees.persistence.WriteBehind` restores a blackboard from a
+storage backend and then saves its changes in the background, so that
+ticking never waits on the disk.
+
+.. code-block:: python
+
+   blackboard = py_trees.blackboard.Blackboard.create("robot")
+   persistence = py_trees.persistence.WriteBehind(
+       blackboard,
+       py_trees.persistence.SQLiteBackend("robot.db"),
+       interval=1.0
+   )
+   tree = py_trees.trees.BehaviourTree(root, blackboard=blackboard)
+   ...
+   persistence.stop()  # final flush
+
+Backends implement :class:`~py_trees.persistence.Backend`.
+:class:`~py_trees.persistence.SQLiteBackend` is the reference implementation.
+"""
+
+##############################################################################
+# Imports
+##############################################################################
+
+import sqlite3
+import threading
+
+try:
+    import cPickle as pickle  # python2
+except ImportError:
+    import pickle
+
+from . import logging
+
+##############################################################################
+# Backends
+##############################################################################
+
+
+class Backend(object):
+    """
+    Interface for the storage behind a :class:`~py_trees.persistence.WriteBehind`.
+    Backends are called from the write-behind thread as well as the thread
+    that constructs the :class:`~py_trees.persistence.WriteBehind`.
+    """
+    def load(self):
+        """
+        Read every stored variable, in bulk.
+
+        Returns:
+            :obj:`dict`: variable names and values
+        """
+        raise NotImplementedError("load() must be implemented by backends")
+
+    def store(self, values, deleted):
+        """
+        Write a batch of changes, preferably in a single transaction.
+
+        Args:
+            values (:obj:`dict`): names and values of the variables that were set
+            deleted ([:obj:`str`]): names of the variables that were removed
+        """
+        raise NotImplementedError("store() must be implemented by backends")
+
+    def close(self):
+        """
+        Release any resources, no further calls will be made.
+        """
+        pass
+
+
+class SQLiteBackend(Backend):
+    """
+    Stores pickled variables in a SQLite table. Variables that cannot be
+    pickled are skipped (with a warning).
+
+    Args:
+        path (:obj:`str`): the database file
+        table (:obj:`str`): name of the table to use (created if necessary)
+
+    Raises:
+        ValueError: if the table name is not a valid identifier
+    """
+    def __init__(self, path, table="blackboard"):
+        if not table.replace("_", "").isalnum():
+            raise ValueError("invalid table name for the sqlite backend [%s]" % table)
+        self.path = path
+        self.table = table
+        self.logger = logging.Logger("SQLiteBackend")
+        # used from the write-behind thread as well, serialised by the lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS %s (name TEXT PRIMARY KEY, value BLOB)" % table
+            )
+
+    def load(self):
+        with self._lock:
+            rows = self._connection.execute("SELECT name, value FROM %s" % self.table).fetchall()
+        return dict((str(name), pickle.loads(bytes(value))) for name, value in rows)
+
+    def store(self, values, deleted):
+        rows = []
+        for name, value in values.items():
+            try:
+                rows.append((name, sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))))
+            except Exception as e:
+                self.logger.warning("skipping variable '%s', it could not be pickled [%s]", name, e)
+        with self._lock, self._connection:
+            if rows:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO %s (name, value) VALUES (?, ?)" % self.table, rows
+                )
+            if deleted:
+                self._connection.executemany(
+                    "DELETE FROM %s WHERE name = ?" % self.table, [(name,) for name in deleted]
+                )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+##############################################################################
+# Write Behind
+##############################################################################
+
+
+class WriteBehind(object):
+    """
+    Restore a blackboard from a backend, then save its changes in batches
+    from a background thread. Writers only record the names of the changed
+    variables, repeated writes to a variable between flushes are coalesced
+    and its latest value saved. Only the variables of the blackboard's own
+    scope are saved, not those it sees in the scopes enclosing it.
+
+    .. note:: Values are pickled on the background thread, avoid modifying
+       mutable values in place while they may be saved.
+
+    Args:
+        blackboard (:class:`~py_trees.blackboard.Blackboard`): the blackboard to persist
+        backend (:class:`~py_trees.persistence.Backend`): where to store it
+        interval (:obj:`float`): seconds between flushes
+
+    Attributes:
+        flushes (:obj:`int`): number of flushes that stored changes
+        stored (:obj:`int`): number of variables stored (or removed) over all flushes
+    """
+    def __init__(self, blackboard, backend, interval=1.0):
+        self.blackboard = blackboard
+        self.backend = backend
+        self.interval = interval
+        self.logger = logging.Logger("WriteBehind")
+        self.flushes = 0
+        self.stored = 0
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        # warm start, one bulk read and one commit (i.e. one notification)
+        values = backend.load()
+        with blackboard.transaction() as transaction:
+            for name, value in values.items():
+                transaction.set(name, value)
+        self._subscription = blackboard.subscribe(self._changed)
+        self._thread = threading.Thread(target=self._run, name="py_trees.persistence.WriteBehind")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _changed(self, changes):
+        # on the writer's thread, keep it cheap
+        with self._lock:
+            for change in changes:
+                self._dirty.add(change.key)
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error("flush failed [%s]", e)
+
+    def flush(self):
+        """
+        Save the variables that changed since the last flush, now.
+        """
+        with self._flush_lock:
+            with self._lock:
+                names, self._dirty = self._dirty, set()
+            if not names:
+                return
+            values = {}
+            deleted = []
+            missing = object()
+            for name in names:
+                value = self.blackboard.get(name, missing, local=True)
+                if value is missing:
+                    deleted.append(name)
+                else:
+                    values[name] = value
+            try:
+                self.backend.store(values, deleted)
+            except Exception:
+                # try again next time
+                with self._lock:
+                    self._dirty.update(names)
+                raise
+            self.flushes += 1
+            self.stored += len(names)
+
+    def stop(self):
+        """
+        Stop the background thread, flush any remaining changes and close the backend.
+        """
+        self.blackboard.unsubscribe(self._subscription)
+        self._stopping.set()
+        self._thread.join()
+        self.flush()
+        self.backend.close()
@@ -15,3 +15,4 @@ This package contains py_trees program script code.
 ##############################################################################
 
 from . import render  # noqa
+from . import replay  # noqa
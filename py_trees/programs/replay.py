@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+##############################################################################
+# Documentation
+##############################################################################
+
+"""
+.. argparse::
+   :module: py_trees.programs.replay
+   :func: command_line_argument_parser
+   :prog: py-trees-replay
+"""
+
+##############################################################################
+# Imports
+##############################################################################
+
+import argparse
+import datetime
+import py_trees
+import sys
+import time
+
+import py_trees.console as console
+
+try:
+    input = raw_input  # python2
+except NameError:
+    pass
+
+##############################################################################
+# Classes
+##############################################################################
+
+
+def examples():
+    examples = [console.cyan + "py-trees-replay" + console.yellow + " robot.pytrec" + console.reset,
+                console.cyan + "py-trees-replay" + console.yellow + " --tick=-1 robot.pytrec" + console.reset,
+                console.cyan + "py-trees-replay" + console.yellow + " --play --speed=10 robot.pytrec" + console.reset
+                ]
+    return examples
+
+
+def description():
+    short = "Replay a recording made by a py_trees.recording.Recorder, stepping\n"
+    short += "through it tick by tick or playing it back faster than real time.\n\n"
+    short += "Interactive commands: [n]ext, [p]revious, [g]oto <tick count>, [f]irst, [l]ast, [q]uit.\n"
+    short += "An empty line repeats the last command.\n"
+
+    if py_trees.console.has_colours:
+        banner_line = console.green + "*" * 79 + "\n" + console.reset
+        s = "\n"
+        s += banner_line
+        s += console.bold_white + "Replay".center(79) + "\n" + console.reset
+        s += banner_line
+        s += "\n"
+        s += short
+        s += "\n"
+        s += console.bold + "Examples" + console.reset + "\n\n"
+        s += '\n'.join(["    $ " + example for example in examples()])
+        s += "\n\n"
+        s += banner_line
+    else:
+        # for sphinx documentation (doesn't like raw text)
+        s = short
+        s += "\n"
+        s += console.bold + "**Examples**" + console.reset + "\n\n"
+        s += ".. code-block:: bash\n"
+        s += "    \n"
+        s += '\n'.join(["    $ {0}".format(example) for example in examples()])
+        s += "\n"
+    return s
+
+
+def epilog():
+    if py_trees.console.has_colours:
+        return console.cyan + "And his noodly appendage reached forth to tickle the blessed...\n" + console.reset
+    else:
+        return None
+
+
+def command_line_argument_parser():
+    parser = argparse.ArgumentParser(description=description(),
+                                     epilog=epilog(),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     )
+    parser.add_argument('path', help='the recording (the log, not the index)')
+    parser.add_argument('-t', '--tick', type=int, default=0, help='position to start at, negative to count from the end')
+    parser.add_argument('-p', '--play', action='store_true', help='play the recording through rather than stepping')
+    parser.add_argument('-s', '--speed', type=float, default=0.0,
+                        help='playback speed as a multiple of real time, 0 for as fast as possible')
+    return parser
+
+
+def render(frame, length):
+    """
+    Format a frame for the console.
+
+    Args:
+        frame (:class:`~py_trees.recording.Frame`): the frame
+        length (:obj:`int`): number of ticks in the recording
+
+    Returns:
+        :obj:`str`: the tree and blackboard writes of the frame
+    """
+    stamp = datetime.datetime.fromtimestamp(frame.timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")
+    s = console.bold + "Tick %s" % frame.tick + console.reset
+    s += " [%s/%s] %s\n\n" % (frame.index + 1, length, stamp)
+    s += py_trees.display.ascii_tree(frame.root, snapshot_information=frame.snapshot)
+    if frame.writes:
+        s += "\n" + console.bold + "Blackboard" + console.reset + "\n"
+        for write in frame.writes:
+            s += "  " + console.cyan + write.key + console.reset
+            s += " " + write.operation.value
+            s += (": " + console.yellow + write.value + console.reset if write.value else "") + "\n"
+    return s
+
+
+def play(recording, start, speed):
+    """
+    Print each frame from the start, keeping to the recorded timing scaled by the speed.
+
+    Args:
+        recording (:class:`~py_trees.recording.Recording`): the recording
+        start (:obj:`int`): position to start at
+        speed (:obj:`float`): multiple of real time, 0 for as fast as possible
+    """
+    first_timestamp = None
+    began = time.time()
+    for index in range(start, len(recording)):
+        frame = recording.frame(index)
+        if speed > 0.0:
+            if first_timestamp is None:
+                first_timestamp = frame.timestamp
+            delay = (frame.timestamp - first_timestamp) / speed - (time.time() - began)
+            if delay > 0.0:
+                time.sleep(delay)
+        print(render(frame, len(recording)))
+
+
+def step(recording, start):
+    """
+    Step through the frames interactively.
+
+    Args:
+        recording (:class:`~py_trees.recording.Recording`): the recording
+        start (:obj:`int`): position to start at
+    """
+    index = start
+    last_command = "n"
+    print(render(recording.frame(index), len(recording)))
+    while True:
+        try:
+            command = input("[n/p/g <tick>/f/l/q] > ").strip() or last_command
+        except EOFError:
+            break
+        words = command.split()
+        if words[0] in ("q", "quit"):
+            break
+        elif words[0] in ("n", "next"):
+            index = min(index + 1, len(recording) - 1)
+        elif words[0] in ("p", "previous"):
+            index = max(index - 1, 0)
+        elif words[0] in ("f", "first"):
+            index = 0
+        elif words[0] in ("l", "last"):
+            index = len(recording) - 1
+        elif words[0] in ("g", "goto") and len(words) == 2:
+            try:
+                index = recording.find(int(words[1]))
+            except (ValueError, IndexError) as e:
+                console.logerror("{0}".format(e))
+                continue
+        else:
+            console.logerror("unknown command [{0}]".format(command))
+            continue
+        last_command = command
+        print(render(recording.frame(index), len(recording)))
+
+##############################################################################
+# Main
+##############################################################################
+
+
+def main():
+    """
+    Entry point.
+    """
+    args = command_line_argument_parser().parse_args()
+    try:
+        recording = py_trees.recording.Recording(args.path)
+    except (IOError, OSError, ValueError) as e:
+        console.logerror("could not open the recording [{0}]".format(e))
+        sys.exit(1)
+    if len(recording) == 0:
+        console.logerror("the recording is empty [{0}]".format(args.path))
+        sys.exit(1)
+    start = args.tick + len(recording) if args.tick < 0 else args.tick
+    if not 0 <= start < len(recording):
+        console.logerror("no tick {0} in a recording of {1} ticks".format(args.tick, len(recording)))
+        sys.exit(1)
+    try:
+        if args.play:
+            play(recording, start, args.speed)
+        else:
+            step(recording, start)
+    except KeyboardInterrupt:
+        pass
+    recording.close()
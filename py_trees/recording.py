@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+##############################################################################
+# Documentation
+##############################################################################
+
+"""
+Record a tree as it ticks, for replaying incidents after the fact. A
+:class:`~py_trees.recording.Recorder` appends each tick's changes to a
+compact binary log, a :class:`~py_trees.recording.Recording` reads it back
+and reconstructs any tick. The :ref:`py-trees-replay` program steps through
+recordings on the command line.
+
+.. code-block:: python
+
+   recorder = py_trees.recording.Recorder(tree, "robot.pytrec")
+   tree.tick_tock(10)
+   ...
+   recorder.close()
+
+   recording = py_trees.recording.Recording("robot.pytrec")
+   frame = recording.frame(len(recording) - 1)
+   print(py_trees.display.ascii_tree(frame.root, snapshot_information=frame.snapshot))
+
+Recordings are two append-only files. The log holds the structure of the
+tree and, for each tick, the traversed behaviours whose status or feedback
+message changed, those that were no longer traversed and the blackboard
+writes since the tick before. Every so often a tick is recorded in full
+(a keyframe). The index (the log's path with an '.index' suffix) holds a
+fixed size entry per tick, so any tick is found without scanning and is
+reconstructed from at most a keyframe interval of ticks. Both files are
+flushed after every tick, so a recording survives the process that wrote it.
+"""
+
+##############################################################################
+# Imports
+##############################################################################
+
+import collections
+import json
+import mmap
+import os
+import struct
+import time
+
+try:
+    import reprlib
+except ImportError:
+    import repr as reprlib  # python2
+
+from . import behaviour
+from . import common
+from . import composites
+from . import decorators
+from . import visitors
+
+##############################################################################
+# Format
+##############################################################################
+
+_MAGIC = b"PYTRREC\x01"
+_HEADER = struct.Struct("<8sdI")  # magic, start time, keyframe interval
+_RECORD = struct.Struct("<BI")  # kind, payload length
+_TICK = struct.Struct("<qdIII")  # tree tick count, timestamp, changed, left, writes
+_CHANGED = struct.Struct("<IBH")  # behaviour index, status, feedback message length
+_LEFT = struct.Struct("<I")  # behaviour index
+_WRITE = struct.Struct("<BHI")  # operation, key length, value length
+_ENTRY = struct.Struct("<QQ")  # offsets of the tick and of the tree it ran on
+
+_TREE_RECORD = 0
+_TICK_RECORD = 1
+
+_STATUSES = tuple(common.Status)
+_STATUS_CODES = dict((status, code) for code, status in enumerate(_STATUSES))
+_OPERATIONS = tuple(common.BlackboardOperation)
+_OPERATION_CODES = dict((operation, code) for code, operation in enumerate(_OPERATIONS))
+
+# most specific first, anything else is recorded as a plain composite or behaviour
+_KINDS = [
+    ("Sequence", composites.Sequence),
+    ("Selector", composites.Selector),
+    ("Parallel", composites.Parallel),
+    ("Composite", composites.Composite),
+    ("Decorator", decorators.Decorator),
+]
+
+_values = reprlib.Repr()
+_values.maxstring = 80
+_values.maxother = 80
+_MAX_TEXT = 4096  # characters of a feedback message or key, at most four utf-8 bytes each to fit a H length
+
+
+def _kind(node):
+    for kind, behaviour_type in _KINDS:
+        if isinstance(node, behaviour_type):
+            return kind
+    return "Behaviour"
+
+
+def _text(text):
+    # abbreviate, as the values are, and encode
+    if len(text) > _MAX_TEXT:
+        text = text[:_MAX_TEXT - 3] + "..."
+    return text.encode("utf-8")
+
+##############################################################################
+# Recorder
+##############################################################################
+
+
+class Recorder(visitors.VisitorBase):
+    """
+    Record a tree to a file as it ticks. The recorder attaches itself to
+    the tree (as a visitor, a post tick handler and a subscriber to the
+    tree's blackboard) and detaches when closed.
+
+    Recording costs a comparison per traversed behaviour, the packing of
+    what changed and a flushed append per tick. Blackboard values are
+    recorded as abbreviated representations, as are long feedback messages
+    and keys. The structure of the tree is recorded again whenever it is
+    modified (see :attr:`~py_trees.trees.BehaviourTree.structure_version`).
+
+    Args:
+        tree (:class:`~py_trees.trees.BehaviourTree`): the tree to record
+        path (:obj:`str`): the log file to write (replaced if it exists)
+        keyframe_interval (:obj:`int`): record every n'th tick in full
+
+    Attributes:
+        path (:obj:`str`): the log file
+        ticks (:obj:`int`): number of ticks recorded
+
+    Raises:
+        ValueError: if the keyframe interval is not positive
+    """
+    def __init__(self, tree, path, keyframe_interval=100):
+        super(Recorder, self).__init__(full=False)
+        if keyframe_interval < 1:
+            raise ValueError("keyframe interval must be positive [%s]" % keyframe_interval)
+        self.tree = tree
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.ticks = 0
+        self._indices = {}  # behaviour id: index
+        self._previous = {}  # behaviour id: (status, feedback message), in the last tick
+        self._current = {}  # the same, in this tick
+        self._writes = []  # (key, operation, value representation) since the last tick
+        self._timestamp = time.time()
+        self._structure_version = None  # of the recorded tree
+        self._tree_offset = 0
+        self._log = open(path, "wb")
+        self._index = open(path + ".index", "wb")
+        self._offset = self._write(self._log, _HEADER.pack(_MAGIC, self._timestamp, keyframe_interval))
+        tree.visitors.append(self)
+        tree.add_post_tick_handler(self._record)
+        self._subscription = tree.blackboard.subscribe(self._changed)
+
+    def initialise(self):
+        """
+        Stamp the tick that is about to start.
+        """
+        self._timestamp = time.time()
+
+    def run(self, behaviour):
+        """
+        Note the status and feedback message of each traversed behaviour.
+
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): behaviour that is ticking
+        """
+        self._current[behaviour.id] = (behaviour.status, behaviour.feedback_message)
+
+    def close(self):
+        """
+        Detach from the tree and close the files.
+        """
+        if self._log.closed:
+            return
+        self.tree.blackboard.unsubscribe(self._subscription)
+        self.tree.visitors.remove(self)
+        self.tree.post_tick_handlers.remove(self._record)
+        self._log.close()
+        self._index.close()
+
+    def _changed(self, changes):
+        for change in changes:
+            value = _values.repr(change.value) if change.operation == common.BlackboardOperation.SET else ""
+            self._writes.append((change.key, change.operation, value))
+
+    def _write(self, f, data):
+        f.write(data)
+        f.flush()
+        return len(data)
+
+    def _record_tree(self, tree):
+        """
+        Record the structure of the tree, in post-order with the number of
+        children of each behaviour, so that it can be rebuilt bottom up.
+        """
+        indices = self._indices
+        nodes = []
+        for node in tree.root.iterate():
+            index = indices.get(node.id)
+            if index is None:
+                index = indices[node.id] = len(indices)
+            nodes.append([index, _kind(node), node.name, len(node.children)])
+        payload = json.dumps(nodes).encode("utf-8")
+        self._tree_offset = self._offset
+        self._offset += self._write(self._log, _RECORD.pack(_TREE_RECORD, len(payload)) + payload)
+        self._structure_version = tree.structure_version
+
+    def _record(self, tree):
+        if self._log.closed:
+            return
+        if tree.structure_version != self._structure_version:
+            self._record_tree(tree)
+        indices = self._indices
+        previous = self._previous
+        current = self._current
+        keyframe = self.ticks % self.keyframe_interval == 0
+        try:
+            chunks = []
+            changed = 0
+            for unique_id, state in current.items():
+                if keyframe or previous.get(unique_id) != state:
+                    status, feedback_message = state
+                    message = _text(feedback_message or "")
+                    # behaviours pruned before the tick ended are not in the recorded tree, index them anyway
+                    index = indices.setdefault(unique_id, len(indices))
+                    chunks.append(_CHANGED.pack(index, _STATUS_CODES[status], len(message)))
+                    chunks.append(message)
+                    changed += 1
+            left = 0
+            for unique_id in previous:
+                if unique_id not in current:
+                    chunks.append(_LEFT.pack(indices.setdefault(unique_id, len(indices))))
+                    left += 1
+            writes, self._writes = self._writes, []
+            for key, operation, value in writes:
+                key = _text(key)
+                value = value.encode("utf-8")
+                chunks.append(_WRITE.pack(_OPERATION_CODES[operation], len(key), len(value)))
+                chunks.append(key)
+                chunks.append(value)
+            payload = _TICK.pack(tree.count, self._timestamp, changed, left, len(writes)) + b"".join(chunks)
+            offset = self._offset
+            self._offset += self._write(self._log, _RECORD.pack(_TICK_RECORD, len(payload)) + payload)
+            self._write(self._index, _ENTRY.pack(offset, self._tree_offset))
+            self.ticks += 1
+        finally:
+            # whatever happened, the next tick starts afresh
+            self._previous = current
+            self._current = {}
+
+##############################################################################
+# Recording
+##############################################################################
+
+
+Write = collections.namedtuple('Write', ['key', 'operation', 'value'])
+"""
+A blackboard write in a :class:`~py_trees.recording.Frame`.
+
+Attributes:
+    key (:obj:`str`): name of the variable
+    operation (:class:`~py_trees.common.BlackboardOperation`): what happened to it
+    value (:obj:`str`): abbreviated representation of the value set, empty otherwise
+"""
+
+Frame = collections.namedtuple('Frame', ['index', 'tick', 'timestamp', 'root', 'snapshot', 'writes'])
+"""
+A tick reconstructed from a :class:`~py_trees.recording.Recording`.
+
+Attributes:
+    index (:obj:`int`): position of the tick in the recording
+    tick (:obj:`int`): the tree's tick count
+    timestamp (:obj:`float`): wall clock time the tick started, in seconds since the epoch
+    root (:class:`~py_trees.behaviour.Behaviour`): a stand-in for the tree as it was, for display
+    snapshot (:class:`~py_trees.visitors.Snapshot`): what was traversed, for :func:`~py_trees.display.ascii_tree`
+    writes ([:class:`~py_trees.recording.Write`]): blackboard writes since the tick before
+"""
+
+
+class Recording(object):
+    """
+    Read a recording made by a :class:`~py_trees.recording.Recorder`. The
+    files are memory mapped and only the ticks that are asked for are
+    decoded. Ticks recorded after opening are not seen.
+
+    Args:
+        path (:obj:`str`): the log file
+
+    Attributes:
+        path (:obj:`str`): the log file
+        start (:obj:`float`): wall clock time the recording started
+        keyframe_interval (:obj:`int`): every n'th tick is recorded in full
+
+    Raises:
+        ValueError: if the file is not a recording
+    """
+    def __init__(self, path):
+        self.path = path
+        self._log = self._map(path)
+        if self._log is None or len(self._log) < _HEADER.size:
+            raise ValueError("not a py_trees recording [%s]" % path)
+        magic, self.start, self.keyframe_interval = _HEADER.unpack_from(self._log, 0)
+        if magic != _MAGIC:
+            raise ValueError("not a py_trees recording [%s]" % path)
+        self._index = self._map(path + ".index")
+        # a partially written last tick is not part of the recording
+        self._length = 0 if self._index is None else len(self._index) // _ENTRY.size
+        while self._length:
+            offset, unused_tree_offset = _ENTRY.unpack_from(self._index, (self._length - 1) * _ENTRY.size)
+            unused_kind, length = _RECORD.unpack_from(self._log, offset)
+            if offset + _RECORD.size + length <= len(self._log):
+                break
+            self._length -= 1
+        self._trees = {}  # offset: (root, {index: behaviour})
+
+    @staticmethod
+    def _map(path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self._length
+
+    def close(self):
+        """
+        Release the mapped files.
+        """
+        for memory in (self._log, self._index):
+            if memory is not None:
+                memory.close()
+
+    def frame(self, index):
+        """
+        Reconstruct a tick, from the nearest keyframe.
+
+        Args:
+            index (:obj:`int`): position of the tick in the recording, negative to count from the end
+
+        Returns:
+            :class:`~py_trees.recording.Frame`: the tick
+
+        Raises:
+            IndexError: if there is no such tick
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("no tick %s in a recording of %s ticks" % (index, self._length))
+        # start from the keyframe before the tick before, to know what was running then
+        first = max(index - 1, 0)
+        first -= first % self.keyframe_interval
+        state = {}
+        previous = {}
+        for position in range(first, index + 1):
+            offset, tree_offset = _ENTRY.unpack_from(self._index, position * _ENTRY.size)
+            tick, timestamp, changed, left, writes = self._tick(offset)
+            if position == index:
+                previous = dict(state)
+            for behaviour_index in left:
+                state.pop(behaviour_index, None)
+            state.update(changed)
+        root, behaviours = self._tree(tree_offset)
+        snapshot = visitors.Snapshot(
+            tick,
+            dict((behaviours[i].id, s) for i, s in state.items() if i in behaviours),
+            dict((behaviours[i].id, s) for i, s in previous.items() if i in behaviours)
+        )
+        return Frame(index, tick, timestamp, root, snapshot, writes)
+
+    def find(self, tick):
+        """
+        Look up the position of a tick by the tree's tick count. The counts
+        only ever grow, so this bisects the index rather than decoding frames.
+
+        Args:
+            tick (:obj:`int`): the tree's tick count when the tick was recorded
+
+        Returns:
+            :obj:`int`: position of the tick in the recording
+
+        Raises:
+            IndexError: if that tick was not recorded
+        """
+        low, high = 0, self._length
+        while low < high:
+            middle = (low + high) // 2
+            if self._tick_count(middle) < tick:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._length or self._tick_count(low) != tick:
+            raise IndexError("tick %s was not recorded" % tick)
+        return low
+
+    def _tick_count(self, index):
+        offset, unused_tree_offset = _ENTRY.unpack_from(self._index, index * _ENTRY.size)
+        return _TICK.unpack_from(self._log, offset + _RECORD.size)[0]
+
+    def _tick(self, offset):
+        log = self._log
+        offset += _RECORD.size
+        tick, timestamp, number_changed, number_left, number_writes = _TICK.unpack_from(log, offset)
+        offset += _TICK.size
+        changed = {}
+        for unused_i in range(number_changed):
+            behaviour_index, status, length = _CHANGED.unpack_from(log, offset)
+            offset += _CHANGED.size
+            changed[behaviour_index] = (_STATUSES[status], log[offset:offset + length].decode("utf-8"))
+            offset += length
+        left = []
+        for unused_i in range(number_left):
+            left.append(_LEFT.unpack_from(log, offset)[0])
+            offset += _LEFT.size
+        writes = []
+        for unused_i in range(number_writes):
+            operation, key_length, value_length = _WRITE.unpack_from(log, offset)
+            offset += _WRITE.size
+            key = log[offset:offset + key_length].decode("utf-8")
+            offset += key_length
+            value = log[offset:offset + value_length].decode("utf-8")
+            offset += value_length
+            writes.append(Write(key, _OPERATIONS[operation], value))
+        return tick, timestamp, changed, left, writes
+
+    def _tree(self, offset):
+        """
+        Rebuild (and cache) stand-ins for the behaviours of a recorded tree.
+        """
+        if offset in self._trees:
+            return self._trees[offset]
+        unused_kind, length = _RECORD.unpack_from(self._log, offset)
+        start = offset + _RECORD.size
+        nodes = json.loads(self._log[start:start + length].decode("utf-8"))
+        behaviours = {}
+        stack = []
+        for index, kind, name, number_of_children in nodes:
+            children = stack[len(stack) - number_of_children:]
+            del stack[len(stack) - number_of_children:]
+            if kind == "Sequence":
+                node = composites.Sequence(name=name, children=children)
+            elif kind == "Selector":
+                node = composites.Selector(name=name, children=children)
+            elif kind == "Parallel":
+                node = composites.Parallel(name=name, children=children)
+            elif kind == "Composite":
+                node = composites.Composite(name=name, children=children)
+            elif kind == "Decorator" and len(children) == 1:
+                node = decorators.Decorator(child=children[0], name=name)
+            else:
+                node = behaviour.Behaviour(name=name)
+            behaviours[index] = node
+            stack.append(node)
+        self._trees[offset] = (stack[-1], behaviours)
+        return self._trees[offset]
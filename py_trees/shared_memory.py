@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+##############################################################################
+# Documentation
+##############################################################################
+
+"""
+A blackboard for sharing state between processes without serialisation.
+
+The :class:`~py_trees.shared_memory.SharedBlackboard` lives in a memory
+mapped file (put it on a tmpfs such as /dev/shm to keep it in memory). Its
+variables are fixed at creation by a schema of `struct`_ formats, e.g. 'd'
+for a float, '3d' for a vector or '65536s' for a byte buffer. Any process
+can then attach by path and read or write the variables in place, so there
+is nothing to pickle and large buffers need never be copied.
+
+.. code-block:: python
+
+   schema = [("battery", "d"), ("pose", "3d"), ("image", "921600s")]
+   blackboard = py_trees.shared_memory.SharedBlackboard.create("/dev/shm/robot", schema)
+
+   # in a worker process
+   blackboard = py_trees.shared_memory.SharedBlackboard("/dev/shm/robot")
+   blackboard.set("pose", (1.0, 2.0, 0.5))
+   with blackboard.writing("image") as image:
+       camera.read_into(image)
+
+   # in the tree's process
+   x, y, theta = blackboard.get("pose")
+   image = numpy.frombuffer(blackboard.buffer("image"), dtype=numpy.uint8)
+
+Each variable is guarded by a sequence lock. Writers make its counter odd
+while writing and even again when done, readers retry if the counter was
+odd or changed while they read. Readers never block writers and see
+either the old or the new value, never a mix. Zero-copy readers of
+:meth:`~py_trees.shared_memory.SharedBlackboard.buffer` check for
+themselves by comparing :meth:`~py_trees.shared_memory.SharedBlackboard.version`
+before and after.
+
+.. warning::
+
+   Sequence locks admit one writer at a time. Have a single process write
+   each variable, or serialise the writers (e.g. with a
+   :func:`multiprocessing.Lock`).
+
+   A writer that dies in the middle of a write leaves the variable's
+   counter odd, i.e. forever being written. Readers give up on it after a
+   timeout (see :meth:`~py_trees.shared_memory.SharedBlackboard.get`)
+   rather than wait forever, the next complete write repairs it.
+
+.. _struct: https://docs.python.org/3/library/struct.html#format-characters
+"""
+
+##############################################################################
+# Imports
+##############################################################################
+
+import contextlib
+import ctypes
+import json
+import mmap
+import os
+import struct
+import time
+import timeit
+
+from . import exceptions
+
+##############################################################################
+# Classes
+##############################################################################
+
+_MAGIC = b"PYTREES\x01"
+_HEADER = struct.Struct("<8sI")  # magic, schema length
+_COUNTER = struct.Struct("<Q")
+_ALIGNMENT = 8
+_SPINS = 100  # reads to retry before backing off
+_MAX_BACKOFF = 0.001  # seconds
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class _Variable(object):
+    """
+    Location and layout of a variable in the mapped memory, i.e. its
+    sequence counter followed by its payload.
+    """
+    __slots__ = ('name', 'format', 'struct', 'offset', 'payload', 'size', 'scalar', 'is_bytes')
+
+    def __init__(self, name, format, offset):
+        self.name = name
+        self.format = format
+        self.struct = struct.Struct("<" + format)
+        self.offset = offset
+        self.payload = offset + _COUNTER.size
+        self.size = self.struct.size
+        # unpack single values as such rather than as a one-tuple
+        self.scalar = len(self.struct.unpack(b"\x00" * self.size)) == 1
+        self.is_bytes = format.endswith("s")
+
+
+class SharedBlackboard(object):
+    """
+    A fixed-schema blackboard in a memory mapped file, for sharing state
+    between processes. Attach to an existing one by path or create a new
+    one with :meth:`create`. Instances may be passed to
+    :mod:`multiprocessing` workers, they re-attach on the other side.
+
+    Args:
+        path (:obj:`str`): the file backing the blackboard
+
+    Attributes:
+        path (:obj:`str`): the file backing the blackboard
+        schema ([(:obj:`str`, :obj:`str`)]): names and `struct`_ formats of the variables
+
+    Raises:
+        ValueError: if the file is not a shared blackboard
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "r+b")
+        try:
+            self._memory = mmap.mmap(self._file.fileno(), 0)
+        except Exception:
+            self._file.close()
+            raise
+        magic, length = _HEADER.unpack_from(self._memory, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError("not a shared blackboard [%s]" % path)
+        encoded = self._memory[_HEADER.size:_HEADER.size + length]
+        self.schema = [(str(name), str(format)) for name, format in json.loads(encoded.decode("utf-8"))]
+        self._variables = {}
+        offset = _aligned(_HEADER.size + length)
+        for name, format in self.schema:
+            variable = _Variable(name, format, offset)
+            self._variables[name] = variable
+            offset = _aligned(variable.payload + variable.size)
+
+    @classmethod
+    def create(cls, path, schema):
+        """
+        Create (or replace) a shared blackboard. All variables start zeroed.
+
+        Args:
+            path (:obj:`str`): the file to back the blackboard
+            schema ([(:obj:`str`, :obj:`str`)]): names and `struct`_ formats of the variables
+
+        Returns:
+            :class:`~py_trees.shared_memory.SharedBlackboard`: the new blackboard
+
+        Raises:
+            ValueError: if a name is repeated or a format is invalid
+        """
+        names = [name for name, unused_format in schema]
+        if len(set(names)) != len(names):
+            raise ValueError("shared blackboard variable names must be unique [%s]" % names)
+        encoded = json.dumps([[name, format] for name, format in schema]).encode("utf-8")
+        offset = _aligned(_HEADER.size + len(encoded))
+        for name, format in schema:
+            try:
+                variable = _Variable(name, format, offset)
+            except struct.error as e:
+                raise ValueError("invalid format for shared blackboard variable '%s' [%s]" % (name, e))
+            offset = _aligned(variable.payload + variable.size)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(encoded)))
+            f.write(encoded)
+            f.truncate(offset)
+        return cls(path)
+
+    def close(self):
+        """
+        Detach from the shared memory (the file remains for others).
+        Buffers obtained from :meth:`buffer` must be released first.
+        """
+        if self._memory is not None:
+            self._memory.close()
+            self._memory = None
+        self._file.close()
+
+    def unlink(self):
+        """
+        Detach and remove the backing file.
+        """
+        self.close()
+        os.remove(self.path)
+
+    def __reduce__(self):
+        # attach by path in other processes
+        return (SharedBlackboard, (self.path,))
+
+    def __contains__(self, name):
+        return name in self._variables
+
+    def keys(self):
+        """
+        Returns:
+            [:obj:`str`]: names of the variables
+        """
+        return [name for name, unused_format in self.schema]
+
+    def version(self, name):
+        """
+        The number of completed writes to the variable.
+
+        Args:
+            name (:obj:`str`): name of the variable
+
+        Returns:
+            :obj:`int`: the version
+
+        Raises:
+            KeyError: if the variable is not in the schema
+        """
+        return _COUNTER.unpack_from(self._memory, self._variables[name].offset)[0] >> 1
+
+    def get(self, name, timeout=1.0):
+        """
+        Read a consistent copy of the variable, waiting out any write in
+        progress. Reads are retried straight away at first, then with
+        growing sleeps, until the timeout.
+
+        Args:
+            name (:obj:`str`): name of the variable
+            timeout (:obj:`float`): seconds to wait for a write to finish, None to wait indefinitely
+
+        Returns:
+            :obj:`any`: a number or bytes for single valued formats, else a tuple
+
+        Raises:
+            KeyError: if the variable is not in the schema
+            :class:`~py_trees.exceptions.TimeoutException`: if a write did not finish in time (e.g. its writer died)
+        """
+        variable = self._variables[name]
+        memory = self._memory
+        offset = variable.offset
+        unpack_counter = _COUNTER.unpack_from
+        retries = 0
+        deadline = None
+        backoff = 0.0
+        while True:
+            before = unpack_counter(memory, offset)[0]
+            if not before & 1:
+                values = variable.struct.unpack_from(memory, variable.payload)
+                if unpack_counter(memory, offset)[0] == before:
+                    return values[0] if variable.scalar else values
+            retries += 1
+            if retries < _SPINS:
+                continue
+            # a long write, or a writer that died in the middle of one
+            now = timeit.default_timer()
+            if deadline is None:
+                deadline = float('inf') if timeout is None else now + timeout
+            elif now > deadline:
+                raise exceptions.TimeoutException(
+                    "shared blackboard variable '%s' was still being written after %ss, did its writer die mid-write? [%s]" % (name, timeout, self.path))
+            time.sleep(backoff)
+            backoff = min(max(2 * backoff, 0.00001), _MAX_BACKOFF)
+
+    def set(self, name, value):
+        """
+        Write the variable.
+
+        Args:
+            name (:obj:`str`): name of the variable
+            value (:obj:`any`): a number or bytes for single valued formats, else a sequence
+
+        Raises:
+            KeyError: if the variable is not in the schema
+            struct.error: if the value does not fit the format
+        """
+        variable = self._variables[name]
+        values = (value,) if variable.scalar else tuple(value)
+        # pack before entering the critical section, so a bad value can't leave it odd
+        packed = variable.struct.pack(*values)
+        with self._sequence(variable):
+            self._memory[variable.payload:variable.payload + variable.size] = packed
+
+    def buffer(self, name):
+        """
+        Zero-copy, writable view of the variable's memory, e.g. for wrapping
+        with :func:`numpy.frombuffer`. Reads through the view are not guarded,
+        compare :meth:`version` before and after to detect concurrent writes
+        and use :meth:`writing` to write through it.
+
+        Args:
+            name (:obj:`str`): name of the variable
+
+        Returns:
+            :obj:`memoryview`: the variable's bytes
+
+        Raises:
+            KeyError: if the variable is not in the schema
+        """
+        variable = self._variables[name]
+        try:
+            view = memoryview(self._memory)
+        except TypeError:
+            # python2 mmaps only have the old buffer interface, go via ctypes
+            return memoryview((ctypes.c_ubyte * variable.size).from_buffer(self._memory, variable.payload))
+        return view[variable.payload:variable.payload + variable.size]
+
+    @contextlib.contextmanager
+    def writing(self, name):
+        """
+        Write the variable in place, e.g.
+
+        .. code-block:: python
+
+           with blackboard.writing("image") as image:
+               image[:] = frame
+
+        Args:
+            name (:obj:`str`): name of the variable
+
+        Yields:
+            :obj:`memoryview`: the variable's bytes (see :meth:`buffer`)
+
+        Raises:
+            KeyError: if the variable is not in the schema
+        """
+        variable = self._variables[name]
+        view = self.buffer(name)
+        try:
+            with self._sequence(variable):
+                yield view
+        finally:
+            if hasattr(view, "release"):  # python3
+                view.release()
+
+    @contextlib.contextmanager
+    def _sequence(self, variable):
+        memory = self._memory
+        offset = variable.offset
+        counter = _COUNTER.unpack_from(memory, offset)[0] | 1
+        _COUNTER.pack_into(memory, offset, counter)
+        try:
+            yield
+        finally:
+            _COUNTER.pack_into(memory, offset, counter + 1)
+
+    def __str__(self):
+        s = "SharedBlackboard [" + self.path + "]\n"
+        max_length = max([len(name) for name in self._variables] or [0])
+        for name, unused_format in self.schema:
+            variable = self._variables[name]
+            if variable.is_bytes:
+                value = "<%s bytes>" % variable.size
+            else:
+                value = self.get(name)
+            s += "  " + '{0: <{1}}'.format(name, max_length + 1) + ": {0}\n".format(value)
+        return s
@@ -18,6 +18,8 @@ Bless my noggin with a tickle from your noodly appendages!
 # Imports
 ##############################################################################
 
+import sys
+
 from . import blackboard
 from . import console
 from . import display
@@ -48,7 +50,7 @@ def tick_tree(tree,
             print(console.green + "\nAscii Tree Snapshot" + console.reset)
             display.print_ascii_tree(tree, show_status=True)
         if print_blackboard:
-            print(str(blackboard.Blackboard()))
+            blackboard.Blackboard().render(sys.stdout)
 
 
 def print_summary(nodes):
@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+##############################################################################
+# Documentation
+##############################################################################
+
+"""
+Trace the execution of a tree on a timeline. A
+:class:`~py_trees.tracing.Tracer` emits an event for each tick of the tree
+and for each behaviour's tick, :meth:`~py_trees.behaviour.Behaviour.initialise`,
+:meth:`~py_trees.behaviour.Behaviour.update` and
+:meth:`~py_trees.behaviour.Behaviour.terminate`. A
+:class:`~py_trees.tracing.ChromeTraceWriter` writes them in the Chrome
+trace event format, which chrome://tracing and https://ui.perfetto.dev open
+alongside traces of other services (timestamps are wall clock).
+
+.. code-block:: python
+
+   writer = py_trees.tracing.ChromeTraceWriter("tree.json")
+   tracer = py_trees.tracing.Tracer(tree, writer, sample=10)  # every 10th tick
+   tree.tick_tock(100)
+   ...
+   tracer.close()
+   writer.close()
+
+To keep the overhead bounded, trace only a subtree, or only every n'th tick.
+Events are queued by the ticking thread and formatted and written by the
+writer's own thread.
+"""
+
+##############################################################################
+# Imports
+##############################################################################
+
+import collections
+import enum
+import json
+import os
+import threading
+import time
+import uuid
+
+from . import logging
+from . import visitors
+
+##############################################################################
+# Writers
+##############################################################################
+
+
+def _json_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return repr(value)
+
+
+class ChromeTraceWriter(object):
+    """
+    Write trace events to a file in the `Chrome trace event`_ format (the
+    JSON array variant, which viewers accept even if the process died before
+    the closing bracket). Events are queued and written from a background
+    thread, so emitting an event costs an append. If the queue is full, the
+    oldest events are dropped.
+
+    Args:
+        path (:obj:`str`): the file to write
+        interval (:obj:`float`): seconds between flushes
+        max_events (:obj:`int`): queue size, None for unbounded
+        process_name (:obj:`str`): name for this process on the timeline
+
+    Attributes:
+        path (:obj:`str`): the file to write
+        written (:obj:`int`): number of events written
+
+    .. _Chrome trace event: https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+    """
+    def __init__(self, path, interval=0.5, max_events=100000, process_name="py_trees"):
+        self.path = path
+        self.interval = interval
+        self.written = 0
+        self.logger = logging.Logger("ChromeTraceWriter")
+        self._pid = os.getpid()
+        self._events = collections.deque(maxlen=max_events)
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._file = open(path, "w")
+        self._file.write("[")
+        self._write({"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": process_name}})
+        self._thread = threading.Thread(target=self._run, name="py_trees.tracing.ChromeTraceWriter")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def emit(self, name, category, start, duration, tid, args):
+        """
+        Queue a complete event (a span with a beginning and an end).
+
+        Args:
+            name (:obj:`str`): what happened
+            category (:obj:`str`): for filtering in the viewer
+            start (:obj:`float`): wall clock time it began, in seconds since the epoch
+            duration (:obj:`float`): how long it took, in seconds
+            tid (:obj:`int`): the thread it happened on
+            args (:obj:`dict`): anything else, shown with the event
+        """
+        self._events.append((name, category, start, duration, tid, args))
+
+    def _write(self, event):
+        if self.written:
+            self._file.write(",\n")
+        else:
+            self._file.write("\n")
+        self._file.write(json.dumps(event, default=_json_default))
+        self.written += 1
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error("flush failed [%s]", e)
+
+    def flush(self):
+        """
+        Write the queued events, now.
+        """
+        with self._flush_lock:
+            if self._file.closed:
+                return
+            events = self._events
+            while events:
+                try:
+                    name, category, start, duration, tid, args = events.popleft()
+                except IndexError:
+                    break
+                self._write({
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start * 1000000.0,
+                    "dur": duration * 1000000.0,
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": args
+                })
+            self._file.flush()
+
+    def close(self):
+        """
+        Stop the background thread, write the remaining events and close the file.
+        """
+        self._stopping.set()
+        self._thread.join()
+        self.flush()
+        with self._flush_lock:
+            if not self._file.closed:
+                self._file.write("\n]\n")
+                self._file.close()
+
+##############################################################################
+# Tracer
+##############################################################################
+
+
+class Tracer(visitors.VisitorBase):
+    """
+    Trace a tree (or one of its subtrees) to a writer. The tracer attaches
+    itself to the tree (as a visitor and pre and post tick handlers) and
+    detaches when closed.
+
+    Like the :class:`~py_trees.visitors.ProfilingVisitor`, the tracer wraps
+    the :meth:`~py_trees.behaviour.Behaviour.tick`,
+    :meth:`~py_trees.behaviour.Behaviour.initialise`,
+    :meth:`~py_trees.behaviour.Behaviour.update` and
+    :meth:`~py_trees.behaviour.Behaviour.terminate` methods of the traced
+    behaviours (as instance attributes), so that nothing is emitted by the
+    rest of the tree. Behaviours without an instance dictionary
+    (e.g. :class:`~py_trees.behaviour.SlottedBehaviour`) are skipped.
+    Behaviours that are added to the subtree later are traced from their
+    second tick. Note that traced behaviours are always ticked with their tick
+    generators and that a behaviour's tick lasts from its first step until it
+    yields itself, i.e. it includes the time that visitors take with its children.
+
+    Events are named after the behaviours and carry the tree's tick count,
+    the behaviour's id and, once it is known, its status.
+
+    Args:
+        tree (:class:`~py_trees.trees.BehaviourTree`): the tree to trace
+        writer (:class:`~py_trees.tracing.ChromeTraceWriter`): where to send events
+        subtree (:class:`~py_trees.behaviour.Behaviour`): root of the subtree to trace, None for the whole tree
+        sample (:obj:`int`): trace every n'th tick
+
+    Attributes:
+        active (:obj:`bool`): whether the current tick is being traced
+
+    Raises:
+        ValueError: if the sample is not positive
+    """
+    def __init__(self, tree, writer, subtree=None, sample=1):
+        super(Tracer, self).__init__(full=False)
+        if sample < 1:
+            raise ValueError("tracers need to sample every n'th tick, n > 0 [%s]" % sample)
+        self.tree = tree
+        self.writer = writer
+        self.subtree = tree.root if subtree is None else subtree
+        self.sample = sample
+        self.active = False
+        self._emit = writer.emit
+        self._tick = 0
+        self._tid = 0
+        self._start = 0.0
+        self._instrumented = {}  # id: (behaviour, {method name: wrapper})
+        self._ignored = set()  # ids of behaviours seen outside the subtree
+        for behaviour in self.subtree.iterate():
+            self._instrument(behaviour)
+        tree.visitors.append(self)
+        tree.add_pre_tick_handler(self._pre_tick)
+        tree.add_post_tick_handler(self._post_tick)
+
+    def run(self, behaviour):
+        """
+        Instrument behaviours that joined the subtree.
+
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): behaviour that is ticking
+        """
+        unique_id = behaviour.id
+        if unique_id in self._instrumented or unique_id in self._ignored:
+            return
+        node = behaviour
+        while node is not None and node is not self.subtree:
+            node = node.parent
+        if node is None:
+            self._ignored.add(unique_id)
+        else:
+            self._instrument(behaviour)
+
+    def close(self):
+        """
+        Detach from the tree and restore the traced behaviours.
+        """
+        if self not in self.tree.visitors:
+            return
+        self.tree.visitors.remove(self)
+        self.tree.pre_tick_handlers.remove(self._pre_tick)
+        self.tree.post_tick_handlers.remove(self._post_tick)
+        for (behaviour, wrappers) in self._instrumented.values():
+            for (name, wrapper) in wrappers.items():
+                visitors._unwrap(behaviour, name, wrapper)
+        self._instrumented = {}
+        self.active = False
+
+    def _pre_tick(self, tree):
+        self._tick = tree.count
+        self.active = tree.count % self.sample == 0
+        if self.active:
+            self._tid = threading.current_thread().ident
+            self._start = time.time()
+
+    def _post_tick(self, tree):
+        if self.active:
+            self._emit("tick", "tree", self._start, time.time() - self._start, self._tid,
+                       {"tick": self._tick, "status": tree.root.status})
+            self.active = False
+
+    def _instrument(self, behaviour):
+        wrappers = {}
+        if getattr(behaviour, '__dict__', None) is not None:
+            for name in ('initialise', 'update', 'terminate'):
+                wrappers[name] = visitors._wrap(behaviour, name, self._traced, behaviour, name)
+            wrappers['tick'] = visitors._wrap(behaviour, 'tick', self._traced_tick, behaviour)
+        self._instrumented[behaviour.id] = (behaviour, wrappers)
+
+    def _traced(self, method, behaviour, method_name):
+        event_name = behaviour.name + "." + method_name
+
+        def traced(*args, **kwargs):
+            if not self.active:
+                return method(*args, **kwargs)
+            start = time.time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._emit(event_name, method_name, start, time.time() - start, self._tid,
+                           {"tick": self._tick, "id": behaviour.id})
+        return traced
+
+    def _traced_tick(self, tick, behaviour):
+
+        def traced_tick():
+            if not self.active:
+                return tick()
+            return self._traced_generator(behaviour, tick())
+        return traced_tick
+
+    def _traced_generator(self, behaviour, generator):
+        start = time.time()
+        finished = False
+        try:
+            for node in generator:
+                if node is behaviour:
+                    finished = True
+                    self._emit(behaviour.name, "tick", start, time.time() - start, self._tid,
+                               {"tick": self._tick, "id": behaviour.id, "status": behaviour.status})
+                yield node
+        finally:
+            # abandoned before yielding itself (or raised)
+            if not finished:
+                self._emit(behaviour.name, "tick", start, time.time() - start, self._tid,
+                           {"tick": self._tick, "id": behaviour.id, "status": behaviour.status})
@@ -25,18 +25,42 @@ can also be easily used as inspiration for your own tree custodians.
 # Imports
 ##############################################################################
 
+import array
+import collections
+import re
 import time
+import timeit
 
 from . import behaviour
+from . import common
 from . import composites
+from . import decorators
+
+from .blackboard import Blackboard
 
 CONTINUOUS_TICK_TOCK = -1
+TICK_SEQUENCE_HISTORY = 1000  # ticks for which to remember the blackboard sequence, see BehaviourTree.sequence_at()
+
+# python3 has a monotonic clock, python2 makes do with the default timer
+_monotonic = getattr(time, 'monotonic', timeit.default_timer)
+
+_REGEX_SPECIAL_CHARACTERS = re.compile(r"[.^$*+?{}\[\]\\|()]")
 
 ##############################################################################
 # Trees
 ##############################################################################
 
 
+class _TickedBehaviours(object):
+    """
+    A traversal visitor that collects the behaviours ticked in a tick.
+    """
+    __slots__ = ('run',)
+
+    def __init__(self, behaviours):
+        self.run = behaviours.append
+
+
 class BehaviourTree(object):
     """
     Grow, water, prune your behaviour tree with this, the default reference
@@ -46,33 +70,189 @@ class BehaviourTree(object):
     * Pre and post tick handlers to execute code automatically before and after a tick
     * Visitor access to the parts of the tree that were traversed in a tick
     * Subtree pruning and insertion operations
+    * Lookups by id or by name that are kept up to date as the tree is modified
     * Continuous tick-tock support
 
     .. seealso:: The :ref:`py-trees-demo-tree-stewardship-program` program demonstrates the above features.
 
     Args:
         root (:class:`~py_trees.behaviour.Behaviour`): root node of the tree
+        engine (:class:`~py_trees.trees.FlatTickEngine`): alternative tick engine, if None tick with the behaviour generators
+        blackboard (:class:`~py_trees.blackboard.Blackboard`): blackboard for the tree's behaviours, if None the global blackboard
 
     Attributes:
         count (:obj:`int`): number of times the tree has been ticked.
         root (:class:`~py_trees.behaviour.Behaviour`): root node of the tree
+        engine (:class:`~py_trees.trees.FlatTickEngine`): alternative tick engine, or None
         visitors ([:mod:`~py_trees.visitors`]): entities that visit traversed parts of the tree when it ticks
         pre_tick_handlers ([:obj:`func`]): functions that run before the entire tree is ticked
         post_tick_handlers ([:obj:`func`]): functions that run after the entire tree is ticked
+        tick_tock_statistics (:class:`~py_trees.trees.TickTockStatistics`): statistics of the last tick-tock on deadlines (if any)
+        job_pool (:class:`concurrent.futures.Executor`): pool for the tree's :class:`~py_trees.behaviours.Job` behaviours (if any)
+        blackboard (:class:`~py_trees.blackboard.Blackboard`): blackboard for the tree's behaviours (see :func:`~py_trees.blackboard.for_behaviour`)
+        snapshot_blackboard (:obj:`bool`): freeze the blackboard while ticking so that behaviours read a consistent view, writes are committed after the tick (before the post-tick handlers)
+        structure_version (:obj:`int`): incremented whenever a composite in the tree is modified
 
     Raises:
         TypeError: if root variable is not an instance of :class:`~py_trees.behaviour.Behaviour`
     """
-    def __init__(self, root):
+    def __init__(self, root, engine=None, blackboard=None):
         self.count = 0
         if not isinstance(root, behaviour.Behaviour):
             raise TypeError("root node must be an instance of 'py_trees.behaviour.Behaviour' [{}]".format(type(root)))
         self.root = root
+        self.engine = engine
         self.visitors = []
         self.pre_tick_handlers = []
         self.post_tick_handlers = []
         self.interrupt_tick_tocking = False
         self.tree_update_handler = None  # child classes can utilise this one
+        self.tick_tock_statistics = None
+        self.job_pool = None
+        self.blackboard = blackboard if blackboard is not None else Blackboard()
+        self.snapshot_blackboard = False
+        self.structure_version = 0
+        self._tick_sequences = collections.deque(maxlen=TICK_SEQUENCE_HISTORY)  # (tick, sequence)
+        self._tracked = {}  # behaviour: (status, feedback message) of behaviours not INVALID, for incremental visitors
+        self._topology = None
+        self._ids = {}
+        self._names = {}
+        self._index(root)
+        root._tree = self
+
+    @property
+    def topology(self):
+        """
+        Array-backed snapshot of the tree's structure, compiled on first use and
+        kept up to date as the composites in the tree are modified.
+
+        Returns:
+            :class:`~py_trees.trees.CompiledTopology`: the compiled topology
+        """
+        if self._topology is None:
+            self._topology = CompiledTopology(self.root)
+        return self._topology
+
+    ############################################
+    # Lookups
+    ############################################
+
+    def find(self, unique_id):
+        """
+        Find a behaviour in the tree. This is a dictionary lookup, the index
+        is kept up to date as children are added to, or removed from the
+        composites in the tree.
+
+        Args:
+            unique_id (uuid.UUID): unique id of the behaviour
+
+        Returns:
+            :class:`~py_trees.behaviour.Behaviour`: the behaviour or None if not found
+        """
+        return self._ids.get(unique_id)
+
+    def find_by_name(self, pattern):
+        """
+        Find all behaviours in the tree whose name matches the pattern. Names
+        are a dictionary lookup first. Only if no behaviour has exactly that
+        name (e.g. 'Battery Low?' is a name as well as a regular expression),
+        is the pattern matched as a regular expression against each of the
+        distinct names in the tree.
+
+        Args:
+            pattern (:obj:`str`): name, or regular expression that must match the entire name
+
+        Returns:
+            [:class:`~py_trees.behaviour.Behaviour`]: matching behaviours (possibly empty)
+        """
+        nodes = self._names.get(pattern)
+        if nodes:
+            return list(nodes)
+        if _REGEX_SPECIAL_CHARACTERS.search(pattern) is None:
+            return []
+        try:
+            regex = re.compile("(?:" + pattern + r")\Z")
+        except re.error:
+            return []  # not a regular expression, just a name that isn't in the tree
+        found = []
+        for name, nodes in self._names.items():
+            if regex.match(name) is not None:
+                found.extend(nodes)
+        return found
+
+    def _index(self, subtree):
+        for node in subtree.iterate():
+            self._ids[node.id] = node
+            self._names.setdefault(node.name, []).append(node)
+
+    def _unindex(self, subtree):
+        for node in subtree.iterate():
+            if self._ids.get(node.id) is node:
+                del self._ids[node.id]
+            nodes = self._names.get(node.name)
+            if nodes is not None:
+                for i, other in enumerate(nodes):
+                    if other is node:
+                        del nodes[i]
+                        break
+                if not nodes:
+                    del self._names[node.name]
+
+    def _subtree_modified(self, composite, added, removed):
+        """
+        Called by the composites in the tree when their children are modified.
+
+        Args:
+            composite (:class:`~py_trees.composites.Composite`): the modified composite
+            added ([:class:`~py_trees.behaviour.Behaviour`]): subtrees that were added
+            removed ([:class:`~py_trees.behaviour.Behaviour`]): subtrees that were removed
+        """
+        self.structure_version += 1
+        for subtree in removed:
+            self._unindex(subtree)
+            for node in subtree.iterate():
+                self._tracked.pop(node, None)
+        for subtree in added:
+            self._index(subtree)
+        if self._topology is not None:
+            self._topology.update(composite)
+        for visitor in self.visitors:
+            if getattr(visitor, 'incremental', False):
+                visitor.resync = True
+
+    def setup_job_pool(self, max_workers=None, processes=False):
+        """
+        Create a pool for the :class:`~py_trees.behaviours.Job` behaviours in
+        this tree, replacing (and shutting down) any previous pool.
+
+        Args:
+            max_workers (:obj:`int`): size of the pool, None for the executor's default
+            processes (:obj:`bool`): use a process pool rather than a thread pool
+
+        Returns:
+            :class:`concurrent.futures.Executor`: the new pool
+
+        Raises:
+            ImportError: if :mod:`concurrent.futures` is not available (python2 needs the futures backport)
+        """
+        import concurrent.futures
+        self.shutdown_job_pool()
+        if processes:
+            self.job_pool = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self.job_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        return self.job_pool
+
+    def shutdown_job_pool(self, wait=True):
+        """
+        Shut down the tree's job pool, if it has one.
+
+        Args:
+            wait (:obj:`bool`): wait for running jobs to finish
+        """
+        if self.job_pool is not None:
+            self.job_pool.shutdown(wait=wait)
+            self.job_pool = None
 
     def add_pre_tick_handler(self, handler):
         """
@@ -122,14 +302,14 @@ class BehaviourTree(object):
         # TODO: convert this to throwing exceptions instead
         if self.root.id == unique_id:
             raise RuntimeError("may not prune the root node")
-        for child in self.root.iterate():
-            if child.id == unique_id:
-                parent = child.parent
-                if parent is not None:
-                    parent.remove_child(child)
-                    if self.tree_update_handler is not None:
-                        self.tree_update_handler(self.root)
-                    return True
+        child = self.find(unique_id)
+        if child is not None:
+            parent = child.parent
+            if parent is not None:
+                parent.remove_child(child)
+                if self.tree_update_handler is not None:
+                    self.tree_update_handler(self.root)
+                return True
         return False
 
     def insert_subtree(self, child, unique_id, index):
@@ -157,14 +337,14 @@ class BehaviourTree(object):
            that relies on the id of the sibling node it should be inserted before/after.
         """
         # TODO: convert this to throwing exceptions instead
-        for node in self.root.iterate():
-            if node.id == unique_id:
-                if not isinstance(node, composites.Composite):
-                    raise TypeError("parent must be a Composite behaviour.")
-                node.insert_child(child, index)
-                if self.tree_update_handler is not None:
-                    self.tree_update_handler(self.root)
-                return True
+        node = self.find(unique_id)
+        if node is not None:
+            if not isinstance(node, composites.Composite):
+                raise TypeError("parent must be a Composite behaviour.")
+            node.insert_child(child, index)
+            if self.tree_update_handler is not None:
+                self.tree_update_handler(self.root)
+            return True
         return False
 
     def replace_subtree(self, unique_id, subtree):
@@ -185,14 +365,14 @@ class BehaviourTree(object):
         # TODO: convert this to throwing exceptions instead
         if self.root.id == unique_id:
             raise RuntimeError("may not replace the root node")
-        for child in self.root.iterate():
-            if child.id == unique_id:
-                parent = child.parent
-                if parent is not None:
-                    parent.replace_child(child, subtree)
-                    if self.tree_update_handler is not None:
-                        self.tree_update_handler(self.root)
-                    return True
+        child = self.find(unique_id)
+        if child is not None:
+            parent = child.parent
+            if parent is not None:
+                parent.replace_child(child, subtree)
+                if self.tree_update_handler is not None:
+                    self.tree_update_handler(self.root)
+                return True
         return False
 
     def setup(self, timeout):
@@ -222,6 +402,7 @@ class BehaviourTree(object):
             pre_tick_handler (:obj:`func`): function to execute before ticking
             post_tick_handler (:obj:`func`): function to execute after ticking
         """
+        self._tick_sequences.append((self.count, self.blackboard.sequence()))
         # pre
         for handler in self.pre_tick_handlers:
             handler(self)
@@ -230,13 +411,38 @@ class BehaviourTree(object):
         for visitor in self.visitors:
             visitor.initialise()
         # tick
-        for node in self.root.tick():
-            for visitor in [visitor for visitor in self.visitors if not visitor.full]:
-                node.visit(visitor)
+        self.blackboard.expire()
+        activity = self.blackboard.activity_log()
+        if activity is not None:
+            activity.tick = self.count
+        snapshot = self.snapshot_blackboard
+        if snapshot:
+            self.blackboard.freeze()
+        traversal_visitors = [visitor for visitor in self.visitors if not visitor.full]
+        full_visitors = [visitor for visitor in self.visitors if visitor.full]
+        ticked = None
+        if any(getattr(visitor, 'incremental', False) for visitor in full_visitors):
+            # collect the ticked and stopped behaviours, only they can have changed
+            ticked = []
+            traversal_visitors.append(_TickedBehaviours(ticked))
+            behaviour._ticking.stopped = ticked.append
+        elif self._tracked:
+            self._tracked = {}
+        try:
+            if self.engine is None:
+                for node in self.root.tick():
+                    for visitor in traversal_visitors:
+                        node.visit(visitor)
+            else:
+                self.engine.tick(self.root, traversal_visitors)
+        finally:
+            behaviour._ticking.behaviour = None
+            behaviour._ticking.stopped = None
+            if snapshot:
+                self.blackboard.thaw()
 
-        for node in self.root.iterate():
-            for visitor in [visitor for visitor in self.visitors if visitor.full]:
-                node.visit(visitor)
+        if full_visitors:
+            self._visit_full(full_visitors, ticked)
 
         # post
         for handler in self.post_tick_handlers:
@@ -245,17 +451,111 @@ class BehaviourTree(object):
             post_tick_handler(self)
         self.count += 1
 
+    def _visit_full(self, visitors, ticked):
+        """
+        Run the full visitors, over the whole tree or, for incremental
+        visitors, over the behaviours that changed.
+
+        Args:
+            visitors ([:mod:`~py_trees.visitors`]): the full visitors
+            ticked ([:class:`~py_trees.behaviour.Behaviour`]): behaviours ticked or stopped in the tick, None if not tracking changes
+        """
+        complete = []
+        incremental = []
+        for visitor in visitors:
+            if ticked is not None and getattr(visitor, 'incremental', False) and not visitor.resync:
+                incremental.append(visitor)
+            else:
+                complete.append(visitor)
+        changed = None if ticked is None else self._changes(ticked)
+        if complete:
+            tracked = None if ticked is None else self._tracked
+            for node in self.root.iterate():
+                for visitor in complete:
+                    node.visit(visitor)
+                # resynchronise with changes made before tracking started or between ticks
+                if tracked is not None:
+                    if node.status is _INVALID:
+                        tracked.pop(node, None)
+                    else:
+                        tracked[node] = (node.status, node.feedback_message)
+            for visitor in complete:
+                if getattr(visitor, 'incremental', False):
+                    visitor.resync = False
+        if incremental:
+            for node in changed:
+                for visitor in incremental:
+                    node.visit(visitor)
+
+    def _changes(self, ticked):
+        """
+        Find the behaviours whose status or feedback message changed in the
+        tick and update the record of active behaviours. Within a tick, only
+        the behaviours that were ticked, or stopped while active, can change,
+        so this is proportional to the number of those, not to the size of
+        the tree nor of its active part.
+
+        Args:
+            ticked ([:class:`~py_trees.behaviour.Behaviour`]): behaviours ticked or stopped in the tick
+
+        Returns:
+            [:class:`~py_trees.behaviour.Behaviour`]: the changed behaviours, in no particular order
+        """
+        tracked = self._tracked
+        changed = []
+        for node in set(ticked):
+            state = (node.status, node.feedback_message)
+            if tracked.get(node) != state:
+                changed.append(node)
+            if state[0] is _INVALID:
+                tracked.pop(node, None)
+            else:
+                tracked[node] = state
+        return changed
+
+    def sequence_at(self, tick):
+        """
+        The blackboard's sequence number as it was when the tree started the
+        tick, for rendering what changed since, e.g. in a post-tick handler
+
+        .. code-block:: python
+
+           tree.blackboard.render(since=tree.sequence_at(tree.count))
+
+        Ticks are remembered for the last :data:`~py_trees.trees.TICK_SEQUENCE_HISTORY` ticks.
+
+        Args:
+            tick (:obj:`int`): the tick count
+
+        Returns:
+            :obj:`int`: the sequence number, 0 (i.e. everything) if the tick has been forgotten,
+            the current sequence number if the tick has not started yet
+        """
+        if not self._tick_sequences or tick > self._tick_sequences[-1][0]:
+            return self.blackboard.sequence()
+        first = self._tick_sequences[0][0]
+        if tick < first:
+            return 0
+        return self._tick_sequences[tick - first][1]
+
     def tick_tock(self,
                   period_ms,
                   number_of_iterations=CONTINUOUS_TICK_TOCK,
                   pre_tick_handler=None,
-                  post_tick_handler=None):
+                  post_tick_handler=None,
+                  overrun_policy=None):
         """
         Tick continuously with period as specified. Depending on the implementation, the
         period may be more or less accurate and may drift in some cases (the default
         implementation here merely assumes zero time in tick and sleeps for this duration
         of time and consequently, will drift).
 
+        If an overrun policy is provided, ticks are instead scheduled against absolute
+        deadlines on a monotonic clock so that the period does not drift with the
+        time taken to tick. Ticks that run past the next deadline are handled according
+        to the policy and statistics for the tick-tock are collected in
+        :attr:`tick_tock_statistics`.
+
         This optionally accepts some handlers that will
         be used for the duration of this tick tock (c.f. those added by
         :meth:`~py_trees.trees.BehaviourTree.add_pre_tick_handler` and :meth:`~py_trees.trees.BehaviourTree.add_post_tick_handler`
@@ -268,7 +568,11 @@ class BehaviourTree(object):
             number_of_iterations (:obj:`int`): number of iterations to tick-tock
             pre_tick_handler (:obj:`func`): function to execute before ticking
             post_tick_handler (:obj:`func`): function to execute after ticking
+            overrun_policy (:class:`~py_trees.common.OverrunPolicy`): tick on deadlines, handling overruns with this policy
         """
+        if overrun_policy is not None:
+            self._tick_tock_on_deadlines(period_ms / 1000.0, number_of_iterations, pre_tick_handler, post_tick_handler, overrun_policy)
+            return
         tick_tocks = 0
         while not self.interrupt_tick_tocking and (tick_tocks < number_of_iterations or number_of_iterations == CONTINUOUS_TICK_TOCK):
             self.tick(pre_tick_handler, post_tick_handler)
@@ -279,6 +583,24 @@ class BehaviourTree(object):
             tick_tocks += 1
         self.interrupt_tick_tocking = False
 
+    def _tick_tock_on_deadlines(self, period, number_of_iterations, pre_tick_handler, post_tick_handler, overrun_policy):
+        statistics = TickTockStatistics(period)
+        self.tick_tock_statistics = statistics
+        deadline = _monotonic()
+        tick_tocks = 0
+        while not self.interrupt_tick_tocking and (tick_tocks < number_of_iterations or number_of_iterations == CONTINUOUS_TICK_TOCK):
+            start = _monotonic()
+            self.tick(pre_tick_handler, post_tick_handler)
+            finish = _monotonic()
+            statistics.record(jitter=start - deadline, duration=finish - start)
+            tick_tocks += 1
+            deadline = statistics.next_deadline(deadline, finish, overrun_policy)
+            try:
+                time.sleep(max(0.0, deadline - _monotonic()))
+            except KeyboardInterrupt:
+                break
+        self.interrupt_tick_tocking = False
+
     def tip(self):
         """
         Get the *tip* of the tree.
@@ -304,3 +626,696 @@ class BehaviourTree(object):
         Destroy the tree by stopping the root node.
         """
         self.root.stop()
+
+
+##############################################################################
+# Tick Tock Statistics
+##############################################################################
+
+
+class TickTockStatistics(object):
+    """
+    Timing statistics for a :meth:`~py_trees.trees.BehaviourTree.tick_tock` on deadlines.
+    Jitter is the lateness of a tick's start with respect to its deadline.
+
+    Args:
+        period (:obj:`float`): the tick-tock period (seconds)
+        jitter_bins ([:obj:`float`]): upper edges of the jitter histogram bins (seconds), a final bin catches the rest
+
+    Attributes:
+        period (:obj:`float`): the tick-tock period (seconds)
+        ticks (:obj:`int`): number of ticks
+        overruns (:obj:`int`): number of ticks that finished after the next deadline
+        skipped (:obj:`int`): number of deadlines dropped (:data:`~py_trees.common.OverrunPolicy.SKIP`)
+        degraded (:obj:`int`): number of times the schedule slipped (:data:`~py_trees.common.OverrunPolicy.DEGRADE`)
+        max_jitter (:obj:`float`): worst jitter (seconds)
+        max_duration (:obj:`float`): longest tick (seconds)
+        jitter_bins ([:obj:`float`]): upper edges of the jitter histogram bins (seconds)
+        jitter_histogram ([:obj:`int`]): number of ticks in each bin, the last counts everything beyond the final edge
+    """
+    def __init__(self, period, jitter_bins=(0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)):
+        self.period = period
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.degraded = 0
+        self.max_jitter = 0.0
+        self.max_duration = 0.0
+        self.total_jitter = 0.0
+        self.total_duration = 0.0
+        self.jitter_bins = list(jitter_bins)
+        self.jitter_histogram = [0] * (len(self.jitter_bins) + 1)
+
+    def record(self, jitter, duration):
+        """
+        Record the timing of a tick.
+
+        Args:
+            jitter (:obj:`float`): lateness of the tick's start (seconds)
+            duration (:obj:`float`): time taken to tick (seconds)
+        """
+        jitter = max(0.0, jitter)
+        self.ticks += 1
+        self.total_jitter += jitter
+        self.total_duration += duration
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.max_duration = max(self.max_duration, duration)
+        for (index, edge) in enumerate(self.jitter_bins):
+            if jitter <= edge:
+                self.jitter_histogram[index] += 1
+                break
+        else:
+            self.jitter_histogram[-1] += 1
+
+    def next_deadline(self, deadline, finish, overrun_policy):
+        """
+        Work out the deadline for the next tick, handling (and counting) overruns.
+
+        Args:
+            deadline (:obj:`float`): deadline of the tick that just finished (seconds)
+            finish (:obj:`float`): time at which the tick finished (seconds)
+            overrun_policy (:class:`~py_trees.common.OverrunPolicy`): how to handle an overrun
+
+        Returns:
+            :obj:`float`: deadline of the next tick (seconds)
+        """
+        deadline += self.period
+        if finish > deadline:
+            self.overruns += 1
+            if overrun_policy == common.OverrunPolicy.SKIP:
+                missed = int((finish - deadline) / self.period) + 1 if self.period > 0 else 0
+                self.skipped += missed
+                deadline += missed * self.period
+            elif overrun_policy == common.OverrunPolicy.DEGRADE:
+                self.degraded += 1
+                deadline = finish
+            # CATCH_UP: keep the deadline, the next tick starts immediately
+        return deadline
+
+    @property
+    def mean_jitter(self):
+        """
+        :obj:`float`: mean jitter (seconds)
+        """
+        return self.total_jitter / self.ticks if self.ticks else 0.0
+
+    @property
+    def mean_duration(self):
+        """
+        :obj:`float`: mean tick duration (seconds)
+        """
+        return self.total_duration / self.ticks if self.ticks else 0.0
+
+    def __str__(self):
+        s = "Period   : %.3fms\n" % (1000 * self.period)
+        s += "Ticks    : %s\n" % self.ticks
+        s += "Overruns : %s [skipped: %s][degraded: %s]\n" % (self.overruns, self.skipped, self.degraded)
+        s += "Duration : %.3fms [max: %.3fms]\n" % (1000 * self.mean_duration, 1000 * self.max_duration)
+        s += "Jitter   : %.3fms [max: %.3fms]\n" % (1000 * self.mean_jitter, 1000 * self.max_jitter)
+        lower = 0.0
+        for (edge, count) in zip(self.jitter_bins + [None], self.jitter_histogram):
+            label = "%7.3f-%.3fms" % (1000 * lower, 1000 * edge) if edge is not None else "        >%.3fms" % (1000 * lower)
+            s += "  %s : %s\n" % (label, count)
+            lower = edge
+        return s
+
+##############################################################################
+# Topology
+##############################################################################
+
+
+class CompiledTopology(object):
+    """
+    An array-backed snapshot of a tree's structure. Behaviours are laid out
+    in pre-order so that every subtree occupies a contiguous range and
+    structural queries become index arithmetic instead of recursing through
+    behaviour generators:
+
+    * the subtree of the behaviour at index ``i`` is ``nodes[i:i + sizes[i]]``
+    * ``a`` is an ancestor of ``b`` if ``a < b < a + sizes[a]``
+    * the first child of ``i`` is at ``i + 1``, its next sibling at ``i + 1 + sizes[i + 1]``...
+    * the post-order (i.e. :meth:`~py_trees.behaviour.Behaviour.iterate`) position of ``i``
+      is ``i + sizes[i] - 1 - depths[i]``
+
+    The topology does not watch the tree. After modifying the children of a
+    composite, call :meth:`update` with that composite to recompile only its
+    subtree and shift the remaining indices. :class:`~py_trees.trees.BehaviourTree`
+    does this for you whenever the children of a composite in its tree are modified.
+
+    Args:
+        root (:class:`~py_trees.behaviour.Behaviour`): root of the tree
+
+    Attributes:
+        root (:class:`~py_trees.behaviour.Behaviour`): root of the tree
+        nodes ([:class:`~py_trees.behaviour.Behaviour`]): behaviours in pre-order
+        parents (:obj:`array.array`): index of each behaviour's parent (-1 for the root)
+        depths (:obj:`array.array`): depth of each behaviour (0 for the root)
+        sizes (:obj:`array.array`): number of behaviours in each behaviour's subtree (including itself)
+        child_counts (:obj:`array.array`): number of children of each behaviour
+        post_order (:obj:`array.array`): post-order position of each behaviour
+        post_order_nodes ([:class:`~py_trees.behaviour.Behaviour`]): behaviours in post-order
+        indices (:obj:`dict`): pre-order index of each behaviour, keyed by behaviour id
+    """
+    def __init__(self, root):
+        self.root = root
+        self.update()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def update(self, subtree=None):
+        """
+        Recompile the topology for a subtree whose structure changed. If the
+        subtree root isn't known to the topology (or none is given), the entire
+        tree is recompiled.
+
+        Args:
+            subtree (:class:`~py_trees.behaviour.Behaviour`): root of the modified subtree
+        """
+        start = self.indices.get(subtree.id) if (subtree is not None and self.nodes) else None
+        if start is None or self.nodes[start] is not subtree:
+            (self.nodes, self.parents, self.depths, self.sizes, self.child_counts) = self._compile(self.root, 0)
+            self.indices = {}
+            first_shifted = 0
+        else:
+            (nodes, parents, depths, sizes, child_counts) = self._compile(subtree, self.depths[start])
+            old_size = self.sizes[start]
+            delta = len(nodes) - old_size
+            for node in self.nodes[start:start + old_size]:
+                self.indices.pop(node.id, None)
+            # parents after the subtree shift along with it
+            if delta != 0:
+                for i in range(start + old_size, len(self.parents)):
+                    if self.parents[i] >= start + old_size:
+                        self.parents[i] += delta
+            for i in range(len(parents)):
+                parents[i] = self.parents[start] if i == 0 else parents[i] + start
+            self.nodes[start:start + old_size] = nodes
+            self.parents[start:start + old_size] = parents
+            self.depths[start:start + old_size] = depths
+            self.sizes[start:start + old_size] = sizes
+            self.child_counts[start:start + old_size] = child_counts
+            ancestor = self.parents[start]
+            while ancestor != -1:
+                self.sizes[ancestor] += delta
+                ancestor = self.parents[ancestor]
+            first_shifted = start
+        for i in range(first_shifted, len(self.nodes)):
+            self.indices[self.nodes[i].id] = i
+        self.post_order = array.array('i', [i + self.sizes[i] - 1 - self.depths[i] for i in range(len(self.nodes))])
+        self.post_order_nodes = [None] * len(self.nodes)
+        for i, position in enumerate(self.post_order):
+            self.post_order_nodes[position] = self.nodes[i]
+
+    def _compile(self, root, depth):
+        """
+        Lay out a subtree in pre-order, without recursion.
+
+        Args:
+            root (:class:`~py_trees.behaviour.Behaviour`): root of the subtree
+            depth (:obj:`int`): depth of the subtree root
+
+        Returns:
+            :obj:`tuple`: nodes, parents (local indices), depths, sizes and child counts
+        """
+        nodes = []
+        parents = array.array('i')
+        depths = array.array('i')
+        child_counts = array.array('i')
+        stack = [(root, -1, depth)]
+        while stack:
+            (node, parent, node_depth) = stack.pop()
+            index = len(nodes)
+            nodes.append(node)
+            parents.append(parent)
+            depths.append(node_depth)
+            child_counts.append(len(node.children))
+            for child in reversed(node.children):
+                stack.append((child, index, node_depth + 1))
+        sizes = array.array('i', [1] * len(nodes))
+        for i in range(len(nodes) - 1, 0, -1):
+            sizes[parents[i]] += sizes[i]
+        return (nodes, parents, depths, sizes, child_counts)
+
+    ############################################
+    # Queries
+    ############################################
+
+    def find(self, unique_id):
+        """
+        Find a behaviour in the topology.
+
+        Args:
+            unique_id (uuid.UUID): unique id of the behaviour
+
+        Returns:
+            :class:`~py_trees.behaviour.Behaviour`: the behaviour or None if not found
+        """
+        index = self.indices.get(unique_id)
+        return self.nodes[index] if index is not None else None
+
+    def index(self, behaviour):
+        """
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): a behaviour in the tree
+
+        Returns:
+            :obj:`int`: pre-order index of the behaviour
+
+        Raises:
+            KeyError: if the behaviour is not in the topology
+        """
+        return self.indices[behaviour.id]
+
+    def iterate(self, behaviour=None):
+        """
+        Iterate over a subtree in the same order as :meth:`~py_trees.behaviour.Behaviour.iterate`
+        (i.e. post-order).
+
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): root of the subtree, defaults to the root of the tree
+
+        Returns:
+            [:class:`~py_trees.behaviour.Behaviour`]: behaviours in the subtree
+        """
+        if behaviour is None:
+            return list(self.post_order_nodes)
+        index = self.index(behaviour)
+        end = self.post_order[index] + 1
+        return self.post_order_nodes[end - self.sizes[index]:end]
+
+    def subtree(self, behaviour):
+        """
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): root of the subtree
+
+        Returns:
+            [:class:`~py_trees.behaviour.Behaviour`]: behaviours in the subtree, in pre-order
+        """
+        index = self.index(behaviour)
+        return self.nodes[index:index + self.sizes[index]]
+
+    def children(self, behaviour):
+        """
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): a behaviour in the tree
+
+        Returns:
+            [:class:`~py_trees.behaviour.Behaviour`]: the behaviour's children
+        """
+        index = self.index(behaviour)
+        children = []
+        child = index + 1
+        for unused_i in range(self.child_counts[index]):
+            children.append(self.nodes[child])
+            child += self.sizes[child]
+        return children
+
+    def ancestors(self, behaviour):
+        """
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): a behaviour in the tree
+
+        Returns:
+            [:class:`~py_trees.behaviour.Behaviour`]: parent, grandparent, ... up to the root
+        """
+        ancestors = []
+        index = self.parents[self.index(behaviour)]
+        while index != -1:
+            ancestors.append(self.nodes[index])
+            index = self.parents[index]
+        return ancestors
+
+    def depth(self, behaviour):
+        """
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): a behaviour in the tree
+
+        Returns:
+            :obj:`int`: depth of the behaviour (0 for the root)
+        """
+        return self.depths[self.index(behaviour)]
+
+    def is_ancestor(self, ancestor, descendant):
+        """
+        Args:
+            ancestor (:class:`~py_trees.behaviour.Behaviour`): the potential ancestor
+            descendant (:class:`~py_trees.behaviour.Behaviour`): the potential descendant
+
+        Returns:
+            :obj:`bool`: whether the first behaviour is a (strict) ancestor of the second
+        """
+        a = self.index(ancestor)
+        d = self.index(descendant)
+        return a < d < a + self.sizes[a]
+
+    def has_parent_with_name(self, behaviour, name):
+        """
+        Index based equivalent of :meth:`~py_trees.behaviour.Behaviour.has_parent_with_name`.
+
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): a behaviour in the tree
+            name (:obj:`str`): name of the parent to match, can be a regular expression
+
+        Returns:
+            bool: whether a parent was found or not
+        """
+        pattern = re.compile(name)
+        index = self.parents[self.index(behaviour)]
+        while index != -1:
+            if pattern.match(self.nodes[index].name) is not None:
+                return True
+            index = self.parents[index]
+        return False
+
+    def has_parent_with_instance_type(self, behaviour, instance_type):
+        """
+        Index based equivalent of :meth:`~py_trees.behaviour.Behaviour.has_parent_with_instance_type`.
+
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): a behaviour in the tree
+            instance_type (:obj:`str`): instance type of the parent to match
+
+        Returns:
+            bool: whether a parent was found or not
+        """
+        index = self.parents[self.index(behaviour)]
+        while index != -1:
+            if isinstance(self.nodes[index], instance_type):
+                return True
+            index = self.parents[index]
+        return False
+
+##############################################################################
+# Tick Engines
+##############################################################################
+
+# instructions for the flat tick engine, one per tick implementation it knows about
+_LEAF, _SEQUENCE, _SELECTOR, _CHOOSER, _PARALLEL, _DECORATOR, _GENERATOR = range(7)
+
+# statuses are singletons, comparing by identity is cheaper than by enum equality
+_SUCCESS = common.Status.SUCCESS
+_FAILURE = common.Status.FAILURE
+_RUNNING = common.Status.RUNNING
+_INVALID = common.Status.INVALID
+_STATUSES = (_SUCCESS, _FAILURE, _RUNNING, _INVALID)
+_NO_ATTRIBUTES = ()  # for behaviours without an instance __dict__
+
+
+def _function(method):
+    """
+    Unwrap (python2) unbound methods so tick implementations can be compared by identity.
+    """
+    return getattr(method, '__func__', method)
+
+
+class FlatTickEngine(object):
+    """
+    Tick a tree with a plain loop over an explicit stack instead of the chain
+    of nested generators that :meth:`~py_trees.behaviour.Behaviour.tick`
+    builds. With generators, every node yielded travels up through the generator
+    frame of each of its ancestors, so a tick costs O(depth) per visited node. Here
+    each node is entered and exited exactly once.
+
+    Each behaviour type is compiled (once, then cached) to an instruction that
+    replicates the library's own tick implementation for
+    :class:`~py_trees.behaviour.Behaviour`, :class:`~py_trees.composites.Sequence`,
+    :class:`~py_trees.composites.Selector`, :class:`~py_trees.composites.Chooser`,
+    :class:`~py_trees.composites.Parallel` and :class:`~py_trees.decorators.Decorator`.
+    Status semantics, the :meth:`~py_trees.behaviour.Behaviour.initialise`,
+    :meth:`~py_trees.behaviour.Behaviour.update` and :meth:`~py_trees.behaviour.Behaviour.terminate`
+    lifecycle and the order in which visitors see behaviours are all preserved.
+    Children are read directly from the tree as it ticks, so subtrees may
+    be pruned, inserted or replaced between ticks without recompiling.
+
+    Behaviours that provide their own :meth:`~py_trees.behaviour.Behaviour.tick`
+    (e.g. :mod:`~py_trees.meta` imposters, :class:`~py_trees.decorators.OneShot`)
+    are ticked via their generator as usual.
+
+    Examples:
+
+        .. code-block:: python
+
+            tree = py_trees.trees.BehaviourTree(root, engine=py_trees.trees.FlatTickEngine())
+            tree.tick()
+    """
+    def __init__(self):
+        self.instructions = {}
+
+    def compile(self, behaviour_type):
+        """
+        Get the instruction which will tick behaviours of the specified type.
+
+        Args:
+            behaviour_type (:obj:`type`): a :class:`~py_trees.behaviour.Behaviour` type
+
+        Returns:
+            :obj:`int`: the instruction
+        """
+        try:
+            return self.instructions[behaviour_type]
+        except KeyError:
+            pass
+        tick = _function(behaviour_type.tick)
+        if tick is _function(behaviour.Behaviour.tick):
+            instruction = _LEAF
+        elif tick is _function(composites.Sequence.tick):
+            instruction = _SEQUENCE
+        elif tick is _function(composites.Chooser.tick):
+            instruction = _CHOOSER
+        elif tick is _function(composites.Selector.tick):
+            instruction = _SELECTOR
+        elif tick is _function(composites.Parallel.tick):
+            instruction = _PARALLEL
+        elif tick is _function(decorators.Decorator.tick):
+            instruction = _DECORATOR
+        else:
+            instruction = _GENERATOR
+        self.instructions[behaviour_type] = instruction
+        return instruction
+
+    def tick(self, root, visitors=[]):
+        """
+        Tick the tree once.
+
+        Args:
+            root (:class:`~py_trees.behaviour.Behaviour`): root of the tree, or subtree to tick
+            visitors ([:mod:`~py_trees.visitors`]): visitors that visit behaviours as they are traversed
+        """
+        instructions = self.instructions
+        enter = self._enter
+        resume = self._resume
+        ticking = behaviour._ticking
+        stack = []
+        node = root
+        while node is not None:
+            try:
+                instruction = instructions[type(node)]
+            except KeyError:
+                instruction = self.compile(type(node))
+            if 'tick' in getattr(node, '__dict__', _NO_ATTRIBUTES):
+                instruction = _GENERATOR  # tick was replaced on the instance
+            if instruction == _LEAF:
+                self._tick_leaf(node)
+                if visitors:
+                    self._visit(node, visitors)
+                finished = node
+            else:
+                frame = [node, instruction, 0, None]
+                ticking.behaviour = node
+                node = enter[instruction](self, frame, visitors)
+                if node is not None:
+                    stack.append(frame)
+                    continue
+                finished = frame[0]
+            # unwind until a parent has another child to tick
+            node = None
+            while stack:
+                frame = stack[-1]
+                ticking.behaviour = frame[0]
+                node = resume[frame[1]](self, frame, finished, visitors)
+                if node is not None:
+                    break
+                stack.pop()
+                finished = frame[0]
+
+    ############################################
+    # Instructions
+    ############################################
+    #
+    # Each composite instruction has an enter and a resume handler operating on
+    # a frame of [behaviour, instruction, child index, scratch]. Handlers return
+    # the next child to tick, or None if the behaviour finished (after visiting it).
+    # Leaves need neither, they are ticked directly.
+
+    def _visit(self, node, visitors):
+        for visitor in visitors:
+            node.visit(visitor)
+
+    def _tick_leaf(self, node):
+        node.logger.debug("%s.tick()", node.__class__.__name__)
+        behaviour._ticking.behaviour = node
+        if node.status is not _RUNNING:
+            node.initialise()
+        new_status = node.update()
+        if new_status not in _STATUSES:
+            node.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]", new_status, node.name)
+            new_status = _INVALID
+        if new_status is not _RUNNING:
+            node.stop(new_status)
+        node.status = new_status
+
+    def _finish(self, node, visitors):
+        if visitors:
+            self._visit(node, visitors)
+        return None
+
+    def _enter_generator(self, frame, visitors):
+        for node in frame[0].tick():
+            if visitors:
+                self._visit(node, visitors)
+        return None
+
+    def _enter_sequence(self, frame, visitors):
+        node = frame[0]
+        node.logger.debug("%s.tick()", node.__class__.__name__)
+        if node.status is not _RUNNING:
+            node.logger.debug("%s.tick() [!RUNNING->resetting child index]", node.__class__.__name__)
+            node.current_index = 0
+            for child in node.children:
+                if child.status is not _INVALID:
+                    child.stop(_INVALID)
+            node.initialise()
+        node.update()
+        return self._next_sequence_child(frame, visitors)
+
+    def _resume_sequence(self, frame, child, visitors):
+        node = frame[0]
+        if child.status is not _SUCCESS:
+            node.status = child.status
+            return self._finish(node, visitors)
+        node.current_index += 1
+        return self._next_sequence_child(frame, visitors)
+
+    def _next_sequence_child(self, frame, visitors):
+        node = frame[0]
+        if node.current_index < len(node.children):
+            return node.children[node.current_index]
+        # all children are happy with their SUCCESS
+        node.current_index -= 1
+        node.stop(_SUCCESS)
+        return self._finish(node, visitors)
+
+    def _enter_selector(self, frame, visitors):
+        node = frame[0]
+        node.logger.debug("%s.tick()", node.__class__.__name__)
+        if node.status is not _RUNNING:
+            node.initialise()
+        node.update()
+        frame[3] = node.current_child  # previous
+        return self._next_selector_child(frame, visitors)
+
+    def _resume_selector(self, frame, child, visitors):
+        node = frame[0]
+        if child.status is _RUNNING or child.status is _SUCCESS:
+            node.current_child = child
+            node.status = child.status
+            previous = frame[3]
+            if previous is None or previous != node.current_child:
+                # we interrupted, invalidate everything at a lower priority
+                passed = False
+                for sibling in node.children:
+                    if passed:
+                        if sibling.status is not _INVALID:
+                            sibling.stop(_INVALID)
+                    passed = True if sibling == node.current_child else passed
+            return self._finish(node, visitors)
+        frame[2] += 1
+        return self._next_selector_child(frame, visitors)
+
+    def _next_selector_child(self, frame, visitors):
+        node = frame[0]
+        if frame[2] < len(node.children):
+            return node.children[frame[2]]
+        # all children failed, set failure ourselves and current child to the last bugger who failed us
+        node.status = _FAILURE
+        node.current_child = node.children[-1] if node.children else None
+        return self._finish(node, visitors)
+
+    def _enter_chooser(self, frame, visitors):
+        node = frame[0]
+        node.logger.debug("%s.tick()", node.__class__.__name__)
+        if node.status is not _RUNNING:
+            for child in node.children:
+                child.stop(_INVALID)
+            node.current_child = None
+            node.initialise()
+        node.update()
+        frame[3] = node.current_child  # committed to this child, if not None
+        return self._next_chooser_child(frame, visitors)
+
+    def _resume_chooser(self, frame, child, visitors):
+        node = frame[0]
+        if frame[3] is None and (child.status is _RUNNING or child.status is _SUCCESS):
+            node.current_child = child
+            return self._finish_chooser(frame, visitors)
+        frame[2] += 1
+        return self._next_chooser_child(frame, visitors)
+
+    def _next_chooser_child(self, frame, visitors):
+        node = frame[0]
+        committed = frame[3]
+        while frame[2] < len(node.children):
+            child = node.children[frame[2]]
+            if committed is None or child is committed:
+                return child
+            if child.status is not _INVALID:
+                child.stop(_INVALID)
+            frame[2] += 1
+        return self._finish_chooser(frame, visitors)
+
+    def _finish_chooser(self, frame, visitors):
+        node = frame[0]
+        new_status = node.current_child.status if node.current_child is not None else _FAILURE
+        node.stop(new_status)
+        return self._finish(node, visitors)
+
+    def _enter_parallel(self, frame, visitors):
+        node = frame[0]
+        if node.status is not _RUNNING:
+            node.initialise()
+        node.logger.debug("%s.tick()", node.__class__.__name__)
+        return self._next_parallel_child(frame, visitors)
+
+    def _resume_parallel(self, frame, child, visitors):
+        frame[2] += 1
+        return self._next_parallel_child(frame, visitors)
+
+    def _next_parallel_child(self, frame, visitors):
+        node = frame[0]
+        if frame[2] < len(node.children):
+            return node.children[frame[2]]
+        node._apply_policy()
+        return self._finish(node, visitors)
+
+    def _enter_decorator(self, frame, visitors):
+        node = frame[0]
+        node.logger.debug("%s.tick()", node.__class__.__name__)
+        if node.status is not _RUNNING:
+            node.initialise()
+        return node.decorated
+
+    def _resume_decorator(self, frame, child, visitors):
+        node = frame[0]
+        new_status = node.update()
+        if new_status not in _STATUSES:
+            node.logger.error("A behaviour returned an invalid status, setting to INVALID [%s][%s]", new_status, node.name)
+            new_status = _INVALID
+        if new_status is not _RUNNING:
+            node.stop(new_status)
+        node.status = new_status
+        return self._finish(node, visitors)
+
+    # dispatch tables, indexed by instruction
+    _enter = (None, _enter_sequence, _enter_selector, _enter_chooser, _enter_parallel, _enter_decorator, _enter_generator)
+    _resume = (None, _resume_sequence, _resume_selector, _resume_chooser, _resume_parallel, _resume_decorator, None)
@@ -21,10 +21,68 @@ runs its own method on the behaviour to do as it wishes - logging, introspecting
 # Imports
 ##############################################################################
 
+import collections
+import math
+import timeit
+
 from . import common
 # from . import console
 # from . import syntax_highlighting
 
+##############################################################################
+# Wrapping
+##############################################################################
+
+
+def _wrap(behaviour, name, factory, *args):
+    """
+    Replace a method of a behaviour with a wrapper, held in an instance
+    attribute, e.g. to time or trace it. Wrappers installed by different
+    visitors stack and can be removed in any order with :func:`_unwrap`.
+
+    Args:
+        behaviour (:class:`~py_trees.behaviour.Behaviour`): the behaviour
+        name (:obj:`str`): name of the method
+        factory (:obj:`func`): called with the method and args, returns the wrapper
+        *args: further arguments for the factory
+
+    Returns:
+        :obj:`func`: the wrapper, None if the behaviour has no instance dictionary
+    """
+    attributes = getattr(behaviour, '__dict__', None)
+    if attributes is None:
+        return None
+    wrapper = factory(getattr(behaviour, name), *args)
+    wrapper.replaced = attributes.get(name)  # instance attribute to restore, if any
+    wrapper.unwrapped = False
+    attributes[name] = wrapper
+    return wrapper
+
+
+def _unwrap(behaviour, name, wrapper):
+    """
+    Remove a wrapper installed by :func:`_wrap`. The instance attribute is
+    only restored if it is still this wrapper. If it was wrapped again
+    since, the wrapper stays where it is (still forwarding to the method)
+    and is skipped when the wrapper above it is removed.
+
+    Args:
+        behaviour (:class:`~py_trees.behaviour.Behaviour`): the behaviour
+        name (:obj:`str`): name of the method
+        wrapper (:obj:`func`): the wrapper returned by :func:`_wrap`
+    """
+    wrapper.unwrapped = True
+    attributes = behaviour.__dict__
+    if attributes.get(name) is not wrapper:
+        return
+    replaced = wrapper.replaced
+    while getattr(replaced, 'unwrapped', False):
+        replaced = replaced.replaced
+    if replaced is None:
+        attributes.pop(name, None)
+    else:
+        attributes[name] = replaced
+
 ##############################################################################
 # Visitors
 ##############################################################################
@@ -37,14 +95,26 @@ class VisitorBase(object):
     Visitors are primarily designed to work with :class:`~py_trees.trees.BehaviourTree`
     but they can be used in the same way for other tree custodian implementations.
 
+    Full visitors that keep their own picture of the tree can be made
+    incremental. After each tick, the tree then only visits the behaviours
+    whose status or feedback message changed, rather than every behaviour.
+    Changes made between ticks (e.g. by stopping a behaviour directly) are
+    not seen, set ``resync`` to have the next visit cover the whole tree.
+
     Args:
         full (:obj:`bool`): flag to indicate whether it should be used to visit only traversed nodes or the entire tree
+        incremental (:obj:`bool`): for full visitors, only visit behaviours that changed in the tick
 
     Attributes:
         full (:obj:`bool`): flag to indicate whether it should be used to visit only traversed nodes or the entire tree
+        incremental (:obj:`bool`): for full visitors, only visit behaviours that changed in the tick
+        resync (:obj:`bool`): for incremental visitors, visit the entire tree after the next tick (the tree
+            resets it, it starts set so the first visit is complete and the tree sets it when modified)
     """
-    def __init__(self, full=False):
+    def __init__(self, full=False, incremental=False):
         self.full = full
+        self.incremental = incremental
+        self.resync = True
 
     def initialise(self):
         """
@@ -75,9 +145,9 @@ class DebugVisitor(VisitorBase):
 
     def run(self, behaviour):
         if behaviour.feedback_message:
-            behaviour.logger.debug("%s.run() [%s][%s]" % (self.__class__.__name__, behaviour.feedback_message, behaviour.status))
+            behaviour.logger.debug("%s.run() [%s][%s]", self.__class__.__name__, behaviour.feedback_message, behaviour.status)
         else:
-            behaviour.logger.debug("%s.run() [%s]" % (self.__class__.__name__, behaviour.status))
+            behaviour.logger.debug("%s.run() [%s]", self.__class__.__name__, behaviour.status)
 
 
 class SnapshotVisitor(VisitorBase):
@@ -86,24 +156,39 @@ class SnapshotVisitor(VisitorBase):
     the information as a snapshot view of the tree after the iteration has
     finished.
 
+    Optionally, it also keeps a history of the last few ticks, from which the
+    snapshot of any of those ticks can be reconstructed (see :meth:`snapshot`).
+    Each tick is stored as a delta to the tick before, i.e. the behaviours whose
+    status or feedback message changed, or that entered or left the traversal,
+    so the history grows with the activity in the tree, not with its size.
+
     Args:
         full (:obj:`bool`): flag to indicate whether it should be used to visit only traversed nodes or the entire tree
+        history (:obj:`int`): number of ticks to keep snapshots of, 0 for just the last tick
 
     Attributes:
         nodes (dict): dictionary of behaviour id (uuid.UUID) and status (:class:`~py_trees.common.Status`) pairs
         running_nodes([uuid.UUID]): list of id's for behaviours which were traversed in the current tick
         previously_running_nodes([uuid.UUID]): list of id's for behaviours which were traversed in the last tick
+        tick (:obj:`int`): the current tick, counted from the first tick the visitor took part in
+        history (:obj:`int`): number of ticks to keep snapshots of
 
     .. seealso::
 
         This visitor is used with the :class:`~py_trees.trees.BehaviourTree` class to collect
         information and :func:`~py_trees.display.ascii_tree` to display information.
     """
-    def __init__(self, full=False):
+    def __init__(self, full=False, history=0):
         super(SnapshotVisitor, self).__init__(full=full)
         self.nodes = {}
         self.running_nodes = []
         self.previously_running_nodes = []
+        self.tick = -1
+        self.history = history
+        self._base = {}  # id: (status, feedback message), state before the oldest delta
+        self._deltas = collections.deque()  # ({id: (status, feedback message)}, [id]), changed and left
+        self._previous = {}  # state of the tick before the current tick
+        self._current = {}  # state of the current tick
 
     def initialise(self):
         """
@@ -113,6 +198,9 @@ class SnapshotVisitor(VisitorBase):
         self.nodes = {}
         self.previously_running_nodes = self.running_nodes
         self.running_nodes = []
+        self.tick += 1
+        if self.history and self.tick > 0:
+            self._record()
 
     def run(self, behaviour):
         """
@@ -125,3 +213,392 @@ class SnapshotVisitor(VisitorBase):
         self.nodes[behaviour.id] = behaviour.status
         if behaviour.status == common.Status.RUNNING:
             self.running_nodes.append(behaviour.id)
+        if self.history:
+            self._current[behaviour.id] = (behaviour.status, behaviour.feedback_message)
+
+    def _record(self):
+        """
+        Store the delta from the tick before the last tick to the last tick,
+        folding the oldest delta into the base if the history is full.
+        """
+        previous = self._previous
+        current = self._current
+        changed = {}
+        for unique_id, state in current.items():
+            if previous.get(unique_id) != state:
+                changed[unique_id] = state
+        left = [unique_id for unique_id in previous if unique_id not in current]
+        self._deltas.append((changed, left))
+        # the current tick is not a delta (yet), so the window is one longer
+        while len(self._deltas) >= self.history:
+            changed, left = self._deltas.popleft()
+            for unique_id in left:
+                del self._base[unique_id]
+            self._base.update(changed)
+        self._previous = current
+        self._current = {}
+
+    def ticks(self):
+        """
+        Returns:
+            (:obj:`int`, :obj:`int`): the first and last ticks that a snapshot can be reconstructed for
+        """
+        return (self.tick - len(self._deltas), self.tick)
+
+    def snapshot(self, tick=None):
+        """
+        Reconstruct the snapshot of a tick, e.g. to render it with
+        :func:`~py_trees.display.ascii_tree`. Feedback messages are those
+        recorded in the tick, rather than the behaviours' current messages.
+
+        Args:
+            tick (:obj:`int`): the tick (see :meth:`ticks`), None for the last tick
+
+        Returns:
+            :class:`~py_trees.visitors.Snapshot`: the snapshot
+
+        Raises:
+            ValueError: if no history is kept or the tick is not in it
+        """
+        if not self.history:
+            raise ValueError("no snapshot history is being kept, construct with a history")
+        first, last = self.ticks()
+        if tick is None:
+            tick = last
+        if not 0 <= first <= tick <= last:
+            raise ValueError("no snapshot of tick %s in the history [%s-%s]" % (tick, first, last))
+        if tick == last:
+            return Snapshot(tick, self._current, self._previous)
+        state = dict(self._base)
+        previous = None
+        for index in range(tick - first + 1):
+            if index == tick - first:
+                previous = dict(state)
+            changed, left = self._deltas[index]
+            for unique_id in left:
+                del state[unique_id]
+            state.update(changed)
+        return Snapshot(tick, state, previous)
+
+
+class Snapshot(object):
+    """
+    The traversal of a tree in a tick, as reconstructed from the history of a
+    :class:`~py_trees.visitors.SnapshotVisitor`. It has the attributes of
+    the visitor that :func:`~py_trees.display.ascii_tree` renders.
+
+    Args:
+        tick (:obj:`int`): the tick
+        state (:obj:`dict`): status and feedback message of the traversed behaviours, by id
+        previous_state (:obj:`dict`): the same, for the tick before
+
+    Attributes:
+        tick (:obj:`int`): the tick
+        nodes (dict): dictionary of behaviour id (uuid.UUID) and status (:class:`~py_trees.common.Status`) pairs
+        feedback_messages (dict): dictionary of behaviour id (uuid.UUID) and feedback message pairs
+        running_nodes([uuid.UUID]): list of id's for behaviours which were running in the tick
+        previously_running_nodes([uuid.UUID]): list of id's for behaviours which were running in the tick before
+    """
+    def __init__(self, tick, state, previous_state):
+        self.tick = tick
+        self.nodes = {}
+        self.feedback_messages = {}
+        self.running_nodes = []
+        for unique_id, (status, feedback_message) in state.items():
+            self.nodes[unique_id] = status
+            self.feedback_messages[unique_id] = feedback_message
+            if status == common.Status.RUNNING:
+                self.running_nodes.append(unique_id)
+        self.previously_running_nodes = [
+            unique_id for unique_id, (status, unused_message) in previous_state.items()
+            if status == common.Status.RUNNING
+        ]
+
+
+class ProfilingVisitor(VisitorBase):
+    """
+    Times each behaviour in the tick it executes in - its
+    :meth:`~py_trees.behaviour.Behaviour.initialise`,
+    :meth:`~py_trees.behaviour.Behaviour.update` and
+    :meth:`~py_trees.behaviour.Behaviour.terminate` methods as well as its
+    inclusive (whole subtree) and exclusive (less its children) tick time - and
+    aggregates the results over a rolling window of ticks.
+
+    Timing is done by wrapping the methods of each behaviour the visitor encounters
+    (as instance attributes), so measurements start from a behaviour's second
+    tick. Call :meth:`instrument` with the root of the tree to start measuring
+    immediately and :meth:`uninstrument` to restore the behaviours. Behaviours
+    without an instance dictionary (e.g. :class:`~py_trees.behaviour.SlottedBehaviour`)
+    cannot be instrumented and are skipped. Note that instrumented behaviours
+    are always ticked with their tick generators.
+
+    Args:
+        window (:obj:`int`): number of ticks to aggregate statistics over
+
+    Attributes:
+        profiles (:obj:`dict`): :class:`~py_trees.visitors.Profile` of each behaviour, keyed by behaviour id
+
+    .. code-block:: python
+
+       profiler = py_trees.visitors.ProfilingVisitor(window=100)
+       tree.visitors.append(profiler)
+       tree.tick_tock(500, number_of_iterations=1000)
+       print(profiler.table())
+       with open("tree.folded", "w") as f:
+           f.write(profiler.collapsed_stacks())  # flamegraph.pl tree.folded > tree.svg
+    """
+    def __init__(self, window=100):
+        super(ProfilingVisitor, self).__init__(full=False)
+        self.window = window
+        self.profiles = {}
+        self._instrumented = {}  # id: (behaviour, {method name: wrapper})
+        self._current = {}  # id: [behaviour, initialise, update, terminate, inclusive, ticked]
+
+    def initialise(self):
+        """
+        Fold the measurements from the last tick into the rolling statistics.
+        """
+        self._finalise()
+
+    def run(self, behaviour):
+        """
+        Instrument behaviours as they are encountered.
+
+        Args:
+            behaviour (:class:`~py_trees.behaviour.Behaviour`): behaviour that is ticking
+        """
+        if behaviour.id not in self._instrumented:
+            self._instrument(behaviour)
+
+    ############################################
+    # Instrumentation
+    ############################################
+
+    def instrument(self, root):
+        """
+        Instrument every behaviour in a (sub)tree.
+
+        Args:
+            root (:class:`~py_trees.behaviour.Behaviour`): root of the (sub)tree
+        """
+        for behaviour in root.iterate():
+            if behaviour.id not in self._instrumented:
+                self._instrument(behaviour)
+
+    def uninstrument(self):
+        """
+        Restore all instrumented behaviours to their original state.
+        """
+        for (behaviour, wrappers) in self._instrumented.values():
+            for (name, wrapper) in wrappers.items():
+                _unwrap(behaviour, name, wrapper)
+        self._instrumented = {}
+
+    def _instrument(self, behaviour):
+        wrappers = {}
+        if getattr(behaviour, '__dict__', None) is not None:
+            for (index, name) in ((1, 'initialise'), (2, 'update'), (3, 'terminate')):
+                wrappers[name] = _wrap(behaviour, name, self._timed, behaviour, index)
+            wrappers['tick'] = _wrap(behaviour, 'tick', self._timed_tick, behaviour)
+        self._instrumented[behaviour.id] = (behaviour, wrappers)
+
+    def _measurements(self, behaviour):
+        try:
+            return self._current[behaviour.id]
+        except KeyError:
+            measurements = [behaviour, 0.0, 0.0, 0.0, 0.0, False]
+            self._current[behaviour.id] = measurements
+            return measurements
+
+    def _timed(self, method, behaviour, index):
+        clock = timeit.default_timer
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._measurements(behaviour)[index] += clock() - start
+        return timed
+
+    def _timed_tick(self, tick, behaviour):
+        clock = timeit.default_timer
+
+        def timed_tick():
+            # only time spent inside the generator counts, not time spent
+            # by whoever consumes what it yields (e.g. other visitors)
+            generator = tick()
+            elapsed = 0.0
+            while True:
+                start = clock()
+                try:
+                    node = next(generator)
+                except StopIteration:
+                    elapsed += clock() - start
+                    break
+                elapsed += clock() - start
+                if node is behaviour:
+                    # it is done, parents (e.g. selectors) may never resume the generator
+                    measurements = self._measurements(behaviour)
+                    measurements[4] += elapsed
+                    measurements[5] = True
+                    elapsed = 0.0
+                yield node
+            if elapsed:
+                self._measurements(behaviour)[4] += elapsed
+        return timed_tick
+
+    ############################################
+    # Statistics
+    ############################################
+
+    def _finalise(self):
+        if not self._current:
+            return
+        current = self._current
+        self._current = {}
+        children_time = {}
+        for measurements in current.values():
+            if measurements[5]:
+                parent = measurements[0].parent
+                if parent is not None:
+                    children_time[parent.id] = children_time.get(parent.id, 0.0) + measurements[4]
+        for (unique_id, measurements) in current.items():
+            behaviour = measurements[0]
+            try:
+                profile = self.profiles[unique_id]
+            except KeyError:
+                profile = Profile(behaviour, self.window)
+                self.profiles[unique_id] = profile
+            profile.add(
+                initialise=measurements[1],
+                update=measurements[2],
+                terminate=measurements[3],
+                inclusive=measurements[4],
+                exclusive=max(0.0, measurements[4] - children_time.get(unique_id, 0.0)),
+                ticked=measurements[5]
+            )
+
+    def table(self, percentiles=(50, 90, 99), sort_by='exclusive'):
+        """
+        Render the statistics as a table, one behaviour per row, with times
+        in microseconds.
+
+        Args:
+            percentiles ([:obj:`int`]): percentiles of the inclusive and exclusive times to display
+            sort_by (:obj:`str`): statistic to sort by (descending mean), one of 'inclusive', 'exclusive', 'initialise', 'update', 'terminate'
+
+        Returns:
+            :obj:`str`: the table
+        """
+        self._finalise()
+        columns = ["Behaviour", "Ticks", "Inclusive"]
+        columns += ["p%s" % p for p in percentiles]
+        columns += ["Exclusive"]
+        columns += ["p%s" % p for p in percentiles]
+        columns += ["Initialise", "Update", "Terminate"]
+        rows = []
+        profiles = sorted(self.profiles.values(), key=lambda profile: profile.mean(sort_by), reverse=True)
+        for profile in profiles:
+            row = [profile.name, "%s" % profile.ticks, "%.1f" % (1000000 * profile.mean('inclusive'))]
+            row += ["%.1f" % (1000000 * profile.percentile('inclusive', p)) for p in percentiles]
+            row += ["%.1f" % (1000000 * profile.mean('exclusive'))]
+            row += ["%.1f" % (1000000 * profile.percentile('exclusive', p)) for p in percentiles]
+            row += ["%.1f" % (1000000 * profile.mean(name)) for name in ('initialise', 'update', 'terminate')]
+            rows.append(row)
+        widths = [max([len(columns[i])] + [len(row[i]) for row in rows]) for i in range(len(columns))]
+        lines = []
+        for row in [columns] + rows:
+            cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for (cell, width) in zip(row[1:], widths[1:])]
+            lines.append("  ".join(cells))
+        lines.insert(1, "-" * len(lines[0]))
+        return "\n".join(lines) + "\n"
+
+    def collapsed_stacks(self):
+        """
+        Export the exclusive times summed over the window in the collapsed
+        stack format used by flamegraph tools (e.g. Brendan Gregg's flamegraph.pl,
+        speedscope), one line per behaviour: the path from the root separated
+        by semicolons, then a space and the time in microseconds.
+
+        Returns:
+            :obj:`str`: the collapsed stacks
+        """
+        self._finalise()
+        lines = []
+        for profile in self.profiles.values():
+            microseconds = int(round(1000000 * sum(profile.samples['exclusive'])))
+            if microseconds > 0:
+                lines.append("%s %s" % (";".join(profile.path), microseconds))
+        return "\n".join(sorted(lines)) + "\n"
+
+
+class Profile(object):
+    """
+    Rolling timing statistics for a single behaviour, see :class:`~py_trees.visitors.ProfilingVisitor`.
+    All times are in seconds.
+
+    Args:
+        behaviour (:class:`~py_trees.behaviour.Behaviour`): the profiled behaviour
+        window (:obj:`int`): number of ticks to keep samples for
+
+    Attributes:
+        name (:obj:`str`): name of the behaviour
+        path ([:obj:`str`]): names of the behaviour's ancestors and itself, starting from the root
+        ticks (:obj:`int`): total number of ticks (not limited to the window)
+        samples (:obj:`dict`): rolling samples for 'initialise', 'update', 'terminate', 'inclusive' and 'exclusive'
+    """
+    statistics = ('initialise', 'update', 'terminate', 'inclusive', 'exclusive')
+
+    def __init__(self, behaviour, window):
+        self.name = behaviour.name.replace("\n", " ")
+        self.path = []
+        node = behaviour
+        while node is not None:
+            self.path.insert(0, node.name.replace("\n", " ").replace(";", ":"))
+            node = node.parent
+        self.ticks = 0
+        self.samples = dict((name, collections.deque(maxlen=window)) for name in Profile.statistics)
+
+    def add(self, initialise, update, terminate, inclusive, exclusive, ticked):
+        """
+        Add the measurements for one tick. Only the termination time is
+        recorded if the behaviour wasn't ticked.
+        """
+        self.samples['terminate'].append(terminate)
+        if not ticked:
+            # stopped by a parent without being ticked
+            return
+        self.ticks += 1
+        self.samples['initialise'].append(initialise)
+        self.samples['update'].append(update)
+        self.samples['inclusive'].append(inclusive)
+        self.samples['exclusive'].append(exclusive)
+
+    def mean(self, statistic):
+        """
+        Args:
+            statistic (:obj:`str`): one of 'initialise', 'update', 'terminate', 'inclusive', 'exclusive'
+
+        Returns:
+            :obj:`float`: the mean over the window
+        """
+        samples = self.samples[statistic]
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def percentile(self, statistic, percentile):
+        """
+        Nearest rank percentile over the window.
+
+        Args:
+            statistic (:obj:`str`): one of 'initialise', 'update', 'terminate', 'inclusive', 'exclusive'
+            percentile (:obj:`float`): percentile in the range [0, 100]
+
+        Returns:
+            :obj:`float`: the percentile
+        """
+        samples = sorted(self.samples[statistic])
+        if not samples:
+            return 0.0
+        rank = int(math.ceil(percentile / 100.0 * len(samples))) - 1
+        return samples[min(max(rank, 0), len(samples) - 1)]
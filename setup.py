@@ -83,6 +83,7 @@ d = setup(
              'scripts/py-trees-demo-selector',
              'scripts/py-trees-demo-sequence',
              'scripts/py-trees-demo-tree-stewardship',
-             'scripts/py-trees-render'
+             'scripts/py-trees-render',
+             'scripts/py-trees-replay'
              ],
 )
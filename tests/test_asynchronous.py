@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+import asyncio
+import gc
+
+import py_trees
+import py_trees.console as console
+
+from py_trees.common import Status
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class Sleep(py_trees.asynchronous.AsyncBehaviour):
+    def __init__(self, name="Sleep", seconds=0.05, result=None):
+        super(Sleep, self).__init__(name)
+        self.seconds = seconds
+        self.result = result
+        self.cancelled = False
+
+    async def run(self):
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+        asyncio.set_event_loop(None)
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_async_behaviour_results():
+    console.banner("Async Behaviour Results")
+    root = py_trees.composites.Parallel("Parallel", policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ALL)
+    success = Sleep("Success", seconds=0.01)
+    status = Sleep("Status", seconds=0.01, result=Status.SUCCESS)
+    failure = Sleep("Failure", seconds=0.01, result=False)
+    exception = Sleep("Exception", seconds=0.01, result=RuntimeError("boom"))
+    root.add_children([success, status, failure, exception])
+    tree = py_trees.asynchronous.AsyncBehaviourTree(root)
+
+    async def tick():
+        tree.tick()
+        print("running until the coroutines are done")
+        assert(all(child.status == Status.RUNNING for child in root.children))
+        await asyncio.sleep(0.05)
+        # parallel fails on the first failure, check the leaves before it stops them
+        results = dict((child.name, child.update()) for child in root.children)
+        return results
+
+    results = run(tick())
+    print("results: %s" % results)
+    assert(results["Success"] == Status.SUCCESS)
+    assert(results["Status"] == Status.SUCCESS)
+    assert(results["Failure"] == Status.FAILURE)
+    assert(results["Exception"] == Status.FAILURE)
+    assert("boom" in exception.feedback_message)
+
+
+def test_async_tick_tock():
+    console.banner("Async Tick Tock")
+    root = py_trees.composites.Sequence("Sequence")
+    leaves = [Sleep("Sleep %s" % i, seconds=0.03) for i in range(100)]
+    parallel = py_trees.composites.Parallel("Parallel")
+    parallel.add_children(leaves)
+    root.add_child(parallel)
+    tree = py_trees.asynchronous.AsyncBehaviourTree(root)
+    statuses = []
+    # a full collection mid tick-tock would stall the loop past the sleeps
+    gc.collect()
+    run(tree.tick_tock(period_ms=10, number_of_iterations=6, post_tick_handler=lambda tree: statuses.append(tree.root.status)))
+    print(tree.tick_tock_statistics)
+    print("statuses: %s" % statuses)
+    print("one hundred concurrent sleeps finish within a few ticks")
+    assert(Status.SUCCESS in statuses)
+    assert(statuses[0] == Status.RUNNING)
+    assert(tree.tick_tock_statistics.ticks == 6)
+
+
+def test_async_cancellation():
+    console.banner("Async Cancellation")
+    root = py_trees.composites.Selector("Selector")
+    guard = py_trees.behaviours.Count(name="Guard", fail_until=1, running_until=1, success_until=10)
+    slow = Sleep("Slow", seconds=10.0)
+    root.add_children([guard, slow])
+    tree = py_trees.asynchronous.AsyncBehaviourTree(root)
+
+    async def tick_tock():
+        await tree.tick_tock(period_ms=10, number_of_iterations=3)
+        # give the loop a chance to deliver the cancellation
+        await asyncio.sleep(0)
+
+    run(tick_tock())
+    print("higher priority interrupt cancels the coroutine")
+    assert(slow.status == Status.INVALID)
+    assert(slow.cancelled)
+    assert(slow.task is None)
+    assert(root.status == Status.SUCCESS)
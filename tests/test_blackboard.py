@@ -14,10 +14,23 @@ from __future__ import absolute_import, print_function
 
 import py_trees
 import py_trees.console as console
+import json
+import nose.tools
 import operator
+import os
+import shutil
+import tempfile
+import threading
+import time
+import timeit
 
 from py_trees.common import Status
 
+try:
+    from StringIO import StringIO  # python2
+except ImportError:
+    from io import StringIO
+
 ##############################################################################
 # Logging Level
 ##############################################################################
@@ -50,6 +63,35 @@ def create_blackboard():
     blackboard.nothing = None
     return blackboard
 
+
+class Tally(py_trees.composites.Sequence):
+    """
+    A sequence that writes to the blackboard once its children are done.
+    """
+    def terminate(self, new_status):
+        if new_status == Status.SUCCESS:
+            py_trees.blackboard.for_behaviour(self).set("tally", True)
+
+
+class Writer(py_trees.behaviour.Behaviour):
+    """
+    Writes from the ticking thread, or from a thread of its own.
+    """
+    def __init__(self, name, key, blackboard, threaded=False):
+        super(Writer, self).__init__(name)
+        self.key = key
+        self.board = blackboard
+        self.threaded = threaded
+
+    def update(self):
+        if self.threaded:
+            thread = threading.Thread(target=self.board.set, args=(self.key, True))
+            thread.start()
+            thread.join()
+        else:
+            self.board.set(self.key, True)
+        return Status.SUCCESS
+
 ##############################################################################
 # Tests
 ##############################################################################
@@ -61,6 +103,58 @@ def test_print_blackboard():
     print('{0}'.format(blackboard))
 
 
+def test_render():
+    console.banner("Render")
+    blackboard = py_trees.blackboard.Blackboard.create("render")
+    for i in range(100):
+        blackboard.set("sensor_%02d" % i, i)
+    blackboard.image = list(range(100000))
+    blackboard.text = "\n".join(["line"] * 100)
+    blackboard.nothing = None
+    print(" - Assert rendering matches the string form")
+    stream = StringIO()
+    blackboard.render(stream)
+    assert(stream.getvalue() == str(blackboard))
+    print(" - Assert prefixes and keys select variables")
+    stream = StringIO()
+    blackboard.render(stream, prefix="sensor_9")
+    print(stream.getvalue())
+    assert(len(stream.getvalue().splitlines()) == 11)
+    stream = StringIO()
+    blackboard.render(stream, keys=["text", "nothing", "missing"], max_value_lines=2)
+    print(stream.getvalue())
+    lines = stream.getvalue().splitlines()
+    assert(len(lines) == 6)
+    assert("-" in lines[1] and lines[-1].strip().endswith("..."))
+    print(" - Assert values are truncated")
+    stream = StringIO()
+    blackboard.render(stream, keys=["image"], max_value_length=20)
+    print(stream.getvalue())
+    assert(len(stream.getvalue().splitlines()[-1]) < 50)
+    print(" - Assert the number of variables is limited")
+    stream = StringIO()
+    blackboard.render(stream, max_keys=3)
+    print(stream.getvalue())
+    lines = stream.getvalue().splitlines()
+    assert("image" in lines[1] and "nothing" in lines[2] and "sensor_00" in lines[3])
+    assert("100 more" in lines[4])
+    print(" - Assert changes since a tick are rendered, including removals")
+    root = py_trees.blackboard.SetBlackboardVariable(
+        name="Set Sensor", variable_name="sensor_50", variable_value=-1)
+    tree = py_trees.trees.BehaviourTree(root, blackboard=blackboard)
+    tree.tick()
+    tree.tick()
+    blackboard.unset("nothing")
+    stream = StringIO()
+    blackboard.render(stream, since=tree.sequence_at(1))
+    print(stream.getvalue())
+    lines = stream.getvalue().splitlines()
+    assert(len(lines) == 3)
+    assert("<unset>" in lines[1] and "-1" in lines[2])
+    assert(tree.sequence_at(0) < tree.sequence_at(1) < tree.sequence_at(2))
+    assert(tree.sequence_at(2) == blackboard.sequence())
+
+
 def test_variable_exists():
     console.banner("Check Existence of Variable")
     create_blackboard()
@@ -195,3 +289,753 @@ def test_set_blackboard_variable():
     assert(blackboard.foo == "bar")
     print(" - Assert set_foo.status == SUCCESS")
     assert(set_foo.status == Status.SUCCESS)
+
+
+def test_accessors():
+    console.banner("Accessors")
+    blackboard = create_blackboard()
+    foo = blackboard.accessor("foo")
+    nested = blackboard.accessor("foobar.foo")
+    missing = blackboard.accessor("nothere")
+    missing_nested = blackboard.accessor("nothere.foo")
+    print(" - Assert reads match the attribute style")
+    assert(foo.get() == blackboard.foo)
+    assert(nested.get() == blackboard.foobar.foo)
+    print(" - Assert missing variables return the default")
+    assert(missing.get() is None)
+    assert(missing.get("default") == "default")
+    assert(missing_nested.get("default") == "default")
+    assert(not missing.exists())
+    assert(not missing_nested.exists())
+    print(" - Assert a variable holding None exists")
+    assert(blackboard.accessor("nothing").exists())
+    print(" - Assert writes are visible to the attribute style")
+    foo.set("baz")
+    assert(blackboard.foo == "baz")
+    nested.set("baz")
+    assert(blackboard.foobar.foo == "baz")
+    print(" - Assert a write through a missing parent raises")
+    nose.tools.assert_raises(AttributeError, missing_nested.set, "baz")
+    print(" - Assert unset and exists")
+    foo.unset()
+    assert(not foo.exists())
+    assert(not blackboard.exists("foo"))
+    assert(not hasattr(blackboard, "foo"))
+    print(" - Assert accessors see a cleared blackboard")
+    py_trees.blackboard.Blackboard.clear()
+    assert(not nested.exists())
+    blackboard.foo = "bar"
+    assert(foo.get() == "bar")
+
+
+def test_string_style_access():
+    console.banner("String Style Access")
+    blackboard = create_blackboard()
+    print(" - Assert get with a default")
+    assert(blackboard.get("foo") == "bar")
+    assert(blackboard.get("nothere") is None)
+    assert(blackboard.get("nothere", 3) == 3)
+    print(" - Assert set without overwriting")
+    assert(not blackboard.set("foo", "baz", overwrite=False))
+    assert(blackboard.foo == "bar")
+    assert(blackboard.set("baz", "foo", overwrite=False))
+    print(" - Assert keys")
+    assert("baz" in blackboard.keys())
+    print(" - Assert deleting attributes")
+    del blackboard.baz
+    assert(not blackboard.exists("baz"))
+    nose.tools.assert_raises(AttributeError, delattr, blackboard, "baz")
+
+
+def test_accessor_benchmark():
+    console.banner("Accessor Benchmark")
+
+    class AttributeBlackboard(object):
+        """The former, attribute backed, implementation."""
+        __shared_state = {}
+
+        def __init__(self):
+            self.__dict__ = self.__shared_state
+
+        def set(self, name, value):
+            setattr(self, name, value)
+
+        def get(self, name):
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                return None
+
+    create_blackboard()
+    iterations = 20000
+    old = AttributeBlackboard()
+    old.set("foobar", FooBar())
+    foo = py_trees.blackboard.Blackboard().accessor("foo")
+    nested = py_trees.blackboard.Blackboard().accessor("foobar.foo")
+
+    def old_style():
+        for unused_i in range(iterations):
+            old.set("foo", unused_i)
+            old.get("foo")
+            old.get("nothere")
+            operator.attrgetter("foobar.foo")(old)
+
+    def accessors():
+        for unused_i in range(iterations):
+            foo.set(unused_i)
+            foo.get()
+            nested.get()
+            nested.get()
+
+    # interleaved, so that both see the same load
+    old_style_time = accessors_time = float('inf')
+    for unused_i in range(5):
+        old_style_time = min(old_style_time, timeit.timeit(old_style, number=1))
+        accessors_time = min(accessors_time, timeit.timeit(accessors, number=1))
+    print("Read/write x%s" % iterations)
+    print("  attributes: %.2fms" % (1000.0 * old_style_time))
+    print("  accessors : %.2fms" % (1000.0 * accessors_time))
+    print("  speedup   : %.2fx" % (old_style_time / accessors_time))
+    print(" - Assert the accessors read what was written")
+    assert(foo.get() == iterations - 1)
+    assert(nested.get() == old.get("foobar").foo)
+
+
+def test_versions():
+    console.banner("Versions")
+    blackboard = create_blackboard()
+    foo = blackboard.accessor("foo")
+    nested = blackboard.accessor("foobar.foo")
+    print(" - Assert never written variables are version 0")
+    assert(blackboard.version("nothere") == 0)
+    print(" - Assert writes bump the version to the write sequence")
+    version = blackboard.version("foo")
+    blackboard.foo = "baz"
+    assert(blackboard.version("foo") > version)
+    assert(blackboard.version("foo") == blackboard.sequence())
+    foo.set("bar")
+    assert(foo.version() == blackboard.sequence())
+    print(" - Assert other variables are unchanged")
+    assert(blackboard.version("some_tuple") < foo.version())
+    print(" - Assert nested writes and touches bump the version")
+    version = blackboard.version("foobar")
+    nested.set("baz")
+    assert(blackboard.version("foobar") > version)
+    version = blackboard.version("foobar")
+    blackboard.foobar.foo = "bar"
+    assert(blackboard.version("foobar") == version)
+    blackboard.touch("foobar")
+    assert(blackboard.version("foobar") > version)
+    print(" - Assert unsetting bumps the version")
+    version = foo.version()
+    foo.unset()
+    assert(foo.version() > version)
+    print(" - Assert clearing bumps the version")
+    version = blackboard.version("some_tuple")
+    py_trees.blackboard.Blackboard.clear()
+    assert(blackboard.version("some_tuple") > version)
+
+
+def test_subscriptions():
+    console.banner("Subscriptions")
+    blackboard = create_blackboard()
+    changes = []
+    foo_changes = []
+    subscription = blackboard.subscribe(changes.extend)
+    foo_subscription = blackboard.subscribe(foo_changes.extend, keys=["foo"])
+    blackboard.foo = "baz"
+    blackboard.set("bar", "foo")
+    blackboard.unset("bar")
+    blackboard.unset("bar")
+    for change in changes:
+        print("  %s" % (change,))
+    print(" - Assert all changes were delivered")
+    assert([(c.key, c.operation) for c in changes] == [
+        ("foo", py_trees.common.BlackboardOperation.SET),
+        ("bar", py_trees.common.BlackboardOperation.SET),
+        ("bar", py_trees.common.BlackboardOperation.UNSET)]
+    )
+    assert(changes[0].value == "baz")
+    assert(changes[0].version == blackboard.version("foo"))
+    print(" - Assert the key filter was applied")
+    assert([c.key for c in foo_changes] == ["foo"])
+    print(" - Assert nothing is delivered after unsubscribing")
+    blackboard.unsubscribe(subscription)
+    blackboard.unsubscribe(foo_subscription)
+    blackboard.foo = "bar"
+    assert(len(changes) == 3)
+    assert(len(foo_changes) == 1)
+
+
+def test_wait():
+    console.banner("Wait")
+    blackboard = create_blackboard()
+    print(" - Assert a wait times out without writes")
+    assert(blackboard.wait("foo", timeout=0.01) is None)
+    print(" - Assert a wait returns on a write from another thread")
+    version = blackboard.version("foo")
+    writer = threading.Timer(0.05, blackboard.set, args=("foo", "baz"))
+    writer.start()
+    new_version = blackboard.wait("foo", version, timeout=5.0)
+    writer.join()
+    print("  version: %s -> %s" % (version, new_version))
+    assert(new_version is not None and new_version > version)
+    print(" - Assert a wait on an older version returns immediately")
+    assert(blackboard.wait("foo", version, timeout=0.0) == new_version)
+
+
+def test_skip_unchanged_comparisons():
+    console.banner("Skip Unchanged Comparisons")
+    blackboard = create_blackboard()
+    comparisons = []
+
+    def counting_eq(a, b):
+        comparisons.append((a, b))
+        return a == b
+
+    check = py_trees.blackboard.CheckBlackboardVariable(
+        name="Check Foo", variable_name="foo",
+        expected_value="bar", comparison_operator=counting_eq)
+    wait = py_trees.blackboard.WaitForBlackboardVariable(
+        name="Wait Foo", variable_name="foo",
+        expected_value="baz", comparison_operator=counting_eq)
+    check_nested = py_trees.blackboard.CheckBlackboardVariable(
+        name="Check Nested", variable_name="foobar.foo",
+        expected_value="bar", comparison_operator=counting_eq)
+    for unused_i in range(3):
+        check.tick_once()
+        wait.tick_once()
+    print(" - Assert the immutable value was compared once per behaviour")
+    assert(len(comparisons) == 2)
+    assert(check.status == Status.SUCCESS)
+    assert(wait.status == Status.RUNNING)
+    print(" - Assert a write triggers a new comparison")
+    blackboard.foo = "baz"
+    check.tick_once()
+    wait.tick_once()
+    assert(len(comparisons) == 4)
+    assert(check.status == Status.FAILURE)
+    assert(wait.status == Status.SUCCESS)
+    print(" - Assert values that may be mutated in place are always compared")
+    del comparisons[:]
+    for unused_i in range(3):
+        check_nested.tick_once()
+    assert(len(comparisons) == 3)
+    blackboard.foobar.foo = "baz"
+    check_nested.tick_once()
+    assert(check_nested.status == Status.FAILURE)
+    print(" - Assert reassigning the expectation triggers a new comparison")
+    check.expected_value = "baz"
+    check.tick_once()
+    assert(check.status == Status.SUCCESS)
+    check.comparison_operator = operator.ne
+    check.tick_once()
+    assert(check.status == Status.FAILURE)
+    print(" - Assert mutable expectations are always compared")
+    expected = ["baz"]
+    check = py_trees.blackboard.CheckBlackboardVariable(
+        name="Check List", variable_name="foo",
+        expected_value=expected, comparison_operator=lambda value, expected: value in expected)
+    check.tick_once()
+    assert(check.status == Status.SUCCESS)
+    expected[0] = "bar"
+    check.tick_once()
+    assert(check.status == Status.FAILURE)
+
+
+def test_scopes():
+    console.banner("Scopes")
+    py_trees.blackboard.Blackboard.clear()
+    global_blackboard = create_blackboard()
+    tree_blackboard = py_trees.blackboard.Blackboard.create("tree")
+    subtree_blackboard = py_trees.blackboard.Blackboard.create("subtree", parent=tree_blackboard)
+    tree_blackboard.foo = "tree"
+    tree_blackboard.bar = "tree"
+    subtree_blackboard.foo = "subtree"
+    print("%s" % tree_blackboard)
+    print("%s" % subtree_blackboard)
+    print(" - Assert isolated blackboards do not see the global variables")
+    assert(not tree_blackboard.exists("some_tuple"))
+    assert(global_blackboard.foo == "bar")
+    print(" - Assert local variables shadow the enclosing scope")
+    assert(subtree_blackboard.foo == "subtree")
+    assert(tree_blackboard.foo == "tree")
+    print(" - Assert the enclosing scope is visible")
+    bar = subtree_blackboard.accessor("bar")
+    assert(bar.get() == "tree")
+    print(" - Assert writes to the enclosing scope are visible")
+    tree_blackboard.bar = "changed"
+    assert(bar.get() == "changed")
+    assert(bar.version() == tree_blackboard.version("bar"))
+    tree_blackboard.foo = "changed"
+    assert(subtree_blackboard.foo == "subtree")
+    print(" - Assert unsetting a local variable uncovers the enclosing scope")
+    subtree_blackboard.unset("foo")
+    assert(subtree_blackboard.foo == "changed")
+    subtree_blackboard.unset("foo")
+    assert(tree_blackboard.foo == "changed")
+    print(" - Assert unsetting in the enclosing scope is visible")
+    tree_blackboard.unset("bar")
+    assert(not bar.exists())
+    print(" - Assert subscribers see changes from the enclosing scope")
+    changes = []
+    subtree_blackboard.subscribe(changes.extend)
+    tree_blackboard.bar = "again"
+    assert([(c.key, c.value) for c in changes] == [("bar", "again")])
+    print(" - Assert clearing a scope leaves the global blackboard")
+    tree_blackboard.clear()
+    assert(not tree_blackboard.exists("foo"))
+    assert(global_blackboard.foo == "bar")
+
+
+def test_tree_blackboards():
+    console.banner("Tree Blackboards")
+    py_trees.blackboard.Blackboard.clear()
+
+    def create_tree(value):
+        root = py_trees.composites.Sequence("Root")
+        subtree = py_trees.composites.Sequence("Subtree")
+        set_foo = py_trees.blackboard.SetBlackboardVariable(
+            name="Set Foo", variable_name="foo", variable_value=value)
+        set_bar = py_trees.blackboard.SetBlackboardVariable(
+            name="Set Bar", variable_name="bar", variable_value=value)
+        check_foo = py_trees.blackboard.CheckBlackboardVariable(
+            name="Check Foo", variable_name="foo", expected_value=value)
+        check_bar = py_trees.blackboard.CheckBlackboardVariable(
+            name="Check Bar", variable_name="bar", expected_value=value)
+        clear_foo = py_trees.blackboard.ClearBlackboardVariable(
+            name="Clear Foo", variable_name="foo")
+        wait_foo = py_trees.blackboard.WaitForBlackboardVariable(
+            name="Wait Foo", variable_name="foo", expected_value=value)
+        subtree.add_children([set_bar, check_foo, check_bar])
+        root.add_children([set_foo, subtree, clear_foo, wait_foo])
+        return root, subtree
+
+    first_root, first_subtree = create_tree("first")
+    second_root, unused_subtree = create_tree("second")
+    first = py_trees.trees.BehaviourTree(
+        first_root, blackboard=py_trees.blackboard.Blackboard.create("first"))
+    second = py_trees.trees.BehaviourTree(
+        second_root, blackboard=py_trees.blackboard.Blackboard.create("second"))
+    first_subtree.blackboard_scope = py_trees.blackboard.Blackboard.create(
+        "subtree", parent=first.blackboard)
+    first.setup(timeout=1)
+    second.setup(timeout=1)
+    first.tick()
+    second.tick()
+    print("%s" % first.blackboard)
+    print("%s" % first_subtree.blackboard_scope)
+    print("%s" % second.blackboard)
+    print(" - Assert the trees did not trample each other")
+    assert(first_subtree.status == Status.SUCCESS)
+    assert(first_root.status == Status.RUNNING)
+    assert(second_root.status == Status.RUNNING)
+    print(" - Assert the subtree wrote to its own scope")
+    assert(first_subtree.blackboard_scope.get("bar") == "first")
+    assert(not first.blackboard.exists("bar"))
+    assert(second.blackboard.get("bar") == "second")
+    print(" - Assert the global blackboard was not touched")
+    assert(py_trees.blackboard.Blackboard().keys() == [])
+    print(" - Assert wait resumes when its tree's variable appears")
+    first.blackboard.foo = "first"
+    first.tick()
+    assert(first_root.status == Status.SUCCESS)
+
+
+def test_behaviour_blackboards():
+    console.banner("Behaviour Blackboards")
+    check = py_trees.blackboard.CheckBlackboardVariable(name="Check", variable_name="foo", expected_value="bar")
+    print(" - Assert the blackboard is there from construction")
+    assert(check.blackboard._store is py_trees.blackboard.Blackboard()._store)
+    scoped = py_trees.composites.Sequence("Scoped")
+    scoped.blackboard_scope = py_trees.blackboard.Blackboard.create("scoped")
+    scoped.blackboard_scope.foo = "bar"
+    plain = py_trees.composites.Sequence("Plain")
+    root = py_trees.composites.Parallel("Root", children=[scoped, plain])
+    tree = py_trees.trees.BehaviourTree(root, blackboard=py_trees.blackboard.Blackboard.create("tree"))
+    plain.add_child(check)
+    tree.setup(timeout=1)
+    tree.tick()
+    print(" - Assert it resolves to the tree's blackboard")
+    assert(check.blackboard._store is tree.blackboard._store)
+    assert(check.status == Status.FAILURE)
+    print(" - Assert it follows the behaviour into another scope")
+    plain.remove_child(check)
+    scoped.add_child(check)
+    tree.tick()
+    assert(check.blackboard._store is scoped.blackboard_scope._store)
+    assert(check.status == Status.SUCCESS)
+    print(" - Assert assigned blackboards stick")
+    check.blackboard = tree.blackboard
+    tree.tick()
+    assert(check.status == Status.FAILURE)
+
+
+def test_transactions():
+    console.banner("Transactions")
+    blackboard = create_blackboard()
+    batches = []
+    subscription = blackboard.subscribe(batches.append)
+    print(" - Assert writes are not visible until committed")
+    with blackboard.transaction() as transaction:
+        transaction.set("x", 3.0)
+        transaction.set("y", 4.0)
+        transaction.unset("foo")
+        assert(not blackboard.exists("x"))
+        assert(blackboard.foo == "bar")
+        print(" - Assert the transaction reads its own writes")
+        assert(transaction.get("x") == 3.0)
+        assert(transaction.get("foo", "unset") == "unset")
+        assert(transaction.get("some_tuple") == (1, "bar"))
+    print(" - Assert the commit was notified as one batch")
+    for change in batches[0]:
+        print("  %s" % (change,))
+    assert(len(batches) == 1)
+    assert([c.key for c in batches[0]] == ["x", "y", "foo"])
+    assert(blackboard.x == 3.0 and blackboard.y == 4.0)
+    assert(not blackboard.exists("foo"))
+    print(" - Assert the writes are discarded on exceptions")
+
+    def failing_transaction():
+        with blackboard.transaction() as transaction:
+            transaction.set("x", 0.0)
+            raise ValueError("failed")
+    nose.tools.assert_raises(ValueError, failing_transaction)
+    assert(blackboard.x == 3.0)
+    assert(len(batches) == 1)
+    blackboard.unsubscribe(subscription)
+
+
+def test_freeze():
+    console.banner("Freeze")
+    py_trees.blackboard.Blackboard.clear()
+    blackboard = create_blackboard()
+    batches = []
+    subscription = blackboard.subscribe(batches.append)
+    nested = blackboard.accessor("foobar.foo")
+    blackboard.freeze()
+    assert(blackboard.frozen())
+    blackboard.foo = "baz"
+    blackboard.unset("some_tuple")
+    nested.set("baz")
+    with blackboard.transaction() as transaction:
+        transaction.set("x", 1)
+    writer = threading.Thread(target=blackboard.set, args=("y", 2))
+    writer.start()
+    writer.join()
+    print(" - Assert reads see the frozen view")
+    assert(blackboard.foo == "bar")
+    assert(blackboard.exists("some_tuple"))
+    assert(blackboard.foobar.foo == "bar")
+    assert(not blackboard.exists("x"))
+    assert(not blackboard.exists("y"))
+    assert(batches == [])
+    blackboard.thaw()
+    print(" - Assert the writes were committed on thawing, in one batch")
+    assert(not blackboard.frozen())
+    assert(blackboard.foo == "baz")
+    assert(not blackboard.exists("some_tuple"))
+    assert(blackboard.foobar.foo == "baz")
+    assert(blackboard.x == 1 and blackboard.y == 2)
+    assert(len(batches) == 1)
+    assert([c.key for c in batches[0]] == ["foo", "some_tuple", "foobar", "x", "y"])
+    blackboard.unsubscribe(subscription)
+
+    print(" - Assert frozen scopes don't see their parent's writes")
+    parent = py_trees.blackboard.Blackboard.create("parent")
+    parent.foo = "bar"
+    scope = py_trees.blackboard.Blackboard.create("scope", parent=parent)
+    scope.freeze()
+    parent.foo = "baz"
+    parent.set("bar", "foo")
+    parent.unset("foo")
+    assert(parent.get("bar") == "foo" and not parent.exists("foo"))
+    assert(scope.get("foo") == "bar" and not scope.exists("bar"))
+    version = scope.version("foo")
+    scope.thaw()
+    print(" - Assert they catch up on thawing")
+    assert(not scope.exists("foo") and scope.get("bar") == "foo")
+    assert(scope.version("foo") > version)
+    print(" - Assert compare and sets are deferred, then compared again")
+    for stripes in (0, 4):
+        blackboard = py_trees.blackboard.Blackboard.create("compare", stripes=stripes)
+        blackboard.count = 0
+        blackboard.freeze()
+        assert(blackboard.compare_and_set("count", 0, 1))
+        assert(blackboard.compare_and_set("count", 0, 2))
+        assert(blackboard.setdefault("limit", 3) == 3)
+        assert(blackboard.count == 0 and not blackboard.exists("limit"))
+        blackboard.thaw()
+        assert(blackboard.count == 1 and blackboard.limit == 3)
+
+
+def test_tick_snapshots():
+    console.banner("Tick Snapshots")
+    blackboard = py_trees.blackboard.Blackboard.create("snapshots")
+    blackboard.foo = "bar"
+    root = py_trees.composites.Sequence("Sequence")
+    set_foo = py_trees.blackboard.SetBlackboardVariable(
+        name="Set Foo", variable_name="foo", variable_value="baz")
+    check_foo = py_trees.blackboard.CheckBlackboardVariable(
+        name="Check Foo", variable_name="foo", expected_value="bar")
+    root.add_children([set_foo, check_foo])
+    tree = py_trees.trees.BehaviourTree(root, blackboard=blackboard)
+    tree.snapshot_blackboard = True
+    seen = []
+    tree.add_post_tick_handler(lambda tree: seen.append(tree.blackboard.foo))
+    tree.tick()
+    print(" - Assert the check saw the value from the start of the tick")
+    assert(check_foo.status == Status.SUCCESS)
+    print(" - Assert the write was committed before the post tick handlers")
+    assert(seen == ["baz"])
+    assert(not blackboard.frozen())
+    tree.tick()
+    assert(check_foo.status == Status.FAILURE)
+
+
+def test_expiry():
+    console.banner("Expiry")
+    ttl = 0.05
+    parent = py_trees.blackboard.Blackboard.create("expiry")
+    blackboard = py_trees.blackboard.Blackboard.create("expiry_child", parent=parent)
+    changes = []
+    blackboard.subscribe(changes.extend)
+    parent.foo = "parent"
+    blackboard.set("foo", "child", ttl=ttl)
+    blackboard.set("bar", "bar", ttl=ttl)
+    blackboard.set("rewritten", 1, ttl=ttl)
+    blackboard.rewritten = 2
+    accessor = blackboard.accessor("bar")
+    check = py_trees.blackboard.CheckBlackboardVariable(
+        name="Check Bar", variable_name="bar", expected_value="bar")
+    check.blackboard_scope = blackboard
+    check.tick_once()
+    print(" - Assert variables live until their deadline")
+    assert(blackboard.foo == "child")
+    assert(accessor.get() == "bar")
+    assert(check.status == Status.SUCCESS)
+    time.sleep(2 * ttl)
+    print(" - Assert expired variables are gone")
+    version = blackboard.version("bar")
+    assert(not accessor.exists())
+    assert(not blackboard.exists("bar"))
+    assert(accessor.version() == version)
+    check.tick_once()
+    assert(check.status == Status.FAILURE)
+    print(" - Assert expiring uncovers the enclosing scope")
+    assert(blackboard.foo == "parent")
+    print(" - Assert rewriting without a ttl keeps the variable")
+    assert(blackboard.rewritten == 2)
+    print(" - Assert subscribers were told of the expiries")
+    expired = [c.key for c in changes if c.operation == py_trees.common.BlackboardOperation.EXPIRE]
+    assert(expired == ["bar"])
+    assert([(c.key, c.value) for c in changes][-2:].count(("foo", "parent")) == 1)
+    print(" - Assert expiry waits for a frozen blackboard")
+    blackboard.set("bar", "bar", ttl=ttl)
+    blackboard.freeze()
+    time.sleep(2 * ttl)
+    blackboard.expire()
+    assert(blackboard.bar == "bar")
+    blackboard.thaw()
+    assert(not blackboard.exists("bar"))
+    print(" - Assert transactions and behaviours can set a ttl")
+    with blackboard.transaction() as transaction:
+        transaction.set("x", 1, ttl=ttl)
+    setter = py_trees.blackboard.SetBlackboardVariable(
+        name="Set Y", variable_name="y", variable_value=2, ttl=ttl)
+    setter.blackboard_scope = blackboard
+    setter.tick_once()
+    assert(blackboard.x == 1 and blackboard.y == 2)
+    time.sleep(2 * ttl)
+    with blackboard.transaction() as transaction:
+        assert(transaction.get("x") is None)
+    assert(sorted(blackboard.keys()) == ["foo", "rewritten"])
+    print(" - Assert attributes cannot have a ttl")
+    nose.tools.assert_raises(ValueError, blackboard.accessor("foo.bar").set, 1, ttl)
+
+
+def test_activity_log():
+    console.banner("Activity Log")
+    set_foo = py_trees.blackboard.SetBlackboardVariable(
+        name="Set Foo", variable_name="foo", variable_value="foo")
+    clear_foo = py_trees.blackboard.ClearBlackboardVariable(
+        name="Clear Foo", variable_name="foo")
+    root = py_trees.composites.Sequence("Root", children=[set_foo, clear_foo])
+    blackboard = py_trees.blackboard.Blackboard.create("activity")
+    scope = py_trees.blackboard.Blackboard.create("activity_scope", parent=blackboard)
+    print(" - Assert logging is disabled by default")
+    assert(blackboard.activity_log() is None)
+    activity = blackboard.enable_activity_log(size=4)
+    assert(scope.activity_log() is activity)
+    for engine in [None, py_trees.trees.FlatTickEngine()]:
+        tree = py_trees.trees.BehaviourTree(root, engine=engine, blackboard=blackboard)
+        tree.setup(timeout=1)
+        activity.clear()
+        tree.tick()
+        tree.tick()
+        blackboard.bar = 1
+        for entry in activity.entries():
+            print("  %s" % (entry,))
+        print(" - Assert writes are attributed to behaviours and ticks [%s]" % type(engine).__name__)
+        assert([(a.key, a.operation, a.behaviour, a.tick) for a in activity.entries()] == [
+            ("foo", py_trees.common.BlackboardOperation.SET, set_foo.id, 0),
+            ("foo", py_trees.common.BlackboardOperation.UNSET, clear_foo.id, 0),
+            ("foo", py_trees.common.BlackboardOperation.SET, set_foo.id, 1),
+            ("foo", py_trees.common.BlackboardOperation.UNSET, clear_foo.id, 1),
+        ][1:] + [("bar", py_trees.common.BlackboardOperation.SET, None, 1)])
+    print(" - Assert the ring buffer kept the most recent entries")
+    assert(len(activity) == 4 and activity.recorded == 5)
+    print(" - Assert deferred writes are attributed to their writer")
+    activity.clear()
+    tree.snapshot_blackboard = True
+    tree.tick()
+    assert([(a.behaviour, a.tick) for a in activity.entries()] == [(set_foo.id, 2)])
+    print(" - Assert writes to enclosed scopes are logged")
+    scope.set("baz", 1, ttl=0.0)
+    scope.expire()
+    assert([(a.key, a.operation) for a in activity.entries()[-2:]] == [
+        ("baz", py_trees.common.BlackboardOperation.SET),
+        ("baz", py_trees.common.BlackboardOperation.EXPIRE)])
+    print(" - Assert dumps are read back")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "activity.bin")
+        activity.dump(path, binary=True)
+        assert(py_trees.blackboard.ActivityLog.load(path) == activity.entries())
+        path = os.path.join(directory, "activity.jsonl")
+        activity.dump(path)
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        assert([line["key"] for line in lines] == [a.key for a in activity.entries()])
+        assert(lines[0]["behaviour"] == str(set_foo.id))
+        assert(lines[-1]["operation"] == "EXPIRE")
+    finally:
+        shutil.rmtree(directory)
+    print(" - Assert disabling stops recording")
+    blackboard.disable_activity_log()
+    scope.bar = 2
+    assert(scope.activity_log() is None)
+    assert(activity.entries()[-1].key == "baz")
+
+
+def test_activity_log_writers():
+    console.banner("Activity Log Writers")
+    blackboard = py_trees.blackboard.Blackboard.create("activity_writers")
+    activity = blackboard.enable_activity_log(size=8)
+    writer = Writer("Writer", "written", blackboard)
+    threaded = Writer("Threaded", "threaded", blackboard, threaded=True)
+    root = Tally("Tally", children=[writer, threaded])
+    for engine in [None, py_trees.trees.FlatTickEngine()]:
+        tree = py_trees.trees.BehaviourTree(root, engine=engine, blackboard=blackboard)
+        tree.setup(timeout=1)
+        activity.clear()
+        tree.tick()
+        for entry in activity.entries():
+            print("  %s" % (entry,))
+        print(" - Assert composites are writers once their children are done [%s]" % type(engine).__name__)
+        print(" - Assert writes from other threads are not attributed to the ticking behaviour")
+        assert([(a.key, a.behaviour) for a in activity.entries()] == [
+            ("written", writer.id), ("threaded", None), ("tally", root.id)])
+        print(" - Assert nothing is ticking after the tick")
+        assert(py_trees.behaviour.ticking() is None)
+    if py_trees.composites.concurrent is None:
+        return
+    print(" - Assert concurrent updates are attributed to their behaviours")
+    first = Writer("First", "first", blackboard)
+    second = Writer("Second", "second", blackboard)
+    parallel = py_trees.composites.ConcurrentParallel("Parallel", children=[first, second])
+    activity.clear()
+    try:
+        parallel.tick_once()
+    finally:
+        parallel.shutdown()
+    assert(sorted((a.key, a.behaviour) for a in activity.entries()) == [
+        ("first", first.id), ("second", second.id)])
+
+
+def test_locking():
+    console.banner("Locking")
+    blackboard = py_trees.blackboard.Blackboard.create("locking", stripes=8)
+    scope = py_trees.blackboard.Blackboard.create("scope", parent=blackboard)
+    print(" - Assert compare and set")
+    assert(blackboard.compare_and_set("count", 0, 1) is False)
+    blackboard.count = 0
+    assert(blackboard.compare_and_set("count", 0, 1))
+    assert(not blackboard.compare_and_set("count", 0, 2))
+    assert(blackboard.count == 1)
+    nose.tools.assert_raises(ValueError, blackboard.accessor("count.real").compare_and_set, 1, 2)
+    print(" - Assert set default")
+    assert(blackboard.setdefault("limit", 3) == 3)
+    assert(blackboard.setdefault("limit", 4) == 3)
+    print(" - Assert scopes share the locking")
+    assert(scope.count == 1)
+    scope.count = 5
+    assert(scope.accessor("count").get() == 5)
+    print(" - Assert transactions and freezing work on locking blackboards")
+    with blackboard.transaction() as transaction:
+        transaction.set("x", 1)
+        transaction.set("y", 2)
+    blackboard.freeze()
+    blackboard.x = 3
+    assert(blackboard.x == 1)
+    blackboard.thaw()
+    assert(blackboard.x == 3 and blackboard.y == 2)
+    print(" - Assert concurrent increments are not lost")
+    count = blackboard.accessor("count")
+    count.set(0)
+
+    def increment(times):
+        for unused_i in range(times):
+            while True:
+                value = count.get()
+                if count.compare_and_set(value, value + 1):
+                    break
+    threads = [threading.Thread(target=increment, args=(200,)) for unused_i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print("  count: %s" % count.get())
+    assert(count.get() == 16 * 200)
+
+
+def test_locking_benchmark():
+    console.banner("Locking Benchmark")
+    writes = 2000
+
+    def contend(stripes, writers):
+        blackboard = py_trees.blackboard.Blackboard.create("benchmark", stripes=stripes)
+        blackboard.unrelated = 0
+        reader = blackboard.accessor("unrelated")
+        accessors = [blackboard.accessor("writer_%s" % i) for i in range(writers)]
+        reads = [0]
+        done = threading.Event()
+
+        def write(accessor):
+            for i in range(writes):
+                accessor.set(i)
+
+        def read():
+            while not done.is_set():
+                reader.get()
+                reads[0] += 1
+        threads = [threading.Thread(target=write, args=(accessor,)) for accessor in accessors]
+        reading = threading.Thread(target=read)
+        start = timeit.default_timer()
+        reading.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = timeit.default_timer() - start
+        done.set()
+        reading.join()
+        for accessor in accessors:
+            assert(accessor.get() == writes - 1)
+        return writers * writes / duration, reads[0] / duration
+
+    print("%-8s %-8s %14s %14s" % ("writers", "stripes", "writes/s", "reads/s"))
+    for writers in (1, 4, 16):
+        for stripes in (0, 1, 16):
+            write_rate, read_rate = contend(stripes, writers)
+            print("%-8s %-8s %14.0f %14.0f" % (writers, stripes, write_rate, read_rate))
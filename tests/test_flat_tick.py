@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import timeit
+
+import py_trees
+import py_trees.console as console
+
+from py_trees.common import Status
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class RecordingVisitor(py_trees.visitors.VisitorBase):
+    def __init__(self):
+        super(RecordingVisitor, self).__init__(full=False)
+        self.visited = []
+
+    def initialise(self):
+        self.visited = []
+
+    def run(self, behaviour):
+        self.visited.append((behaviour.name, behaviour.status))
+
+
+def create_tree():
+    """
+    A tree with one of everything, so that both tick engines get a workout.
+    """
+    root = py_trees.composites.Selector("Root")
+    chooser = py_trees.composites.Chooser("Chooser")
+    chooser.add_children([
+        py_trees.behaviours.Count(name="Chooser A", fail_until=2, running_until=4, success_until=5),
+        py_trees.behaviours.Count(name="Chooser B", fail_until=0, running_until=3, success_until=4)
+    ])
+    parallel = py_trees.composites.Parallel("Parallel", policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE)
+    parallel.add_children([
+        py_trees.behaviours.Periodic(name="Periodic", n=2),
+        py_trees.behaviours.SuccessEveryN(name="Every 3", n=3),
+        py_trees.decorators.Inverter(py_trees.behaviours.Count(name="Inverted", fail_until=1, running_until=2, success_until=3))
+    ])
+    sequence = py_trees.composites.Sequence("Sequence")
+    sequence.add_children([
+        py_trees.decorators.OneShot(py_trees.behaviours.Count(name="Oneshot", fail_until=0, running_until=1, success_until=10)),
+        py_trees.meta.inverter(py_trees.behaviours.Failure)(name="Imposter"),
+        py_trees.decorators.Condition(py_trees.behaviours.Count(name="Condition", fail_until=1, running_until=2, success_until=20)),
+        py_trees.decorators.Timeout(py_trees.behaviours.Running(name="Timeout Child"), duration=1000.0),
+    ])
+    oneshot_sequence = py_trees.behaviours.OneshotSequence(name="Oneshot Sequence")
+    oneshot_sequence.add_child(py_trees.behaviours.Count(name="Inner", fail_until=0, running_until=2, success_until=10))
+    root.add_children([
+        py_trees.behaviours.Count(name="High Priority", fail_until=6, running_until=8, success_until=9),
+        chooser,
+        parallel,
+        oneshot_sequence,
+        sequence,
+        py_trees.behaviours.Running(name="Idle")
+    ])
+    return root
+
+
+def create_big_tree(branching=10, depth=4):
+    """
+    A full tree with branching ** depth success leaves under sequences.
+    """
+    def create_subtree(level):
+        if level == depth:
+            return py_trees.behaviours.Success(name="Leaf")
+        sequence = py_trees.composites.Sequence(name="Sequence")
+        for unused_i in range(branching):
+            sequence.add_child(create_subtree(level + 1))
+        return sequence
+    return create_subtree(0)
+
+
+def summary(root):
+    return [(node.name, node.status, node.feedback_message) for node in root.iterate()]
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_flat_tick_matches_generator_tick():
+    console.banner("Flat Tick Engine vs Generator Tick")
+    generator_tree = py_trees.trees.BehaviourTree(create_tree())
+    flat_tree = py_trees.trees.BehaviourTree(create_tree(), engine=py_trees.trees.FlatTickEngine())
+    generator_visitor = RecordingVisitor()
+    flat_visitor = RecordingVisitor()
+    generator_tree.visitors.append(generator_visitor)
+    flat_tree.visitors.append(flat_visitor)
+    for i in range(1, 21):
+        generator_tree.tick()
+        flat_tree.tick()
+        print("Tick %s: %s" % (i, flat_tree.root.status))
+        assert(generator_visitor.visited == flat_visitor.visited)
+        assert(summary(generator_tree.root) == summary(flat_tree.root))
+
+
+def test_flat_tick_with_modifications():
+    console.banner("Flat Tick Engine with Tree Modifications")
+    root = py_trees.composites.Sequence("Sequence")
+    a = py_trees.behaviours.Count(name="A", fail_until=0, running_until=1, success_until=10)
+    b = py_trees.behaviours.Count(name="B", fail_until=0, running_until=1, success_until=10)
+    root.add_children([a, b])
+    tree = py_trees.trees.BehaviourTree(root, engine=py_trees.trees.FlatTickEngine())
+    tree.tick()
+    print("a.status == py_trees.Status.RUNNING")
+    assert(a.status == Status.RUNNING)
+    tree.tick()
+    print("b.status == py_trees.Status.RUNNING")
+    assert(b.status == Status.RUNNING)
+    c = py_trees.behaviours.Failure(name="C")
+    tree.insert_subtree(c, root.id, 2)
+    tree.tick()
+    print("c.status == py_trees.Status.FAILURE")
+    assert(c.status == Status.FAILURE)
+    print("root.status == py_trees.Status.FAILURE")
+    assert(root.status == Status.FAILURE)
+
+
+def test_flat_tick_benchmark():
+    console.banner("Flat Tick Engine Benchmark")
+    generator_tree = py_trees.trees.BehaviourTree(create_big_tree())
+    flat_tree = py_trees.trees.BehaviourTree(create_big_tree(), engine=py_trees.trees.FlatTickEngine())
+    number_of_nodes = len(list(flat_tree.root.iterate()))
+    generator_time = min(timeit.repeat(generator_tree.tick, number=1, repeat=5))
+    flat_time = min(timeit.repeat(flat_tree.tick, number=1, repeat=5))
+    print("Nodes          : %s" % number_of_nodes)
+    print("Generator Tick : %.2fms" % (1000 * generator_time))
+    print("Flat Tick      : %.2fms" % (1000 * flat_time))
+    print("Speedup        : %.2fx" % (generator_time / flat_time))
+    assert(summary(generator_tree.root) == summary(flat_tree.root))
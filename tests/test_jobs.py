@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import nose
+import threading
+import time
+
+import py_trees
+import py_trees.console as console
+
+from py_trees.common import Status
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+def plan(duration, progress=None):
+    """
+    Module level so that process pools can pickle it.
+    """
+    steps = 4
+    for i in range(steps):
+        time.sleep(duration / steps)
+        if progress is not None:
+            progress("%s%%" % (100 * (i + 1) // steps))
+    return "planned"
+
+
+def fail():
+    raise RuntimeError("no plan")
+
+
+def wait_until_done(behaviour, timeout=5.0):
+    statuses = []
+    start = time.time()
+    while time.time() - start < timeout:
+        behaviour.tick_once()
+        statuses.append(behaviour.status)
+        if behaviour.status != Status.RUNNING:
+            break
+        time.sleep(0.01)
+    return statuses
+
+
+def skip_without_futures():
+    if py_trees.behaviours.concurrent is None:
+        raise nose.SkipTest("concurrent.futures is not available")
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_job_results():
+    console.banner("Job Results")
+    skip_without_futures()
+    job = py_trees.behaviours.Job(name="Plan", function=plan, args=(0.05,), report_progress=True)
+    statuses = wait_until_done(job)
+    print("statuses: %s" % statuses)
+    print("running until done, then success")
+    assert(statuses[0] == Status.RUNNING)
+    assert(statuses[-1] == Status.SUCCESS)
+    assert(job.result == "planned")
+    print("progress was reported")
+    assert(job.progress == "100%")
+
+    job = py_trees.behaviours.Job(name="Fail", function=fail)
+    statuses = wait_until_done(job)
+    print("exceptions are failures: %s" % job.feedback_message)
+    assert(statuses[-1] == Status.FAILURE)
+    assert(isinstance(job.exception, RuntimeError))
+
+    job = py_trees.behaviours.Job(name="False", function=lambda: False)
+    assert(wait_until_done(job)[-1] == Status.FAILURE)
+    job = py_trees.behaviours.Job(name="Status", function=lambda: Status.FAILURE)
+    assert(wait_until_done(job)[-1] == Status.FAILURE)
+
+    print("jobs returning running are submitted again")
+    calls = []
+
+    def poll():
+        calls.append(time.time())
+        return Status.RUNNING if len(calls) < 3 else Status.SUCCESS
+
+    job = py_trees.behaviours.Job(name="Poll", function=poll)
+    assert(wait_until_done(job)[-1] == Status.SUCCESS)
+    assert(len(calls) == 3)
+
+
+def test_job_cancellation():
+    console.banner("Job Cancellation")
+    skip_without_futures()
+    tree = py_trees.trees.BehaviourTree(py_trees.composites.Selector("Root"))
+    tree.setup_job_pool(max_workers=1)
+    blocker = threading.Event()
+    busy = py_trees.behaviours.Job(name="Busy", function=blocker.wait, args=(5.0,))
+    queued = py_trees.behaviours.Job(name="Queued", function=plan, args=(0.0,))
+    parallel = py_trees.composites.Parallel("Parallel", children=[busy, queued])
+    tree.root.add_child(parallel)
+    tree.tick()
+    print("jobs run on the tree's pool")
+    assert(busy.future is not None and queued.future is not None)
+    time.sleep(0.05)
+    tree.tick()
+    print("queued: %s" % queued.feedback_message)
+    assert(queued.feedback_message == "queued")
+    assert(busy.feedback_message.startswith("running"))
+    queued_future = queued.future
+    busy_future = busy.future
+    parallel.stop(Status.INVALID)
+    print("queued jobs are cancelled, running jobs abandoned")
+    assert(queued_future.cancelled())
+    assert(queued.feedback_message == "cancelled")
+    assert(busy.feedback_message == "abandoned")
+    assert(not busy_future.cancelled())
+    blocker.set()
+    tree.shutdown_job_pool()
+    assert(tree.job_pool is None)
+
+
+def test_job_process_pool():
+    console.banner("Job Process Pool")
+    skip_without_futures()
+    tree = py_trees.trees.BehaviourTree(py_trees.composites.Sequence("Root"))
+    tree.setup_job_pool(max_workers=2, processes=True)
+    job = py_trees.behaviours.Job(name="Plan", function=plan, args=(0.05,), report_progress=True)
+    tree.root.add_child(job)
+    try:
+        for unused_i in range(500):
+            tree.tick()
+            if job.status != Status.RUNNING:
+                break
+            time.sleep(0.01)
+    finally:
+        tree.shutdown_job_pool()
+    print("result: %s, progress: %s" % (job.result, job.progress))
+    assert(job.status == Status.SUCCESS)
+    assert(job.result == "planned")
+    assert(job.progress == "100%")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import logging
+import timeit
+
+import py_trees
+import py_trees.console as console
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class CountingFormat(object):
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return "formatted"
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append((record.levelno, record.getMessage()))
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_deferred_formatting():
+    console.banner("Deferred Formatting")
+    argument = CountingFormat()
+    logger = py_trees.logging.Logger("Deferred")
+    py_trees.logging.level = py_trees.logging.Level.INFO
+    logger.debug("%s.tick()", argument)
+    print("disabled levels do not format")
+    assert(argument.count == 0)
+    py_trees.logging.level = py_trees.logging.Level.DEBUG
+    logger.debug("%s.tick()", argument)
+    print("enabled levels format")
+    assert(argument.count == 1)
+    py_trees.logging.level = py_trees.logging.Level.ERROR
+    logger.info("%s", argument)
+    logger.warning("%s", argument)
+    assert(argument.count == 1)
+    logger.error("%s", argument)
+    assert(argument.count == 2)
+    py_trees.logging.level = py_trees.logging.Level.INFO
+
+
+def test_python_logging_bridge():
+    console.banner("Python Logging Bridge")
+    handler = RecordingHandler()
+    python_logger = py_trees.logging.bridge_to_python_logging("py_trees.test")
+    python_logger.addHandler(handler)
+    python_logger.setLevel(logging.DEBUG)
+    python_logger.propagate = False
+    try:
+        py_trees.logging.level = py_trees.logging.Level.DEBUG
+        root = py_trees.composites.Sequence("100% Sequence")
+        root.add_child(py_trees.behaviours.Success("Success"))
+        root.tick_once()
+        py_trees.logging.level = py_trees.logging.Level.INFO
+        root.logger.debug("%s", "dropped")
+        root.logger.warning("%s.warning()[%s]", "Sequence", 42)
+        root.logger.info("no args, 50% literal")
+    finally:
+        py_trees.logging.unbridge_from_python_logging()
+        py_trees.logging.level = py_trees.logging.Level.INFO
+    for (unused_level, message) in handler.messages:
+        print(message)
+    print("messages reach the python logger")
+    assert((logging.DEBUG, "100% Sequence        : Sequence.tick()") in handler.messages)
+    assert((logging.DEBUG, "Success              : Success.update()") in handler.messages)
+    print("py_trees level still applies")
+    assert(not any("dropped" in message for (unused_level, message) in handler.messages))
+    assert(handler.messages[-2] == (logging.WARNING, "100% Sequence        : Sequence.warning()[42]"))
+    print("messages without arguments are not formatted")
+    assert(handler.messages[-1] == (logging.INFO, "100% Sequence        : no args, 50% literal"))
+
+
+def test_disabled_logging_benchmark():
+    console.banner("Disabled Logging Benchmark")
+    logger = py_trees.logging.Logger("Benchmark")
+    py_trees.logging.level = py_trees.logging.Level.INFO
+    number = 100000
+    eager_time = min(timeit.repeat(lambda: "%s.tick()[%s]" % ("Benchmark", py_trees.common.Status.RUNNING), number=number, repeat=3))
+    lazy_time = min(timeit.repeat(lambda: logger.debug("%s.tick()[%s]", "Benchmark", py_trees.common.Status.RUNNING), number=number, repeat=3))
+    print("Eager formatting only : %.3fus" % (1000000 * eager_time / number))
+    print("Disabled debug call   : %.3fus" % (1000000 * lazy_time / number))
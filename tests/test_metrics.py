@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import nose.tools
+import os
+import shutil
+import tempfile
+
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen  # python2
+
+import py_trees
+import py_trees.console as console
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+def create_tree():
+    work = py_trees.composites.Sequence(name="Work")
+    work.add_children([
+        py_trees.behaviours.Count(name="Step", fail_until=0, running_until=2, success_until=100),
+        py_trees.behaviours.Count(name="Step", fail_until=0, running_until=4, success_until=100)
+    ])
+    root = py_trees.composites.Selector(name="Root")
+    root.add_children([
+        py_trees.behaviours.Count(name="Guard", fail_until=3, running_until=3, success_until=5, reset=True),
+        work
+    ])
+    return root
+
+
+def samples(exposition):
+    """
+    Parse the samples of a Prometheus exposition into a dictionary.
+    """
+    parsed = {}
+    for line in exposition.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            parsed[name] = float(value)
+    return parsed
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_status_counters():
+    console.banner("Status Counters")
+    tree = py_trees.trees.BehaviourTree(create_tree())
+    metrics = py_trees.metrics.MetricsCollector(tree, name="robot")
+    tallies = {}
+    snapshot_visitor = py_trees.visitors.SnapshotVisitor()
+    tree.visitors.append(snapshot_visitor)
+    for unused_i in range(20):
+        tree.tick()
+        # tally what was traversed in this tick
+        for node in tree.root.iterate():
+            if node.id in snapshot_visitor.nodes:
+                counts = tallies.setdefault(node.id, {})
+                counts[node.status] = counts.get(node.status, 0) + 1
+    exposition = metrics.exposition()
+    print(exposition)
+    print(" - Assert the counters match the traversals")
+    for node in tree.root.iterate():
+        expected = tallies.get(node.id, {})
+        counted = metrics.statuses(node)
+        for status in py_trees.common.Status:
+            assert(counted[status] == expected.get(status, 0))
+    parsed = samples(exposition)
+    assert(parsed['py_trees_ticks_total{tree="robot"}'] == 20)
+    assert(parsed['py_trees_behaviour_ticks_total{tree="robot",behaviour="Root/Guard",status="FAILURE"}'] ==
+           metrics.statuses(tree.root.children[0])[py_trees.common.Status.FAILURE])
+    print(" - Assert behaviours with the same path get distinct labels")
+    assert('py_trees_behaviour_ticks_total{tree="robot",behaviour="Root/Work/Step",status="SUCCESS"}' in parsed)
+    assert('py_trees_behaviour_ticks_total{tree="robot",behaviour="Root/Work/Step[2]",status="SUCCESS"}' in parsed)
+    print(" - Assert the tick histogram is cumulative and complete")
+    buckets = [parsed['py_trees_tick_duration_seconds_bucket{tree="robot",le="%r"}' % bound]
+               for bound in py_trees.metrics.DEFAULT_BUCKETS]
+    assert(buckets == sorted(buckets))
+    assert(parsed['py_trees_tick_duration_seconds_bucket{tree="robot",le="+Inf"}'] == 20)
+    assert(parsed['py_trees_tick_duration_seconds_count{tree="robot"}'] == 20)
+    assert(parsed['py_trees_tick_duration_seconds_sum{tree="robot"}'] > 0.0)
+    metrics.close()
+    tree.tick()
+    assert(metrics.ticks == 20)
+
+
+def test_behaviour_timing():
+    console.banner("Behaviour Timing")
+    tree = py_trees.trees.BehaviourTree(create_tree())
+    metrics = py_trees.metrics.MetricsCollector(tree, buckets=[0.001, 0.01], time_behaviours=True)
+    for unused_i in range(10):
+        tree.tick()
+    parsed = samples(metrics.exposition())
+    print(" - Assert updates after the first tick were timed")
+    guard = 'tree="Root",behaviour="Root/Guard"'
+    assert(parsed['py_trees_behaviour_update_duration_seconds_count{%s}' % guard] == 9)
+    assert(parsed['py_trees_behaviour_update_duration_seconds_bucket{%s,le="+Inf"}' % guard] == 9)
+    print(" - Assert closing restores the behaviours")
+    metrics.close()
+    assert(all('update' not in node.__dict__ for node in tree.root.iterate()))
+
+
+def test_closing_order():
+    console.banner("Closing Order")
+    update_count = 'py_trees_behaviour_update_duration_seconds_count{tree="Root",behaviour="Root/Guard"}'
+    for metrics_first in [True, False]:
+        tree = py_trees.trees.BehaviourTree(create_tree())
+        metrics = py_trees.metrics.MetricsCollector(tree, time_behaviours=True)
+        tree.tick()
+        profiler = py_trees.visitors.ProfilingVisitor()
+        tree.visitors.append(profiler)
+        profiler.instrument(tree.root)
+        tree.tick()
+        tree.tick()
+        updates = samples(metrics.exposition())[update_count]
+        ticks = profiler.profiles[tree.root.id].ticks
+        print(" - Assert the other wrappers keep working after closing %s first" % (
+            "the metrics" if metrics_first else "the profiler"))
+        if metrics_first:
+            metrics.close()
+        else:
+            profiler.uninstrument()
+            tree.visitors.remove(profiler)
+        tree.tick()
+        tree.tick()
+        if metrics_first:
+            assert(profiler.profiles[tree.root.id].ticks == ticks + 2)
+            profiler.uninstrument()
+            tree.visitors.remove(profiler)
+        else:
+            assert(samples(metrics.exposition())[update_count] == updates + 2)
+            metrics.close()
+        print(" - Assert closing both restores the behaviours")
+        for node in tree.root.iterate():
+            assert(not set(['initialise', 'update', 'terminate', 'tick']) & set(node.__dict__))
+
+
+def test_exporters():
+    console.banner("Exporters")
+    tree = py_trees.trees.BehaviourTree(create_tree())
+    metrics = py_trees.metrics.MetricsCollector(tree)
+    tree.tick()
+    directory = tempfile.mkdtemp()
+    try:
+        print(" - Assert the metrics can be dumped to a file")
+        path = os.path.join(directory, "py_trees.prom")
+        metrics.dump(path)
+        with open(path) as f:
+            assert(f.read() == metrics.exposition())
+        assert(os.listdir(directory) == ["py_trees.prom"])
+    finally:
+        shutil.rmtree(directory)
+    print(" - Assert the metrics are served over http")
+    port = metrics.serve(port=0)
+    nose.tools.assert_raises(RuntimeError, metrics.serve, 0)
+    tree.tick()
+    response = urlopen("http://127.0.0.1:%s/metrics" % port, timeout=5.0)
+    assert(response.getcode() == 200)
+    assert(response.headers.get("Content-Type").startswith("text/plain; version=0.0.4"))
+    body = response.read().decode("utf-8")
+    assert(samples(body)['py_trees_ticks_total{tree="Root"}'] == 2)
+    metrics.close()
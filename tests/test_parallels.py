@@ -12,9 +12,16 @@
 # (unicode_literals not compatible with python2 uuid module)
 from __future__ import absolute_import, print_function
 
+import nose.tools
+import threading
+import time
+import timeit
+
 import py_trees
 import py_trees.console as console
 
+from py_trees.common import Status
+
 ##############################################################################
 # Logging Level
 ##############################################################################
@@ -22,6 +29,40 @@ import py_trees.console as console
 py_trees.logging.level = py_trees.logging.Level.DEBUG
 logger = py_trees.logging.Logger("Nosetest")
 
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class Block(py_trees.behaviour.Behaviour):
+    """
+    Blocks in update for the specified duration, then returns the specified status.
+    """
+    def __init__(self, name="Block", duration=0.05, status=Status.SUCCESS):
+        super(Block, self).__init__(name)
+        self.duration = duration
+        self.result = status
+        self.threads = set()
+
+    def update(self):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.duration)
+        return self.result
+
+
+class RecordingVisitor(py_trees.visitors.VisitorBase):
+    def __init__(self):
+        super(RecordingVisitor, self).__init__(full=False)
+        self.visited = []
+
+    def run(self, behaviour):
+        self.visited.append(behaviour.name)
+
+
+def skip_without_futures():
+    if py_trees.composites.concurrent is None:
+        raise nose.SkipTest("concurrent.futures is not available")
+
 ##############################################################################
 # Tests
 ##############################################################################
@@ -142,3 +183,92 @@ def test_parallel_success_on_one():
     print("running2.status == py_trees.Status.INVALID")
     assert(running2.status == py_trees.Status.INVALID)
 
+
+def test_concurrent_parallel():
+    console.banner("Concurrent Parallel")
+    skip_without_futures()
+    root = py_trees.composites.ConcurrentParallel("Parallel")
+    blocks = [Block("Block %s" % i, duration=0.05) for i in range(4)]
+    sequence = py_trees.composites.Sequence("Sequence", children=[py_trees.behaviours.Success("Success")])
+    root.add_children(blocks + [sequence])
+    start = timeit.default_timer()
+    root.tick_once()
+    elapsed = timeit.default_timer() - start
+    print("Elapsed: %.3fs" % elapsed)
+    print("root.status == Status.SUCCESS")
+    assert(root.status == Status.SUCCESS)
+    print("updates ran concurrently on the executor")
+    assert(elapsed < 0.15)
+    assert(all(block.status == Status.SUCCESS for block in blocks))
+    assert(all(threading.current_thread().name not in block.threads for block in blocks))
+    print("composites ticked on the ticking thread")
+    assert(sequence.status == Status.SUCCESS)
+    root.shutdown()
+
+
+def test_concurrent_parallel_policy():
+    console.banner("Concurrent Parallel Policy")
+    skip_without_futures()
+    root = py_trees.composites.ConcurrentParallel("Parallel", policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE)
+    running = Block("Running", duration=0.01, status=Status.RUNNING)
+    success = Block("Success", duration=0.01, status=Status.SUCCESS)
+    root.add_children([running, success])
+    visitor = RecordingVisitor()
+    tree = py_trees.trees.BehaviourTree(root)
+    tree.visitors.append(visitor)
+    tree.tick()
+    print("root.status == Status.SUCCESS")
+    assert(root.status == Status.SUCCESS)
+    print("running child was stopped")
+    assert(running.status == Status.INVALID)
+    print("visitors see every child")
+    assert(sorted(visitor.visited) == ["Parallel", "Running", "Success"])
+    root.shutdown()
+
+
+def test_concurrent_parallel_timeout_and_cancel():
+    console.banner("Concurrent Parallel Timeout and Cancel")
+    skip_without_futures()
+    root = py_trees.composites.ConcurrentParallel("Parallel", timeout=0.01)
+    slow = Block("Slow", duration=0.2)
+    fast = Block("Fast", duration=0.0)
+    root.add_children([slow, fast])
+    root.tick_once()
+    print("slow child is still running after the timeout")
+    assert(slow.status == Status.RUNNING)
+    assert(fast.status == Status.SUCCESS)
+    assert(root.status == Status.RUNNING)
+    assert(slow.id in root.pending)
+    future = root.pending[slow.id]
+    root.tick_once()
+    print("the pending update is joined, not resubmitted")
+    assert(len(slow.threads) == 1)
+    assert(future is root.pending[slow.id])
+    root.stop(Status.INVALID)
+    print("stop abandons pending updates")
+    assert(not root.pending)
+    assert(slow.status == Status.INVALID)
+    root.shutdown()
+
+    print("exceptions are re-raised on the ticking thread")
+
+    class Raise(py_trees.behaviour.Behaviour):
+        def update(self):
+            raise ValueError("boom")
+
+    root = py_trees.composites.ConcurrentParallel("Parallel", children=[Raise()])
+    with nose.tools.assert_raises(ValueError):
+        root.tick_once()
+    root.shutdown()
+
+
+def test_concurrent_parallel_process_pool():
+    console.banner("Concurrent Parallel Process Pool")
+    skip_without_futures()
+    executor = py_trees.composites.concurrent.futures.ProcessPoolExecutor(max_workers=1)
+    try:
+        print("process pools are rejected, behaviours can't be sent to them")
+        with nose.tools.assert_raises(TypeError):
+            py_trees.composites.ConcurrentParallel("Parallel", children=[Block("Block")], executor=executor)
+    finally:
+        executor.shutdown()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+import tempfile
+import threading
+import timeit
+
+import py_trees
+import py_trees.console as console
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class RecordingBackend(py_trees.persistence.Backend):
+    """
+    In memory, optionally held up until released.
+    """
+    def __init__(self, values=None, release=None):
+        self.values = dict(values or {})
+        self.batches = []
+        self.release = release
+        self.stored = threading.Event()
+
+    def load(self):
+        return dict(self.values)
+
+    def store(self, values, deleted):
+        if self.release is not None:
+            self.release.wait()
+        self.batches.append((dict(values), sorted(deleted)))
+        self.values.update(values)
+        for name in deleted:
+            self.values.pop(name, None)
+        self.stored.set()
+
+
+class Unpicklable(object):
+
+    def __reduce__(self):
+        raise TypeError("not today")
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_write_behind():
+    console.banner("Write Behind")
+    backend = RecordingBackend(values={"foo": "bar", "count": 0})
+    blackboard = py_trees.blackboard.Blackboard.create("write_behind")
+    persistence = py_trees.persistence.WriteBehind(blackboard, backend, interval=60.0)
+    print(" - Assert the stored variables were loaded")
+    assert(blackboard.foo == "bar")
+    assert(blackboard.count == 0)
+    print(" - Assert nothing is written back until flushed")
+    for i in range(100):
+        blackboard.count = i
+    blackboard.unset("foo")
+    assert(backend.batches == [])
+    persistence.flush()
+    print("  batches: %s" % backend.batches)
+    print(" - Assert the writes were coalesced into one batch")
+    assert(backend.batches == [({"count": 99}, ["foo"])])
+    print(" - Assert an empty flush stores nothing")
+    persistence.flush()
+    assert(len(backend.batches) == 1)
+    print(" - Assert stopping flushes the rest")
+    blackboard.count = 100
+    persistence.stop()
+    assert(backend.values == {"count": 100})
+    assert(persistence.flushes == 2 and persistence.stored == 3)
+    print(" - Assert stopped persistence does not record writes")
+    blackboard.count = 101
+    assert(backend.values == {"count": 100})
+
+
+def test_scoped_write_behind():
+    console.banner("Scoped Write Behind")
+    backend = RecordingBackend()
+    parent = py_trees.blackboard.Blackboard.create("parent")
+    parent.limit = 3
+    scope = py_trees.blackboard.Blackboard.create("scope", parent=parent)
+    persistence = py_trees.persistence.WriteBehind(scope, backend, interval=60.0)
+    parent.limit = 4
+    scope.count = 1
+    persistence.stop()
+    print("  values: %s" % backend.values)
+    print(" - Assert only the scope's own variables were saved")
+    assert(backend.values == {"count": 1})
+    print(" - Assert restoring does not shadow the enclosing scope")
+    scope = py_trees.blackboard.Blackboard.create("scope", parent=parent)
+    persistence = py_trees.persistence.WriteBehind(scope, backend, interval=60.0)
+    parent.limit = 5
+    assert(scope.count == 1 and scope.limit == 5)
+    persistence.stop()
+
+
+def test_background_flushes():
+    console.banner("Background Flushes")
+    release = threading.Event()
+    backend = RecordingBackend(release=release)
+    blackboard = py_trees.blackboard.Blackboard.create("background")
+    persistence = py_trees.persistence.WriteBehind(blackboard, backend, interval=0.01)
+    start = timeit.default_timer()
+    for i in range(1000):
+        blackboard.count = i
+    duration = timeit.default_timer() - start
+    print("  1000 writes with a stalled backend: %.2fms" % (1000.0 * duration))
+    print(" - Assert the writes did not wait for the backend")
+    assert(not backend.stored.is_set())
+    release.set()
+    print(" - Assert the background thread flushed")
+    assert(backend.stored.wait(5.0))
+    persistence.stop()
+    assert(backend.values == {"count": 999})
+
+
+def test_sqlite_backend():
+    console.banner("SQLite Backend")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "blackboard.db")
+        blackboard = py_trees.blackboard.Blackboard.create("before")
+        persistence = py_trees.persistence.WriteBehind(
+            blackboard, py_trees.persistence.SQLiteBackend(path), interval=60.0)
+        blackboard.foo = "bar"
+        blackboard.pose = {"x": 1.0, "y": 2.0}
+        blackboard.nothing = None
+        blackboard.gone = True
+        blackboard.unpicklable = Unpicklable()
+        blackboard.unset("gone")
+        persistence.stop()
+        print(" - Assert a restarted blackboard is restored")
+        restarted = py_trees.blackboard.Blackboard.create("after")
+        persistence = py_trees.persistence.WriteBehind(
+            restarted, py_trees.persistence.SQLiteBackend(path), interval=60.0)
+        print("%s" % restarted)
+        assert(restarted.foo == "bar")
+        assert(restarted.pose == {"x": 1.0, "y": 2.0})
+        assert(restarted.exists("nothing"))
+        print(" - Assert removed and unpicklable variables were not stored")
+        assert(not restarted.exists("gone"))
+        assert(not restarted.exists("unpicklable"))
+        persistence.stop()
+    finally:
+        shutil.rmtree(directory)
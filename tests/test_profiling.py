@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import time
+
+import py_trees
+import py_trees.console as console
+
+from py_trees.common import Status
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class Sleep(py_trees.behaviour.Behaviour):
+    def __init__(self, name="Sleep", seconds=0.01):
+        super(Sleep, self).__init__(name)
+        self.seconds = seconds
+
+    def update(self):
+        time.sleep(self.seconds)
+        return Status.SUCCESS
+
+
+def create_tree():
+    root = py_trees.composites.Sequence("Root")
+    fast = py_trees.composites.Sequence("Fast")
+    fast.add_child(Sleep("Nap", seconds=0.001))
+    root.add_children([
+        fast,
+        py_trees.decorators.Inverter(py_trees.decorators.Inverter(Sleep("Slumber", seconds=0.01), name="Inner")),
+    ])
+    return root
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_profiling_visitor():
+    console.banner("Profiling Visitor")
+    root = create_tree()
+    tree = py_trees.trees.BehaviourTree(root)
+    profiler = py_trees.visitors.ProfilingVisitor(window=3)
+    profiler.instrument(root)
+    tree.visitors.append(profiler)
+    for unused_i in range(5):
+        tree.tick()
+    print(profiler.table())
+    print(profiler.collapsed_stacks())
+    profiles = dict((profile.name, profile) for profile in profiler.profiles.values())
+    nap = profiles["Nap"]
+    slumber = profiles["Slumber"]
+    print("tick counts")
+    assert(profiles["Root"].ticks == 5)
+    assert(slumber.ticks == 5)
+    print("rolling window")
+    assert(len(slumber.samples['update']) == 3)
+    print("update is the bulk of a sleeping leaf's time")
+    assert(slumber.mean('update') >= 0.01)
+    assert(slumber.mean('exclusive') >= 0.01)
+    assert(slumber.percentile('update', 50) >= 0.01)
+    assert(nap.mean('update') < slumber.mean('update'))
+    print("inclusive time includes children, exclusive does not")
+    assert(profiles["Root"].mean('inclusive') >= slumber.mean('inclusive') + nap.mean('inclusive'))
+    assert(profiles["Root"].mean('exclusive') < nap.mean('inclusive'))
+    assert(profiles["Inner"].mean('exclusive') < slumber.mean('inclusive'))
+    print("initialise and terminate are timed")
+    assert(slumber.mean('initialise') > 0.0)
+    assert(slumber.mean('terminate') > 0.0)
+    print("collapsed stacks")
+    lines = profiler.collapsed_stacks().splitlines()
+    slumber_line = [line for line in lines if line.startswith("Root;Inverter [Inner];Inner;Slumber ")]
+    assert(len(slumber_line) == 1)
+    assert(int(slumber_line[0].split(" ")[-1]) >= 30000)
+    print("uninstrument")
+    profiler.uninstrument()
+    for behaviour in root.iterate():
+        assert('tick' not in behaviour.__dict__)
+        assert('update' not in behaviour.__dict__)
+
+
+def test_profiling_visitor_early_returns():
+    console.banner("Profiling Visitor Early Returns")
+    print("children a selector stops at are still counted")
+    root = py_trees.composites.Selector("Selector")
+    root.add_children([Sleep("Doze", seconds=0.001), Sleep("Unreached")])
+    tree = py_trees.trees.BehaviourTree(root)
+    profiler = py_trees.visitors.ProfilingVisitor()
+    profiler.instrument(root)
+    tree.visitors.append(profiler)
+    for unused_i in range(4):
+        tree.tick()
+    profiler.initialise()
+    profiles = dict((profile.name, profile) for profile in profiler.profiles.values())
+    assert(profiles["Doze"].ticks == 4)
+    assert(profiles["Doze"].mean('inclusive') >= 0.001)
+    assert("Unreached" not in profiles)
+
+
+def test_profiling_visitor_lazy_instrumentation():
+    console.banner("Profiling Visitor Lazy Instrumentation")
+    root = create_tree()
+    tree = py_trees.trees.BehaviourTree(root, engine=py_trees.trees.FlatTickEngine())
+    profiler = py_trees.visitors.ProfilingVisitor()
+    tree.visitors.append(profiler)
+    tree.tick()
+    print("nothing measured in the first tick")
+    profiler.initialise()
+    assert(not profiler.profiles)
+    tree.tick()
+    tree.tick()
+    print(profiler.table(percentiles=[50]))
+    profiles = dict((profile.name, profile) for profile in profiler.profiles.values())
+    assert(profiles["Root"].ticks == 2)
+    assert(profiles["Nap"].ticks == 2)
+    assert(root.status == Status.SUCCESS)
+
+
+def test_profile_percentiles():
+    console.banner("Profile Percentiles")
+    profile = py_trees.visitors.Profile(py_trees.behaviours.Success(name="Success"), window=10)
+    for sample in [4.0, 2.0, 1.0, 3.0]:
+        profile.add(0.0, sample, 0.0, sample, sample, ticked=True)
+    expected = [(0, 1.0), (25, 1.0), (26, 2.0), (50, 2.0), (75, 3.0), (76, 4.0), (100, 4.0)]
+    for percentile, value in expected:
+        print(" - Assert p%s == %s [%s]" % (percentile, value, profile.percentile('update', percentile)))
+        assert(profile.percentile('update', percentile) == value)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import nose.tools
+import os
+import shutil
+import tempfile
+import timeit
+
+import py_trees
+import py_trees.console as console
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class Counter(py_trees.behaviour.Behaviour):
+    """
+    Writes its tick count to the blackboard, with feedback.
+    """
+    def __init__(self, name, blackboard):
+        super(Counter, self).__init__(name)
+        self.blackboard = blackboard
+        self.count = 0
+
+    def update(self):
+        self.count += 1
+        self.blackboard.set("count", self.count)
+        self.feedback_message = "counted %s" % self.count
+        return py_trees.common.Status.RUNNING if self.count % 7 else py_trees.common.Status.SUCCESS
+
+
+class Talker(py_trees.behaviour.Behaviour):
+    """
+    Succeeds with a long feedback message.
+    """
+    def update(self):
+        self.feedback_message = u"\u00e9" * 70000
+        return py_trees.common.Status.SUCCESS
+
+
+def create_tree(blackboard, idlers=10):
+    guard = py_trees.behaviours.Count(name="Guard", fail_until=3, running_until=5, success_until=7, reset=True)
+    work = py_trees.composites.Sequence(name="Work")
+    work.add_children([
+        py_trees.behaviours.Count(name="B", fail_until=0, running_until=2, success_until=100),
+        py_trees.behaviours.Count(name="C", fail_until=0, running_until=3, success_until=100)
+    ])
+    task = py_trees.composites.Selector(name="Task")
+    task.add_children([py_trees.decorators.Inverter(guard, name="Unguarded"), work])
+    idle = py_trees.composites.Parallel(name="Idle")
+    idle.add_children([py_trees.behaviours.Success(name="Idle %s" % i) for i in range(idlers)])
+    root = py_trees.composites.Parallel(name="Root")
+    root.add_children([task, Counter(name="Counter", blackboard=blackboard), idle])
+    return root
+
+
+def picture(tree, snapshot_visitor):
+    return py_trees.display.ascii_tree(tree.root, snapshot_information=snapshot_visitor)
+
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_record_and_replay():
+    console.banner("Record & Replay")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tree.pytrec")
+        blackboard = py_trees.blackboard.Blackboard.create("recorded")
+        tree = py_trees.trees.BehaviourTree(create_tree(blackboard), blackboard=blackboard)
+        snapshot_visitor = py_trees.visitors.SnapshotVisitor()
+        tree.visitors.append(snapshot_visitor)
+        recorder = py_trees.recording.Recorder(tree, path, keyframe_interval=10)
+        pictures = []
+        for unused_i in range(25):
+            tree.tick()
+            pictures.append(picture(tree, snapshot_visitor))
+        blackboard.unset("count")
+        tree.tick()
+        pictures.append(picture(tree, snapshot_visitor))
+        recorder.close()
+        print(" - Assert closing detaches the recorder")
+        tree.tick()
+        assert(recorder not in tree.visitors)
+        recording = py_trees.recording.Recording(path)
+        print(" - Assert every tick was recorded")
+        assert(len(recording) == recorder.ticks == 26)
+        print(" - Assert every tick renders as it did at the time")
+        for index in [5, 0, 9, 10, 11, 19, 20, 24, 25, 1, 2, 3, 4, 6, 7, 8]:
+            frame = recording.frame(index)
+            assert(frame.index == index and frame.tick == index)
+            assert(py_trees.display.ascii_tree(frame.root, snapshot_information=frame.snapshot) == pictures[index])
+        print(py_trees.programs.replay.render(recording.frame(-2), len(recording)))
+        print(" - Assert the blackboard writes were recorded")
+        writes = [write for index in range(len(recording)) for write in recording.frame(index).writes]
+        expected = [py_trees.recording.Write("count", py_trees.common.BlackboardOperation.SET, "%s" % count)
+                    for count in range(1, 27)]
+        expected.insert(25, py_trees.recording.Write("count", py_trees.common.BlackboardOperation.UNSET, ""))
+        assert(writes == expected)
+        assert(recording.frame(-1).writes == expected[-2:])
+        print(" - Assert the timestamps are in order")
+        assert(recording.start <= recording.frame(0).timestamp <= recording.frame(-1).timestamp)
+        print(" - Assert missing ticks raise")
+        nose.tools.assert_raises(IndexError, recording.frame, 26)
+        nose.tools.assert_raises(IndexError, recording.frame, -27)
+        recording.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_find():
+    console.banner("Find Ticks")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tree.pytrec")
+        blackboard = py_trees.blackboard.Blackboard.create("recorded")
+        tree = py_trees.trees.BehaviourTree(create_tree(blackboard), blackboard=blackboard)
+        for unused_i in range(3):
+            tree.tick()
+        recorder = py_trees.recording.Recorder(tree, path, keyframe_interval=4)
+        for unused_i in range(10):
+            tree.tick()
+        recorder.close()
+        recording = py_trees.recording.Recording(path)
+        print(" - Assert ticks are found by the tree's tick count, not their position")
+        for index in range(len(recording)):
+            tick = recording.frame(index).tick
+            assert(tick == index + 3)
+            assert(recording.find(tick) == index)
+        print(" - Assert ticks from before or after the recording raise")
+        for tick in [0, 2, 13, 100]:
+            nose.tools.assert_raises(IndexError, recording.find, tick)
+        recording.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_tree_modifications():
+    console.banner("Tree Modifications")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tree.pytrec")
+        blackboard = py_trees.blackboard.Blackboard.create("modified")
+        tree = py_trees.trees.BehaviourTree(create_tree(blackboard), blackboard=blackboard)
+        snapshot_visitor = py_trees.visitors.SnapshotVisitor()
+        tree.visitors.append(snapshot_visitor)
+        recorder = py_trees.recording.Recorder(tree, path, keyframe_interval=4)
+        pictures = []
+        idle = tree.find_by_name("Idle")[0]
+        for i in range(12):
+            if i == 3:
+                tree.insert_subtree(py_trees.behaviours.Running(name="Inserted"), idle.id, 0)
+            if i == 6:
+                tree.prune_subtree(tree.find_by_name("Idle 0")[0].id)
+            if i == 9:
+                tree.replace_subtree(tree.find_by_name("Work")[0].id, py_trees.behaviours.Failure(name="Replaced"))
+            if i == 10:
+                # same size, same behaviours, different shape
+                moved = tree.find_by_name("Idle 1")[0]
+                tree.prune_subtree(moved.id)
+                tree.insert_subtree(moved, tree.root.id, 0)
+            tree.tick()
+            pictures.append(picture(tree, snapshot_visitor))
+        recorder.close()
+        recording = py_trees.recording.Recording(path)
+        print(" - Assert each tick renders with the tree it ran on")
+        for index in range(len(recording)):
+            frame = recording.frame(index)
+            assert(py_trees.display.ascii_tree(frame.root, snapshot_information=frame.snapshot) == pictures[index])
+        print(pictures[-1])
+        print(" - Assert a moved behaviour is replayed under its new parent")
+        assert(recording.frame(-1).root.children[0].name == "Idle 1")
+        recording.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+
+def test_modifications_in_tick_handlers():
+    console.banner("Modifications in Tick Handlers")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tree.pytrec")
+        blackboard = py_trees.blackboard.Blackboard.create("handlers")
+        tree = py_trees.trees.BehaviourTree(create_tree(blackboard), blackboard=blackboard)
+        snapshot_visitor = py_trees.visitors.SnapshotVisitor()
+        tree.visitors.append(snapshot_visitor)
+
+        def insert(tree):
+            tree.insert_subtree(py_trees.behaviours.Success(name="Transient"), tree.root.id, 0)
+
+        def prune(tree):
+            for node in tree.find_by_name("Transient"):
+                tree.prune_subtree(node.id)
+        # pruned before the recorder sees the tick
+        tree.add_post_tick_handler(prune)
+        recorder = py_trees.recording.Recorder(tree, path, keyframe_interval=3)
+        pictures = []
+        for i in range(8):
+            if i % 2:
+                tree.add_pre_tick_handler(insert)
+            tree.tick()
+            pictures.append(picture(tree, snapshot_visitor))
+            if i % 2:
+                tree.pre_tick_handlers.remove(insert)
+        recorder.close()
+        print(" - Assert behaviours pruned within the tick do not stop the recording")
+        recording = py_trees.recording.Recording(path)
+        assert(len(recording) == 8)
+        for index in range(len(recording)):
+            frame = recording.frame(index)
+            assert(py_trees.display.ascii_tree(frame.root, snapshot_information=frame.snapshot) == pictures[index])
+        recording.close()
+    finally:
+        shutil.rmtree(directory)
+
+def test_long_text():
+    console.banner("Long Feedback Messages and Keys")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tree.pytrec")
+        blackboard = py_trees.blackboard.Blackboard.create("long")
+        tree = py_trees.trees.BehaviourTree(Talker(name="Talker"), blackboard=blackboard)
+        recorder = py_trees.recording.Recorder(tree, path)
+        blackboard.set("k" * 70000, 1)
+        tree.tick()
+        recorder.close()
+        recording = py_trees.recording.Recording(path)
+        frame = recording.frame(0)
+        print(" - Assert long feedback messages and keys are abbreviated")
+        feedback_message = frame.snapshot.feedback_messages[frame.root.id]
+        assert(feedback_message.endswith("...") and feedback_message.startswith(u"\u00e9"))
+        assert(len(feedback_message) < 70000)
+        assert(frame.writes[0].key.endswith("...") and len(frame.writes[0].key) < 70000)
+        recording.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_interrupted_recording():
+    console.banner("Interrupted Recording")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tree.pytrec")
+        blackboard = py_trees.blackboard.Blackboard.create("interrupted")
+        tree = py_trees.trees.BehaviourTree(create_tree(blackboard), blackboard=blackboard)
+        recorder = py_trees.recording.Recorder(tree, path)
+        for unused_i in range(5):
+            tree.tick()
+        print(" - Assert a recording can be read while it is being written")
+        recording = py_trees.recording.Recording(path)
+        assert(len(recording) == 5)
+        recording.close()
+        recorder.close()
+        print(" - Assert a partially written tick is dropped")
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+        recording = py_trees.recording.Recording(path)
+        assert(len(recording) == 4)
+        recording.frame(-1)
+        recording.close()
+        print(" - Assert other files raise")
+        with open(path, "wb") as f:
+            f.write(b"\x00" * 64)
+        nose.tools.assert_raises(ValueError, py_trees.recording.Recording, path)
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_recording_overhead():
+    console.banner("Recording Overhead")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tree.pytrec")
+        ticks = 200
+
+        def duration(record):
+            blackboard = py_trees.blackboard.Blackboard.create("overhead")
+            tree = py_trees.trees.BehaviourTree(create_tree(blackboard, idlers=100), blackboard=blackboard)
+            recorder = py_trees.recording.Recorder(tree, path) if record else None
+            start = timeit.default_timer()
+            for unused_i in range(ticks):
+                tree.tick()
+            elapsed = timeit.default_timer() - start
+            if recorder is not None:
+                recorder.close()
+            return elapsed
+
+        plain = []
+        recorded = []
+        for unused_i in range(3):
+            plain.append(duration(False))
+            recorded.append(duration(True))
+        overhead = (min(recorded) - min(plain)) / ticks
+        print("  per tick: plain %.3fms, recorded %.3fms, overhead %.3fms" % (
+            1000.0 * min(plain) / ticks, 1000.0 * min(recorded) / ticks, 1000.0 * overhead))
+        print("  recorded %s bytes in %s ticks" % (os.path.getsize(path), ticks))
+        print(" - Assert every tick was recorded")
+        recording = py_trees.recording.Recording(path)
+        assert(len(recording) == ticks)
+        recording.close()
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import multiprocessing
+import nose.tools
+import os
+import shutil
+import tempfile
+
+import py_trees
+import py_trees.console as console
+
+from py_trees.shared_memory import SharedBlackboard
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+SCHEMA = [("battery", "d"), ("count", "q"), ("pose", "3d"), ("image", "64s")]
+
+
+def write_pose(blackboard, iterations):
+    """
+    Module level so that it can be handed to another process.
+    """
+    for i in range(iterations):
+        blackboard.set("pose", (i, i, i))
+    with blackboard.writing("image") as image:
+        image[0:5] = b"hello"
+    blackboard.set("count", iterations)
+
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_get_set():
+    console.banner("Get & Set")
+    directory = tempfile.mkdtemp()
+    blackboard = SharedBlackboard.create(os.path.join(directory, "blackboard"), SCHEMA)
+    try:
+        print("%s" % blackboard)
+        print(" - Assert variables start zeroed")
+        assert(blackboard.get("battery") == 0.0)
+        assert(blackboard.get("pose") == (0.0, 0.0, 0.0))
+        assert(blackboard.version("battery") == 0)
+        print(" - Assert writes are read back")
+        blackboard.set("battery", 0.5)
+        blackboard.set("count", 3)
+        blackboard.set("pose", [1.0, 2.0, 3.0])
+        blackboard.set("image", b"abc")
+        assert(blackboard.get("battery") == 0.5)
+        assert(blackboard.get("count") == 3)
+        assert(blackboard.get("pose") == (1.0, 2.0, 3.0))
+        assert(blackboard.get("image")[:4] == b"abc\x00")
+        print(" - Assert writes bump the version")
+        assert(blackboard.version("battery") == 1)
+        blackboard.set("battery", 0.4)
+        assert(blackboard.version("battery") == 2)
+        print(" - Assert bad values leave the variable untouched")
+        nose.tools.assert_raises(Exception, blackboard.set, "pose", (1.0, 2.0))
+        assert(blackboard.version("pose") == 1)
+        assert(blackboard.get("pose") == (1.0, 2.0, 3.0))
+        print(" - Assert unknown variables raise")
+        nose.tools.assert_raises(KeyError, blackboard.get, "nothere")
+        assert("battery" in blackboard and "nothere" not in blackboard)
+        assert(blackboard.keys() == [name for name, unused_format in SCHEMA])
+    finally:
+        blackboard.close()
+        shutil.rmtree(directory)
+
+
+def test_schema_validation():
+    console.banner("Schema Validation")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "blackboard")
+        print(" - Assert repeated names raise")
+        nose.tools.assert_raises(ValueError, SharedBlackboard.create, path, [("x", "d"), ("x", "q")])
+        print(" - Assert invalid formats raise")
+        nose.tools.assert_raises(ValueError, SharedBlackboard.create, path, [("x", "?!")])
+        print(" - Assert other files raise")
+        with open(path, "wb") as f:
+            f.write(b"\x00" * 64)
+        nose.tools.assert_raises(ValueError, SharedBlackboard, path)
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_zero_copy_buffers():
+    console.banner("Zero Copy Buffers")
+    directory = tempfile.mkdtemp()
+    blackboard = SharedBlackboard.create(os.path.join(directory, "blackboard"), SCHEMA)
+    try:
+        attached = SharedBlackboard(blackboard.path)
+        print(" - Assert in place writes are visible to other attachments")
+        with blackboard.writing("image") as image:
+            image[0:3] = b"xyz"
+        view = attached.buffer("image")
+        assert(view.tobytes()[:3] == b"xyz")
+        assert(attached.version("image") == 1)
+        print(" - Assert the buffer is a view, not a copy")
+        blackboard.set("image", b"abc")
+        assert(view.tobytes()[:3] == b"abc")
+        del view
+        attached.close()
+    finally:
+        blackboard.close()
+        shutil.rmtree(directory)
+
+
+def test_crashed_writer():
+    console.banner("Crashed Writer")
+    directory = tempfile.mkdtemp()
+    blackboard = SharedBlackboard.create(os.path.join(directory, "blackboard"), SCHEMA)
+    try:
+        blackboard.set("battery", 0.5)
+        print(" - Assert reads time out on a write that never finishes")
+        # as left by a writer killed inside set(), i.e. an odd counter
+        offset = blackboard._variables["battery"].offset
+        py_trees.shared_memory._COUNTER.pack_into(blackboard._memory, offset, 2 * blackboard.version("battery") + 1)
+        nose.tools.assert_raises(py_trees.exceptions.TimeoutException, blackboard.get, "battery", 0.05)
+        print(" - Assert other variables are unaffected")
+        assert(blackboard.get("count") == 0)
+        print(" - Assert the next complete write repairs it")
+        blackboard.set("battery", 0.25)
+        assert(blackboard.get("battery") == 0.25)
+    finally:
+        blackboard.close()
+        shutil.rmtree(directory)
+
+
+def test_processes():
+    console.banner("Processes")
+    iterations = 2000
+    directory = tempfile.mkdtemp()
+    blackboard = SharedBlackboard.create(os.path.join(directory, "blackboard"), SCHEMA)
+    try:
+        print(" - Writing from another process")
+        writer = multiprocessing.Process(target=write_pose, args=(blackboard, iterations))
+        writer.start()
+        torn = 0
+        reads = 0
+        while writer.is_alive() or reads == 0:
+            x, y, theta = blackboard.get("pose")
+            reads += 1
+            if not x == y == theta:
+                torn += 1
+        writer.join()
+        print("  reads: %s, torn: %s" % (reads, torn))
+        print(" - Assert the reads were never torn")
+        assert(torn == 0)
+        print(" - Assert the writes arrived")
+        assert(writer.exitcode == 0)
+        assert(blackboard.get("count") == iterations)
+        assert(blackboard.get("pose") == (iterations - 1,) * 3)
+        assert(blackboard.get("image")[:5] == b"hello")
+        assert(blackboard.version("pose") == iterations)
+    finally:
+        blackboard.close()
+        shutil.rmtree(directory)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import gc
+import nose
+import sys
+import timeit
+
+import py_trees
+import py_trees.console as console
+
+from py_trees.common import Status
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None  # python2
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+class Condition(py_trees.behaviour.Behaviour):
+    def __init__(self, name="Condition", threshold=0.5):
+        super(Condition, self).__init__(name)
+        self.threshold = threshold
+
+    def update(self):
+        return Status.SUCCESS if self.threshold > 0.1 else Status.FAILURE
+
+
+class SlottedCondition(py_trees.behaviour.SlottedBehaviour):
+    __slots__ = ('threshold',)
+
+    def __init__(self, name="Condition", threshold=0.5):
+        super(SlottedCondition, self).__init__(name)
+        self.threshold = threshold
+
+    def update(self):
+        return Status.SUCCESS if self.threshold > 0.1 else Status.FAILURE
+
+
+def deep_size(obj, seen):
+    """
+    Rough equivalent of tracemalloc for python2, follows instance
+    dictionaries, slots and containers but not classes or modules.
+    """
+    if id(obj) in seen or isinstance(obj, (type, type(sys))) or obj is None:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(obj, (py_trees.behaviour.Behaviour, py_trees.logging.Logger)):
+        size += deep_size(getattr(obj, '__dict__', None), seen)
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if slot not in ('__weakref__', 'parent', '_tree'):
+                    size += deep_size(getattr(obj, slot, None), seen)
+    return size
+
+
+def _is_set(slot, instance):
+    try:
+        slot.__get__(instance)
+        return True
+    except AttributeError:
+        return False
+
+
+def bytes_per_node(behaviour_type, number_of_nodes):
+    """
+    Measure the memory taken by a flat tree of conditions and return
+    the number of bytes per node.
+    """
+    gc.collect()
+    if tracemalloc is not None:
+        tracemalloc.start()
+        root = py_trees.composites.Sequence("Root")
+        root.add_children([behaviour_type("Condition %s" % i) for i in range(number_of_nodes)])
+        root.tick_once()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        root = py_trees.composites.Sequence("Root")
+        root.add_children([behaviour_type("Condition %s" % i) for i in range(number_of_nodes)])
+        root.tick_once()
+        seen = set()
+        size = sum(deep_size(child, seen) for child in root.children)
+    return float(size) / number_of_nodes
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_slotted_behaviour():
+    console.banner("Slotted Behaviour")
+    condition = SlottedCondition("Condition")
+    print("no instance dictionary")
+    assert(not hasattr(condition, '__dict__'))
+    print("lazy attributes are not created on construction")
+    assert(not _is_set(py_trees.behaviour.Behaviour.id, condition))
+    assert(not _is_set(py_trees.behaviour.Behaviour.logger, condition))
+    assert(not _is_set(py_trees.behaviour.Behaviour.iterator, condition))
+    print("id is stable once generated")
+    unique_id = condition.id
+    assert(condition.id == unique_id)
+    print("children are empty")
+    assert(list(condition.iterate()) == [condition])
+    print("attributes outside the slots raise an AttributeError")
+    with nose.tools.assert_raises(AttributeError):
+        condition.foo = "bar"
+    print("ticks and stops like any other behaviour")
+    root = py_trees.composites.Selector("Root")
+    root.add_children([SlottedCondition("Low", threshold=0.0), condition])
+    tree = py_trees.trees.BehaviourTree(root)
+    tree.tick()
+    assert(root.status == Status.SUCCESS)
+    assert(root.children[0].status == Status.FAILURE)
+    assert(condition.status == Status.SUCCESS)
+    assert(tree.find(condition.id) is condition)
+    print("stop discards the iterator")
+    assert(not _is_set(py_trees.behaviour.Behaviour.iterator, condition))
+    tree = py_trees.trees.BehaviourTree(py_trees.composites.Selector("Root", children=[SlottedCondition("Condition")]),
+                                        engine=py_trees.trees.FlatTickEngine())
+    tree.tick()
+    assert(tree.root.status == Status.SUCCESS)
+
+
+def test_slotted_behaviour_benchmark():
+    console.banner("Slotted Behaviour Benchmark")
+    number_of_nodes = 10000
+    regular_size = bytes_per_node(Condition, number_of_nodes)
+    slotted_size = bytes_per_node(SlottedCondition, number_of_nodes)
+    regular_time = min(timeit.repeat(lambda: Condition("Condition"), number=number_of_nodes, repeat=3))
+    slotted_time = min(timeit.repeat(lambda: SlottedCondition("Condition"), number=number_of_nodes, repeat=3))
+    print("Measured with      : %s" % ("tracemalloc" if tracemalloc is not None else "sys.getsizeof"))
+    print("Behaviour          : %.0f bytes/node, %.2fus/construction" % (regular_size, 1000000 * regular_time / number_of_nodes))
+    print("SlottedBehaviour   : %.0f bytes/node, %.2fus/construction" % (slotted_size, 1000000 * slotted_time / number_of_nodes))
+    print("Saving             : %.0f%%" % (100.0 * (1.0 - slotted_size / regular_size)))
+    assert(slotted_size < regular_size)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import py_trees
+import py_trees.console as console
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+def create_tree():
+    root = py_trees.composites.Selector("Root")
+    sequence = py_trees.composites.Sequence("Sequence")
+    sequence.add_children([
+        py_trees.behaviours.Success("A"),
+        py_trees.decorators.Inverter(py_trees.behaviours.Success("B")),
+        py_trees.behaviours.Success("C")
+    ])
+    parallel = py_trees.composites.Parallel("Parallel")
+    parallel.add_children([py_trees.behaviours.Running("D"), py_trees.behaviours.Running("E")])
+    root.add_children([sequence, parallel, py_trees.behaviours.Running("Idle")])
+    return root
+
+
+def check_topology(topology):
+    """
+    Compare every query against the behaviour hierarchy itself.
+    """
+    root = topology.root
+    print("topology.iterate() == root.iterate()")
+    assert(topology.iterate() == list(root.iterate()))
+    print("len(topology) == %s" % len(list(root.iterate())))
+    assert(len(topology) == len(list(root.iterate())))
+    for node in root.iterate():
+        assert(topology.find(node.id) is node)
+        assert(topology.children(node) == node.children)
+        assert(topology.iterate(node) == list(node.iterate()))
+        assert(sorted(topology.subtree(node), key=id) == sorted(node.iterate(), key=id))
+        ancestors = []
+        parent = node.parent
+        while parent is not None:
+            ancestors.append(parent)
+            parent = parent.parent
+        assert(topology.ancestors(node) == ancestors)
+        assert(topology.depth(node) == len(ancestors))
+        for other in root.iterate():
+            assert(topology.is_ancestor(other, node) == (other in ancestors))
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_topology_queries():
+    console.banner("Compiled Topology Queries")
+    root = create_tree()
+    topology = py_trees.trees.CompiledTopology(root)
+    check_topology(topology)
+    b = topology.find(root.children[0].children[1].children[0].id)
+    print("b.name == 'B'")
+    assert(b.name == "B")
+    print("has_parent_with_name(b, 'Seq.*')")
+    assert(topology.has_parent_with_name(b, "Seq.*"))
+    assert(not topology.has_parent_with_name(b, "Parallel"))
+    print("has_parent_with_instance_type(b, Decorator)")
+    assert(topology.has_parent_with_instance_type(b, py_trees.decorators.Decorator))
+    assert(not topology.has_parent_with_instance_type(b, py_trees.composites.Parallel))
+
+
+def test_topology_incremental_updates():
+    console.banner("Compiled Topology Incremental Updates")
+    root = create_tree()
+    tree = py_trees.trees.BehaviourTree(root)
+    sequence = root.children[0]
+    parallel = root.children[1]
+    check_topology(tree.topology)
+
+    print("Insert a subtree")
+    subtree = py_trees.composites.Sequence("Inserted")
+    subtree.add_children([py_trees.behaviours.Success("F"), py_trees.behaviours.Success("G")])
+    assert(tree.insert_subtree(subtree, sequence.id, 1))
+    check_topology(tree.topology)
+
+    print("Prune a subtree")
+    assert(tree.prune_subtree(parallel.id))
+    assert(tree.topology.find(parallel.id) is None)
+    check_topology(tree.topology)
+
+    print("Replace a subtree")
+    replacement = py_trees.behaviours.Failure("Replacement")
+    assert(tree.replace_subtree(subtree.id, replacement))
+    assert(tree.topology.find(subtree.id) is None)
+    check_topology(tree.topology)
+
+    print("Modify the composites directly")
+    sequence.add_child(py_trees.behaviours.Success("H"))
+    check_topology(tree.topology)
+    late = py_trees.composites.Sequence("Late")
+    root.add_child(late)
+    assert(tree.insert_subtree(py_trees.behaviours.Success("I"), late.id, 0))
+    check_topology(tree.topology)
+    sequence.remove_all_children()
+    check_topology(tree.topology)
+
+    print("Compile and update a standalone topology")
+    root.remove_child(late)
+    check_topology(tree.topology)
+    topology = py_trees.trees.CompiledTopology(late)
+    late.add_child(py_trees.behaviours.Success("J"))
+    topology.update(late)
+    check_topology(topology)
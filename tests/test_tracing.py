@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+#
+# License: BSD
+#   https://raw.githubusercontent.com/splintered-reality/py_trees/devel/LICENSE
+#
+
+##############################################################################
+# Imports
+##############################################################################
+
+# enable some python3 compatibility options:
+# (unicode_literals not compatible with python2 uuid module)
+from __future__ import absolute_import, print_function
+
+import json
+import os
+import shutil
+import tempfile
+
+import py_trees
+import py_trees.console as console
+
+##############################################################################
+# Logging Level
+##############################################################################
+
+py_trees.logging.level = py_trees.logging.Level.INFO
+logger = py_trees.logging.Logger("Nosetest")
+
+##############################################################################
+# Helpers
+##############################################################################
+
+
+def create_tree():
+    work = py_trees.composites.Sequence(name="Work")
+    work.add_children([
+        py_trees.behaviours.Count(name="B", fail_until=0, running_until=2, success_until=100),
+        py_trees.behaviours.Count(name="C", fail_until=0, running_until=4, success_until=100)
+    ])
+    root = py_trees.composites.Selector(name="Root")
+    root.add_children([
+        py_trees.decorators.Inverter(py_trees.behaviours.Success(name="Guard"), name="Unguarded"),
+        work,
+        py_trees.behaviours.Running(name="Fallback")
+    ])
+    return root
+
+
+def load(path):
+    with open(path) as f:
+        events = json.load(f)
+    return [event for event in events if event["ph"] == "X"]
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_chrome_trace():
+    console.banner("Chrome Trace")
+    for engine in [None, py_trees.trees.FlatTickEngine()]:
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "trace.json")
+            tree = py_trees.trees.BehaviourTree(create_tree(), engine=engine)
+            writer = py_trees.tracing.ChromeTraceWriter(path, interval=60.0)
+            tracer = py_trees.tracing.Tracer(tree, writer)
+            statuses = []
+            for unused_i in range(6):
+                tree.tick()
+                statuses.append(tree.find_by_name("Work")[0].status.value)
+            print(" - Assert the tick thread only queued the events [%s]" % type(engine).__name__)
+            assert(writer.written == 1)
+            tracer.close()
+            writer.close()
+            events = load(path)
+            for event in events[:8]:
+                print("  %s" % event)
+            print(" - Assert every tick was traced")
+            ticks = [event for event in events if event["cat"] == "tree"]
+            assert([event["args"]["tick"] for event in ticks] == list(range(6)))
+            assert(all(event["args"]["status"] == "RUNNING" for event in ticks))
+            print(" - Assert the behaviour ticks were traced with their status")
+            work = [event for event in events if event["name"] == "Work" and event["cat"] == "tick"]
+            assert([event["args"]["status"] for event in work] == statuses)
+            assert(work[0]["args"]["id"] == str(tree.find_by_name("Work")[0].id))
+            print(" - Assert the methods were traced, within their ticks")
+            for name in ["B.initialise", "B.update", "B.terminate"]:
+                assert(any(event["name"] == name for event in events))
+            for update in [event for event in events if event["name"] == "C.update"]:
+                tick = [event for event in ticks if event["args"]["tick"] == update["args"]["tick"]][0]
+                assert(tick["ts"] <= update["ts"] and update["ts"] + update["dur"] <= tick["ts"] + tick["dur"] + 1.0)
+            print(" - Assert closing restores the behaviours")
+            assert(all('tick' not in node.__dict__ for node in tree.root.iterate()))
+        finally:
+            shutil.rmtree(directory)
+
+
+def test_sampling_and_subtrees():
+    console.banner("Sampling & Subtrees")
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "trace.json")
+        monitors = py_trees.composites.Parallel(name="Monitors")
+        monitors.add_child(py_trees.behaviours.Success(name="Monitor"))
+        root = py_trees.composites.Parallel(name="Root")
+        root.add_children([create_tree(), monitors])
+        tree = py_trees.trees.BehaviourTree(root)
+        writer = py_trees.tracing.ChromeTraceWriter(path)
+        tracer = py_trees.tracing.Tracer(tree, writer, subtree=monitors, sample=3)
+        for i in range(9):
+            if i == 4:
+                tree.insert_subtree(py_trees.behaviours.Success(name="Inserted"), monitors.id, 0)
+                tree.insert_subtree(py_trees.behaviours.Success(name="Outside"), root.id, 0)
+            tree.tick()
+        tracer.close()
+        writer.close()
+        events = load(path)
+        print(" - Assert only every third tick was traced")
+        assert(sorted(set(event["args"]["tick"] for event in events)) == [0, 3, 6])
+        print(" - Assert only the subtree was traced, including later additions")
+        names = set(event["name"] for event in events if event["cat"] == "tick")
+        print("  %s" % sorted(names))
+        assert(names == set(["Monitors", "Monitor", "Inserted"]))
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_closing_order():
+    console.banner("Closing Order")
+    for tracer_first in [True, False]:
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "trace.json")
+            tree = py_trees.trees.BehaviourTree(create_tree())
+            writer = py_trees.tracing.ChromeTraceWriter(path)
+            tracer = py_trees.tracing.Tracer(tree, writer)
+            profiler = py_trees.visitors.ProfilingVisitor()
+            tree.visitors.append(profiler)
+            profiler.instrument(tree.root)
+            tree.tick()
+            tree.tick()
+            ticks = profiler.profiles[tree.root.id].ticks
+            print(" - Assert the other wrappers keep working after closing %s first" % (
+                "the tracer" if tracer_first else "the profiler"))
+            if tracer_first:
+                tracer.close()
+            else:
+                profiler.uninstrument()
+                tree.visitors.remove(profiler)
+            tree.tick()
+            tree.tick()
+            if tracer_first:
+                assert(profiler.profiles[tree.root.id].ticks == ticks + 2)
+                profiler.uninstrument()
+                tree.visitors.remove(profiler)
+            else:
+                tracer.close()
+            writer.close()
+            if not tracer_first:
+                updates = [event for event in load(path) if event["name"] == "Unguarded.update"]
+                assert([event["args"]["tick"] for event in updates] == [0, 1, 2, 3])
+            print(" - Assert closing both restores the behaviours")
+            for node in tree.root.iterate():
+                assert(not set(['initialise', 'update', 'terminate', 'tick']) & set(node.__dict__))
+        finally:
+            shutil.rmtree(directory)
@@ -13,6 +13,9 @@
 from __future__ import absolute_import, print_function
 
 import nose.tools
+import time
+import timeit
+
 
 import py_trees
 import py_trees.console as console
@@ -223,6 +226,130 @@ def test_full_iteration():
     assert(visitations == 6)
 
 
+def test_incremental_visitors():
+    console.banner("Incremental Visitors")
+
+    class PictureVisitor(py_trees.visitors.VisitorBase):
+        """
+        Keeps a picture of every behaviour's status and feedback message.
+        """
+        def __init__(self, incremental):
+            super(PictureVisitor, self).__init__(full=True, incremental=incremental)
+            self.picture = {}
+            self.visits = 0
+
+        def run(self, behaviour):
+            self.visits += 1
+            self.picture[behaviour.id] = (behaviour.status, behaviour.feedback_message)
+
+    for engine in [None, py_trees.trees.FlatTickEngine()]:
+        guard = py_trees.behaviours.Count(name="Guard", fail_until=3, running_until=5, success_until=7, reset=True)
+        work = py_trees.composites.Sequence(name="Work")
+        work.add_children([
+            py_trees.behaviours.Count(name="B", fail_until=0, running_until=2, success_until=100),
+            py_trees.behaviours.Count(name="C", fail_until=0, running_until=4, success_until=100)
+        ])
+        idle = py_trees.composites.Sequence(name="Idle")
+        idle.add_child(py_trees.behaviours.Failure(name="Never"))
+        idle.add_children([py_trees.behaviours.Success(name="Idle %s" % i) for i in range(200)])
+        root = py_trees.composites.Selector(name="Root")
+        root.add_children([guard, work, idle, py_trees.behaviours.Running(name="Fallback")])
+        tree = py_trees.trees.BehaviourTree(root, engine=engine)
+        full = PictureVisitor(incremental=False)
+        incremental = PictureVisitor(incremental=True)
+        tree.visitors.extend([full, incremental])
+        print(" - Assert the incremental picture matches the full picture [%s]" % type(engine).__name__)
+        for unused_i in range(20):
+            tree.tick()
+            assert(incremental.picture == full.picture)
+        print("  visits: full %s, incremental %s" % (full.visits, incremental.visits))
+        print(" - Assert the incremental visitor visited far fewer behaviours")
+        assert(incremental.visits * 10 < full.visits)
+        print(" - Assert tree modifications resync the incremental visitors")
+        tree.insert_subtree(py_trees.behaviours.Success(name="Inserted"), root.id, 0)
+        assert(incremental.resync)
+        tree.tick()
+        assert(incremental.picture == full.picture)
+        assert(not incremental.resync)
+        print(" - Assert changes between ticks are picked up on request")
+        work.stop(py_trees.common.Status.INVALID)
+        work.children[0].feedback_message = "stopped by hand"
+        incremental.resync = True
+        tree.tick()
+        assert(incremental.picture == full.picture)
+
+    print(" - Assert only ticked and stopped behaviours are examined for changes")
+    done = py_trees.composites.Parallel(name="Done")
+    done.add_children([py_trees.behaviours.Success(name="Done %s" % i) for i in range(200)])
+    root = py_trees.composites.Sequence(name="Root")
+    root.add_children([done, py_trees.behaviours.Running(name="Running")])
+    tree = py_trees.trees.BehaviourTree(root)
+    incremental = PictureVisitor(incremental=True)
+    tree.visitors.append(incremental)
+    tree.tick()
+
+    class CountingDict(dict):
+        lookups = 0
+
+        def get(self, key, default=None):
+            CountingDict.lookups += 1
+            return dict.get(self, key, default)
+    tree._tracked = CountingDict(tree._tracked)
+    for unused_i in range(3):
+        tree.tick()
+    print("  lookups: %s" % CountingDict.lookups)
+    assert(CountingDict.lookups == 3 * 2)
+    assert(len(tree._tracked) == 203)
+
+
+def test_snapshot_history():
+    console.banner("Snapshot History")
+    work = py_trees.composites.Sequence(name="Work")
+    work.add_children([
+        py_trees.behaviours.Count(name="B", fail_until=0, running_until=2, success_until=100),
+        py_trees.behaviours.Count(name="C", fail_until=0, running_until=4, success_until=100)
+    ])
+    idle = py_trees.composites.Parallel(name="Idle")
+    idle.add_children([py_trees.behaviours.Success(name="Idle %s" % i) for i in range(100)])
+    task = py_trees.composites.Selector(name="Task")
+    task.add_children([
+        py_trees.behaviours.Count(name="Guard", fail_until=6, running_until=7, success_until=8, reset=True),
+        work
+    ])
+    root = py_trees.composites.Parallel(name="Root")
+    root.add_children([task, idle])
+    tree = py_trees.trees.BehaviourTree(root)
+    snapshot_visitor = py_trees.visitors.SnapshotVisitor(history=5)
+    tree.visitors.append(snapshot_visitor)
+    print(" - Assert there is no history before ticking")
+    nose.tools.assert_raises(ValueError, snapshot_visitor.snapshot)
+    pictures = []
+    for unused_i in range(12):
+        tree.tick()
+        pictures.append(py_trees.display.ascii_tree(root, snapshot_information=snapshot_visitor))
+    print(pictures[-2])
+    print(" - Assert the last tick matches the visitor")
+    assert(snapshot_visitor.ticks() == (7, 11))
+    snapshot = snapshot_visitor.snapshot()
+    assert(snapshot.tick == 11)
+    assert(snapshot.nodes == snapshot_visitor.nodes)
+    assert(set(snapshot.running_nodes) == set(snapshot_visitor.running_nodes))
+    print(" - Assert every tick in the history renders as it did at the time")
+    for tick in range(7, 12):
+        assert(py_trees.display.ascii_tree(
+            root, snapshot_information=snapshot_visitor.snapshot(tick)) == pictures[tick])
+    print(" - Assert ticks outside the history raise")
+    nose.tools.assert_raises(ValueError, snapshot_visitor.snapshot, 6)
+    nose.tools.assert_raises(ValueError, snapshot_visitor.snapshot, 12)
+    print(" - Assert the history stores the changes, not the trees")
+    stored = len(snapshot_visitor._base) + sum(
+        len(changed) + len(left) for changed, left in snapshot_visitor._deltas)
+    print("  stored: %s, traversed: %s" % (stored, len(snapshot_visitor.nodes)))
+    assert(stored < 2 * len(snapshot_visitor.nodes))
+    print(" - Assert no history is kept by default")
+    nose.tools.assert_raises(ValueError, py_trees.visitors.SnapshotVisitor().snapshot)
+
+
 def test_prune_behaviour_tree():
     console.banner("Prune Behaviour Tree")
 
@@ -281,6 +408,73 @@ def test_replace_behaviour_tree():
     assert(len(sequence2.children) == 3)
 
 
+def test_find_behaviours():
+    console.banner("Find Behaviours")
+
+    a = py_trees.behaviours.Count(name="A")
+    sequence = py_trees.composites.Sequence(name="Sequence")
+    b = py_trees.behaviours.Count(name="B")
+    c = py_trees.behaviours.Count(name="C")
+    sequence.add_children([b, c])
+    root = py_trees.Selector(name="Root")
+    root.add_children([a, sequence])
+    tree = py_trees.BehaviourTree(root)
+
+    def check(expected):
+        for node in tree.root.iterate():
+            assert(tree.find(node.id) is node)
+        assert(sorted(node.name for node in tree.find_by_name(".*")) == sorted(expected))
+
+    print("find() and find_by_name() on construction")
+    check(["Root", "A", "Sequence", "B", "C"])
+    assert(tree.find(sequence.id) is sequence)
+    assert(tree.find_by_name("B") == [b])
+    assert(tree.find_by_name("Seq") == [])
+    assert(tree.find_by_name("Seq.*") == [sequence])
+
+    print("Composite.add_child/prepend_child/insert_child")
+    d = py_trees.behaviours.Count(name="B")
+    e = py_trees.behaviours.Count(name="E")
+    f = py_trees.behaviours.Count(name="F")
+    sequence.add_child(d)
+    sequence.prepend_child(e)
+    root.insert_child(f, 1)
+    check(["Root", "A", "F", "Sequence", "E", "B", "C", "B"])
+    assert(tree.find_by_name("B") == [b, d])
+
+    print("Composite.remove_child/remove_child_by_id/replace_child")
+    sequence.remove_child(b)
+    sequence.remove_child_by_id(c.id)
+    assert(tree.find(b.id) is None)
+    assert(tree.find(c.id) is None)
+    assert(tree.find_by_name("B") == [d])
+    g = py_trees.behaviours.Count(name="G")
+    root.replace_child(f, g)
+    assert(tree.find(f.id) is None)
+    check(["Root", "A", "G", "Sequence", "E", "B"])
+
+    print("Composite.remove_all_children")
+    sequence.remove_all_children()
+    check(["Root", "A", "G", "Sequence"])
+    root.remove_all_children()
+    check(["Root"])
+
+    print("Detached subtrees are no longer tracked")
+    sequence.add_child(b)
+    assert(tree.find(b.id) is None)
+    root.add_child(sequence)
+    check(["Root", "Sequence", "B"])
+
+    print("Names that happen to be regular expressions")
+    low = py_trees.behaviours.Count(name="Battery Low?")
+    bar = py_trees.behaviours.Count(name="Foo (bar")
+    root.add_children([low, bar])
+    assert(tree.find_by_name("Battery Low?") == [low])
+    assert(tree.find_by_name("Foo (bar") == [bar])
+    assert(tree.find_by_name("Battery.*") == [low])
+    assert(tree.find_by_name("Foo (baz") == [])
+
+
 def test_tick_tock_behaviour_tree():
     console.banner("Tick Tock Behaviour Tree")
 
@@ -308,6 +502,61 @@ def test_tick_tock_behaviour_tree():
     assert(a.status == py_trees.common.Status.RUNNING)
 
 
+class Busy(py_trees.behaviour.Behaviour):
+    """
+    Busy for the specified duration (seconds) on each tick, and much longer on one tick.
+    """
+    def __init__(self, name="Busy", duration=0.0, overrun_tick=None, overrun_duration=0.0):
+        super(Busy, self).__init__(name)
+        self.duration = duration
+        self.overrun_tick = overrun_tick
+        self.overrun_duration = overrun_duration
+        self.count = 0
+
+    def update(self):
+        self.count += 1
+        time.sleep(self.overrun_duration if self.count == self.overrun_tick else self.duration)
+        return py_trees.Status.RUNNING
+
+
+def test_tick_tock_on_deadlines():
+    console.banner("Tick Tock on Deadlines")
+
+    def elapsed(tree, **kwargs):
+        start = timeit.default_timer()
+        tree.tick_tock(10, number_of_iterations=10, **kwargs)
+        return timeit.default_timer() - start
+
+    print("no drift")
+    drifting = elapsed(py_trees.BehaviourTree(Busy(duration=0.005)))
+    tree = py_trees.BehaviourTree(Busy(duration=0.005))
+    on_deadlines = elapsed(tree, overrun_policy=py_trees.common.OverrunPolicy.SKIP)
+    print("Drifting     : %.1fms" % (1000 * drifting))
+    print("On Deadlines : %.1fms" % (1000 * on_deadlines))
+    print(tree.tick_tock_statistics)
+    assert(on_deadlines < drifting)
+    assert(tree.tick_tock_statistics.ticks == 10)
+    assert(sum(tree.tick_tock_statistics.jitter_histogram) == 10)
+
+    for policy in py_trees.common.OverrunPolicy:
+        print("overrun policy: %s" % policy)
+        tree = py_trees.BehaviourTree(Busy(overrun_tick=3, overrun_duration=0.025))
+        duration = elapsed(tree, overrun_policy=policy)
+        statistics = tree.tick_tock_statistics
+        print(statistics)
+        assert(statistics.overruns >= 1)
+        assert(statistics.max_duration >= 0.025)
+        if policy == py_trees.common.OverrunPolicy.SKIP:
+            assert(statistics.skipped >= 1)
+            assert(duration >= 0.110)
+        elif policy == py_trees.common.OverrunPolicy.CATCH_UP:
+            assert(statistics.skipped == 0 and statistics.degraded == 0)
+            assert(statistics.max_jitter >= 0.010)
+        else:
+            assert(statistics.degraded >= 1)
+            assert(duration >= 0.110)
+
+
 def test_success_failure_tree():
     console.banner("Success Failure Tree")
     root = py_trees.Selector("Root")